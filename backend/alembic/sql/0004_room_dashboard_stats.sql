@@ -0,0 +1,258 @@
+-- ============================================================
+-- Room Dashboard Stats (trigger-maintained)
+-- ============================================================
+-- Summary tables holding the aggregates that v_room_dashboard_summary
+-- recomputes with correlated subqueries on every read.
+--   lease_invoice_stats   invoice counts and amounts per lease
+--   room_dashboard_stats  latest meter reading per room
+-- Both are kept current by the triggers below, so reading the dashboard
+-- is one index lookup per room regardless of invoice history depth.
+-- The active lease is still resolved at read time because it depends on CURRENT_DATE.
+-- Usage:
+-- SELECT * FROM v_room_dashboard_stats WHERE room_id = 17;
+
+CREATE TABLE lease_invoice_stats (
+    lease_id BIGINT NOT NULL,
+    total_invoices INTEGER NOT NULL DEFAULT 0,
+    unpaid_invoices INTEGER NOT NULL DEFAULT 0,
+    total_outstanding NUMERIC(12,2) NOT NULL DEFAULT 0,
+    total_electricity_cost NUMERIC(12,2) NOT NULL DEFAULT 0,
+    electricity_bill_count INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT pk_lease_invoice_stats PRIMARY KEY (lease_id),
+    CONSTRAINT fk_lease_invoice_stats_lease
+        FOREIGN KEY (lease_id) REFERENCES lease(id) ON DELETE CASCADE
+);
+
+CREATE TABLE room_dashboard_stats (
+    room_id BIGINT NOT NULL,
+    latest_meter_reading NUMERIC(10,2),
+    latest_meter_reading_date DATE,
+
+    CONSTRAINT pk_room_dashboard_stats PRIMARY KEY (room_id),
+    CONSTRAINT fk_room_dashboard_stats_room
+        FOREIGN KEY (room_id) REFERENCES room(id) ON DELETE CASCADE
+);
+
+-- Active lease lookup by room (used by the dashboard views)
+CREATE INDEX IF NOT EXISTS idx_lease_room_active
+ON lease(room_id, start_date, end_date)
+WHERE deleted_at IS NULL
+  AND submitted_at IS NOT NULL
+  AND terminated_at IS NULL;
+
+
+-- ############################################################
+-- ### Backfill ###
+-- ############################################################
+INSERT INTO lease_invoice_stats (
+    lease_id, total_invoices, unpaid_invoices, total_outstanding,
+    total_electricity_cost, electricity_bill_count
+)
+SELECT
+    inv.lease_id,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE inv.payment_status = 'overdue'),
+    SUM(inv.due_amount - inv.paid_amount),
+    COALESCE(SUM(inv.due_amount) FILTER (WHERE inv.category = 'electricity'), 0),
+    COUNT(*) FILTER (WHERE inv.category = 'electricity')
+FROM invoice inv
+WHERE inv.deleted_at IS NULL
+GROUP BY inv.lease_id;
+
+INSERT INTO room_dashboard_stats (room_id, latest_meter_reading, latest_meter_reading_date)
+SELECT mr.room_id, MAX(mr.read_amount), MAX(mr.read_date)
+FROM meter_reading mr
+GROUP BY mr.room_id;
+
+
+-- ############################################################
+-- ### Maintenance Triggers ###
+-- ############################################################
+-- Invoices: apply the row's contribution as a delta (remove OLD, add NEW).
+-- Soft-deleted invoices contribute nothing, so setting deleted_at removes them.
+CREATE OR REPLACE FUNCTION apply_invoice_stats_delta(
+    p_lease_id BIGINT,
+    p_sign INTEGER,
+    p_category invoice_category,
+    p_payment_status payment_status,
+    p_due_amount NUMERIC,
+    p_paid_amount NUMERIC
+)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO lease_invoice_stats AS s (
+        lease_id, total_invoices, unpaid_invoices, total_outstanding,
+        total_electricity_cost, electricity_bill_count
+    )
+    VALUES (
+        p_lease_id,
+        p_sign,
+        CASE WHEN p_payment_status = 'overdue' THEN p_sign ELSE 0 END,
+        p_sign * (p_due_amount - p_paid_amount),
+        CASE WHEN p_category = 'electricity' THEN p_sign * p_due_amount ELSE 0 END,
+        CASE WHEN p_category = 'electricity' THEN p_sign ELSE 0 END
+    )
+    ON CONFLICT (lease_id) DO UPDATE
+    SET total_invoices = s.total_invoices + EXCLUDED.total_invoices,
+        unpaid_invoices = s.unpaid_invoices + EXCLUDED.unpaid_invoices,
+        total_outstanding = s.total_outstanding + EXCLUDED.total_outstanding,
+        total_electricity_cost = s.total_electricity_cost + EXCLUDED.total_electricity_cost,
+        electricity_bill_count = s.electricity_bill_count + EXCLUDED.electricity_bill_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_lease_invoice_stats()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+        PERFORM apply_invoice_stats_delta(
+            OLD.lease_id, -1, OLD.category, OLD.payment_status, OLD.due_amount, OLD.paid_amount
+        );
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+        PERFORM apply_invoice_stats_delta(
+            NEW.lease_id, 1, NEW.category, NEW.payment_status, NEW.due_amount, NEW.paid_amount
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Meter readings: a new reading can only raise the maxima, anything else
+-- (update, delete) recomputes the room from idx_meter_room_date.
+CREATE OR REPLACE FUNCTION refresh_room_meter_stats(p_room_id BIGINT)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO room_dashboard_stats AS s (room_id, latest_meter_reading, latest_meter_reading_date)
+    SELECT p_room_id, MAX(mr.read_amount), MAX(mr.read_date)
+    FROM meter_reading mr
+    WHERE mr.room_id = p_room_id
+    ON CONFLICT (room_id) DO UPDATE
+    SET latest_meter_reading = EXCLUDED.latest_meter_reading,
+        latest_meter_reading_date = EXCLUDED.latest_meter_reading_date;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_room_meter_stats()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO room_dashboard_stats AS s (room_id, latest_meter_reading, latest_meter_reading_date)
+        VALUES (NEW.room_id, NEW.read_amount, NEW.read_date)
+        ON CONFLICT (room_id) DO UPDATE
+        SET latest_meter_reading = GREATEST(s.latest_meter_reading, EXCLUDED.latest_meter_reading),
+            latest_meter_reading_date = GREATEST(s.latest_meter_reading_date, EXCLUDED.latest_meter_reading_date);
+        RETURN NULL;
+    END IF;
+
+    PERFORM refresh_room_meter_stats(OLD.room_id);
+    IF TG_OP = 'UPDATE' AND NEW.room_id IS DISTINCT FROM OLD.room_id THEN
+        PERFORM refresh_room_meter_stats(NEW.room_id);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clear_room_dashboard_stats()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'invoice' THEN
+        DELETE FROM lease_invoice_stats;
+    ELSE
+        DELETE FROM room_dashboard_stats;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_invoice_stats
+AFTER INSERT OR UPDATE OF lease_id, category, payment_status, due_amount, paid_amount, deleted_at
+    OR DELETE ON invoice
+FOR EACH ROW
+EXECUTE FUNCTION maintain_lease_invoice_stats();
+
+CREATE TRIGGER trg_invoice_stats_truncate
+AFTER TRUNCATE ON invoice
+FOR EACH STATEMENT
+EXECUTE FUNCTION clear_room_dashboard_stats();
+
+CREATE TRIGGER trg_meter_reading_stats
+AFTER INSERT OR UPDATE OF room_id, read_date, read_amount OR DELETE ON meter_reading
+FOR EACH ROW
+EXECUTE FUNCTION maintain_room_meter_stats();
+
+CREATE TRIGGER trg_meter_reading_stats_truncate
+AFTER TRUNCATE ON meter_reading
+FOR EACH STATEMENT
+EXECUTE FUNCTION clear_room_dashboard_stats();
+
+
+-- ############################################################
+-- ### View ###
+-- ############################################################
+-- Same columns as v_room_dashboard_summary, read from the summary tables.
+CREATE OR REPLACE VIEW v_room_dashboard_stats AS
+SELECT
+    -- Room Basic Info
+    r.id AS room_id,
+    r.building_id,
+    CONCAT(r.floor_no, r.room_no) AS room_number,
+    r.floor_no,
+    r.room_no,
+    r.size_ping,
+    r.is_rentable,
+    b.building_no,
+    b.address AS building_address,
+
+    -- Current Lease Status
+    l.id IS NOT NULL AS is_occupied,
+
+    -- Current Tenant (Primary)
+    t.id AS tenant_id,
+    CONCAT(t.last_name, t.first_name) AS tenant_name,
+    t.phone AS tenant_phone,
+    t.email AS tenant_email,
+    t.line_id AS tenant_line_id,
+
+    -- Current Lease Details
+    l.id AS lease_id,
+    l.start_date AS lease_start_date,
+    l.end_date AS lease_end_date,
+    l.monthly_rent,
+    l.deposit,
+    l.pay_rent_on,
+    l.payment_term,
+    l.vehicle_plate,
+    l.assets,
+
+    -- Payment Statistics
+    COALESCE(lis.total_invoices, 0) AS total_invoices,
+    COALESCE(lis.unpaid_invoices, 0) AS unpaid_invoices,
+    COALESCE(lis.total_outstanding, 0) AS total_outstanding,
+
+    -- Electricity Statistics
+    COALESCE(rds.latest_meter_reading, 0) AS latest_meter_reading,
+    rds.latest_meter_reading_date,
+    COALESCE(lis.total_electricity_cost, 0) AS total_electricity_cost,
+    COALESCE(lis.electricity_bill_count, 0) AS electricity_bill_count
+
+FROM room r
+INNER JOIN building b ON b.id = r.building_id
+LEFT JOIN lease l ON l.room_id = r.id
+    -- Active lease only: submitted, not terminated, and CURRENT_DATE BETWEEN start_date AND end_date
+    AND l.submitted_at IS NOT NULL
+    AND l.terminated_at IS NULL
+    AND CURRENT_DATE BETWEEN l.start_date AND l.end_date
+    AND l.deleted_at IS NULL
+LEFT JOIN lease_tenant lt ON lt.lease_id = l.id
+    AND lt.tenant_role = 'primary'
+LEFT JOIN tenant t ON t.id = lt.tenant_id
+    AND t.deleted_at IS NULL
+LEFT JOIN lease_invoice_stats lis ON lis.lease_id = l.id
+LEFT JOIN room_dashboard_stats rds ON rds.room_id = r.id
+WHERE r.deleted_at IS NULL
+ORDER BY r.building_id, r.floor_no, r.room_no;
@@ -0,0 +1,42 @@
+-- ============================================================
+-- Cash Flow Monthly Rollup
+-- ============================================================
+-- One row per building x category x month with the summed amount.
+-- Maintained incrementally by ReportService on every cash flow write, so
+-- P&L / NAOI reports read at most 12 x buildings x categories rows per year.
+-- building_id is NULL for entries not tied to a building (company-wide costs).
+
+CREATE TABLE cash_flow_monthly_rollup (
+    id BIGINT GENERATED ALWAYS AS IDENTITY,
+    building_id BIGINT,
+    category_id BIGINT NOT NULL,
+    month DATE NOT NULL,
+    total_amount NUMERIC(14,2) NOT NULL DEFAULT 0,
+    entry_count INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT pk_cash_flow_monthly_rollup PRIMARY KEY (id),
+    CONSTRAINT fk_cf_rollup_building
+        FOREIGN KEY (building_id) REFERENCES building(id),
+    CONSTRAINT fk_cf_rollup_category
+        FOREIGN KEY (category_id) REFERENCES cash_flow_category(id),
+    CONSTRAINT chk_cf_rollup_month
+        CHECK (month = date_trunc('month', month)::date)
+);
+
+-- NULL building_id is folded to 0 so company-wide rows are unique as well
+CREATE UNIQUE INDEX uq_cf_rollup_key
+ON cash_flow_monthly_rollup ((COALESCE(building_id, 0)), category_id, month);
+
+CREATE INDEX idx_cf_rollup_month ON cash_flow_monthly_rollup(month);
+
+-- Backfill from the existing ledger
+INSERT INTO cash_flow_monthly_rollup (building_id, category_id, month, total_amount, entry_count)
+SELECT
+    cf.building_id,
+    cf.category_id,
+    date_trunc('month', cf.flow_date)::date,
+    SUM(cf.amount),
+    COUNT(*)
+FROM cash_flow cf
+WHERE cf.deleted_at IS NULL
+GROUP BY cf.building_id, cf.category_id, date_trunc('month', cf.flow_date)::date;
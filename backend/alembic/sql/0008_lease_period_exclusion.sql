@@ -0,0 +1,51 @@
+-- ============================================================
+-- Lease Period Exclusion
+-- ============================================================
+-- Occupancy of a lease as a daterange (inclusive of both ends, cut short by
+-- terminated_at) and an exclusion constraint that lets at most one submitted,
+-- non-terminated lease hold a room on any day. This replaces the racy
+-- "check then write" overlap query in LeaseService: two concurrent submits for
+-- the same room and period can no longer both succeed.
+-- Usage (rooms free for a whole period):
+-- SELECT r.id FROM room r WHERE NOT EXISTS (
+--     SELECT 1 FROM lease l
+--     WHERE l.room_id = r.id
+--       AND l.period && daterange('2026-01-01', '2026-12-31', '[]')
+--       AND l.submitted_at IS NOT NULL AND l.terminated_at IS NULL AND l.deleted_at IS NULL)
+
+-- room_id WITH = inside a GiST index needs the btree operator classes
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE lease
+ADD COLUMN period DATERANGE
+GENERATED ALWAYS AS (daterange(start_date, COALESCE(terminated_at, end_date), '[]')) STORED;
+
+-- Refuse to migrate while overlapping submitted leases exist, with the pairs to fix
+DO $$
+DECLARE
+    v_conflicts TEXT;
+BEGIN
+    SELECT string_agg(format('room %s: lease %s overlaps lease %s', a.room_id, a.id, b.id), '; ')
+    INTO v_conflicts
+    FROM lease a
+    JOIN lease b ON b.room_id = a.room_id
+        AND b.id > a.id
+        AND b.period && a.period
+    WHERE a.submitted_at IS NOT NULL AND a.terminated_at IS NULL AND a.deleted_at IS NULL
+      AND b.submitted_at IS NOT NULL AND b.terminated_at IS NULL AND b.deleted_at IS NULL;
+
+    IF v_conflicts IS NOT NULL THEN
+        RAISE EXCEPTION 'Overlapping submitted leases must be resolved before adding excl_lease_room_period (%)', v_conflicts;
+    END IF;
+END;
+$$;
+
+ALTER TABLE lease
+ADD CONSTRAINT excl_lease_room_period
+EXCLUDE USING gist (room_id WITH =, period WITH &&)
+WHERE (submitted_at IS NOT NULL AND terminated_at IS NULL AND deleted_at IS NULL);
+
+-- Portfolio-wide occupancy history (including terminated leases) by date range
+CREATE INDEX idx_lease_period
+ON lease USING gist (period)
+WHERE submitted_at IS NOT NULL AND deleted_at IS NULL;
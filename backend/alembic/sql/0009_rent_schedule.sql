@@ -0,0 +1,40 @@
+-- ============================================================
+-- Rent Schedule
+-- ============================================================
+-- One row per billing period of a submitted lease: the period, the day the rent
+-- is due (pay_rent_on), the monthly rent in effect after rent_change amendments,
+-- and the amount after invoice discounts. Generated by RentScheduleService when a
+-- lease is submitted, renewed, amended or terminated, so overdue detection,
+-- forecasting and invoice generation are range queries on this table instead of
+-- recomputing periods from payment_term for every lease.
+-- The last period is cut short at COALESCE(terminated_at, end_date).
+
+CREATE TABLE rent_schedule (
+    id BIGINT GENERATED ALWAYS AS IDENTITY,
+    lease_id BIGINT NOT NULL,
+    period_no INTEGER NOT NULL,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    due_date DATE NOT NULL,
+    monthly_rent NUMERIC(10,2) NOT NULL,
+    base_amount NUMERIC(10,2) NOT NULL,
+    discount_amount NUMERIC(10,2) NOT NULL DEFAULT 0,
+    amount NUMERIC(10,2) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+    CONSTRAINT pk_rent_schedule PRIMARY KEY (id),
+    CONSTRAINT fk_rent_schedule_lease
+        FOREIGN KEY (lease_id) REFERENCES lease(id) ON DELETE CASCADE,
+    CONSTRAINT chk_rent_schedule_period
+        CHECK (period_end >= period_start),
+    CONSTRAINT chk_rent_schedule_amount
+        CHECK (base_amount >= 0 AND discount_amount >= 0 AND amount >= 0)
+);
+
+CREATE UNIQUE INDEX uq_rent_schedule_period ON rent_schedule(lease_id, period_start);
+
+-- Due / overdue rent and forecasts by date range
+CREATE INDEX idx_rent_schedule_due ON rent_schedule(due_date) INCLUDE (lease_id, amount);
+
+-- Periods starting on or before a date (invoice generation)
+CREATE INDEX idx_rent_schedule_start ON rent_schedule(period_start) INCLUDE (lease_id, period_end);
@@ -0,0 +1,38 @@
+-- ============================================================
+-- Tenant Search
+-- ============================================================
+-- tenant.search_key holds every searchable value of a tenant as one normalized,
+-- space separated string (lower case, whitespace and - . ( ) + _ / removed):
+--   ' <last_name first_name> <first_name last_name> <phone> <personal_id>'
+-- CJK names are stored without spaces ("陳志明"), phone numbers as bare digits.
+-- The leading space of every word makes word prefix patterns (LIKE '% 陳%')
+-- usable by the trigram index even for one or two character queries, where a
+-- plain substring pattern has no trigrams to look up.
+-- Vehicle plates live on lease and get their own trigram index.
+-- TenantService.normalize_search_term applies the same normalization to queries.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION tenant_search_normalize(value TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+RETURN lower(regexp_replace(COALESCE(value, ''), '[\s().+_/-]', '', 'g'));
+
+ALTER TABLE tenant
+ADD COLUMN search_key TEXT
+GENERATED ALWAYS AS (
+    ' ' || tenant_search_normalize(last_name || first_name)
+    || ' ' || tenant_search_normalize(first_name || last_name)
+    || ' ' || tenant_search_normalize(phone)
+    || ' ' || tenant_search_normalize(personal_id)
+) STORED;
+
+CREATE INDEX idx_tenant_search_key
+ON tenant USING gin (search_key gin_trgm_ops)
+WHERE deleted_at IS NULL;
+
+CREATE INDEX idx_lease_plate_search
+ON lease USING gin ((' ' || tenant_search_normalize(vehicle_plate)) gin_trgm_ops)
+WHERE vehicle_plate IS NOT NULL AND deleted_at IS NULL;
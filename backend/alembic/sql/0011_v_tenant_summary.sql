@@ -0,0 +1,53 @@
+-- ============================================================
+-- Tenant Summary View
+-- ============================================================
+-- Slim projection of v_tenant_complete for the tenant list page:
+-- same rows (one per tenant and primary lease), but only the columns the
+-- list shows. No emergency contacts, no lease assets / asset counts,
+-- no audit timestamps and no ORDER BY (callers sort).
+-- ============================================================
+
+CREATE OR REPLACE VIEW v_tenant_summary AS
+SELECT
+    t.id AS tenant_id,
+    t.first_name,
+    t.last_name,
+    CONCAT(t.last_name, t.first_name) AS tenant_name,
+    t.gender,
+    t.phone,
+    t.personal_id,
+    t.email,
+    t.line_id,
+
+    l.id AS lease_id,
+    CASE
+        WHEN l.id IS NULL THEN NULL
+        WHEN l.submitted_at IS NULL THEN 'draft'
+        WHEN CURRENT_DATE < l.start_date THEN 'pending'
+        WHEN l.terminated_at IS NOT NULL THEN 'terminated'
+        WHEN CURRENT_DATE > l.end_date THEN 'expired'
+        ELSE 'active'
+    END AS lease_status,
+    l.start_date AS lease_start_date,
+    COALESCE(l.terminated_at, l.end_date) AS lease_end_date,
+    l.monthly_rent,
+    l.payment_term,
+
+    r.id AS room_id,
+    r.floor_no,
+    r.room_no,
+    CONCAT(r.floor_no, r.room_no) AS room_number,
+
+    b.id AS building_id,
+    b.building_no
+
+FROM tenant t
+LEFT JOIN lease_tenant lt ON lt.tenant_id = t.id
+    AND lt.tenant_role = 'primary'
+LEFT JOIN lease l ON l.id = lt.lease_id
+    AND l.deleted_at IS NULL
+LEFT JOIN room r ON r.id = l.room_id
+    AND r.deleted_at IS NULL
+LEFT JOIN building b ON b.id = r.building_id
+    AND b.deleted_at IS NULL
+WHERE t.deleted_at IS NULL
@@ -0,0 +1,35 @@
+"""use uq_invoice_period_active as the only invoice period key
+
+Revision ID: 0003_invoice_upsert_arbiter
+Revises: 0002_create_views
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Drops the DEFERRABLE uq_invoice_period constraint. PostgreSQL rejects deferrable
+  constraints as ON CONFLICT arbiters, which blocks bulk invoice upserts
+- The partial unique index uq_invoice_period_active (deleted_at IS NULL) keeps
+  enforcing one active invoice per lease/category/period and allows re-issuing
+  an invoice after the previous one was soft-deleted
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003_invoice_upsert_arbiter'
+down_revision = '0002_create_views'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Drop the deferrable invoice period constraint"""
+    op.execute("ALTER TABLE invoice DROP CONSTRAINT IF EXISTS uq_invoice_period")
+
+
+def downgrade() -> None:
+    """Restore the deferrable invoice period constraint"""
+    op.execute("""
+        ALTER TABLE invoice
+        ADD CONSTRAINT uq_invoice_period
+        UNIQUE (lease_id, category, period_start, period_end)
+        DEFERRABLE INITIALLY IMMEDIATE
+    """)
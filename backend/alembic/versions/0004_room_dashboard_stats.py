@@ -0,0 +1,42 @@
+"""trigger-maintained room dashboard stats
+
+Revision ID: 0004_room_dashboard_stats
+Revises: 0003_invoice_upsert_arbiter
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Creates lease_invoice_stats and room_dashboard_stats summary tables and backfills them
+- Adds triggers on invoice and meter_reading that keep the summaries up to date
+- Creates v_room_dashboard_stats, the summary-table counterpart of v_room_dashboard_summary
+"""
+from alembic import op
+
+from db_tools.migration_utils import execute_sql_file
+
+# revision identifiers, used by Alembic.
+revision = '0004_room_dashboard_stats'
+down_revision = '0003_invoice_upsert_arbiter'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create room dashboard summary tables, triggers and view"""
+    execute_sql_file(op, "0004_room_dashboard_stats.sql")
+
+
+def downgrade() -> None:
+    """Drop room dashboard summary tables, triggers and view"""
+    op.execute("DROP VIEW IF EXISTS v_room_dashboard_stats")
+    op.execute("DROP TRIGGER IF EXISTS trg_meter_reading_stats_truncate ON meter_reading")
+    op.execute("DROP TRIGGER IF EXISTS trg_meter_reading_stats ON meter_reading")
+    op.execute("DROP TRIGGER IF EXISTS trg_invoice_stats_truncate ON invoice")
+    op.execute("DROP TRIGGER IF EXISTS trg_invoice_stats ON invoice")
+    op.execute("DROP FUNCTION IF EXISTS clear_room_dashboard_stats")
+    op.execute("DROP FUNCTION IF EXISTS maintain_room_meter_stats")
+    op.execute("DROP FUNCTION IF EXISTS refresh_room_meter_stats")
+    op.execute("DROP FUNCTION IF EXISTS maintain_lease_invoice_stats")
+    op.execute("DROP FUNCTION IF EXISTS apply_invoice_stats_delta")
+    op.execute("DROP INDEX IF EXISTS idx_lease_room_active")
+    op.execute("DROP TABLE IF EXISTS room_dashboard_stats")
+    op.execute("DROP TABLE IF EXISTS lease_invoice_stats")
@@ -0,0 +1,31 @@
+"""index for keyset pagination of the invoice list
+
+Revision ID: 0005_invoice_due_date_index
+Revises: 0004_room_dashboard_stats
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Adds idx_invoice_due_id on invoice(period_end, id) for active invoices, matching the
+  ORDER BY / keyset predicate of GET /invoices (period_end is the invoice due date)
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005_invoice_due_date_index'
+down_revision = '0004_room_dashboard_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the invoice due date index"""
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_invoice_due_id
+        ON invoice(period_end DESC, id DESC)
+        WHERE deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    """Drop the invoice due date index"""
+    op.execute("DROP INDEX IF EXISTS idx_invoice_due_id")
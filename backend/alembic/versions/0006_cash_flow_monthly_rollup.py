@@ -0,0 +1,29 @@
+"""cash flow monthly rollup for P&L reports
+
+Revision ID: 0006_cash_flow_monthly_rollup
+Revises: 0005_invoice_due_date_index
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Creates cash_flow_monthly_rollup (building x category x month sums)
+- Backfills it from the existing cash_flow ledger
+"""
+from alembic import op
+
+from db_tools.migration_utils import execute_sql_file
+
+# revision identifiers, used by Alembic.
+revision = '0006_cash_flow_monthly_rollup'
+down_revision = '0005_invoice_due_date_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create and backfill the cash flow monthly rollup"""
+    execute_sql_file(op, "0006_cash_flow_monthly_rollup.sql")
+
+
+def downgrade() -> None:
+    """Drop the cash flow monthly rollup"""
+    op.execute("DROP TABLE IF EXISTS cash_flow_monthly_rollup")
@@ -0,0 +1,64 @@
+"""indexes for hot query predicates
+
+Revision ID: 0007_hot_path_indexes
+Revises: 0006_cash_flow_monthly_rollup
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration adds the indexes missing behind the most frequent predicates
+(found with db_tools/explain_queries.py on a benchmark portfolio):
+- idx_lease_active_end: leases active today across the portfolio (room list, dashboard
+  stats); the per-room lookup is already served by idx_lease_room_active
+- idx_lease_created_id: lease list ordering / keyset pagination
+- idx_lease_tenant_tenant: leases of a tenant (lease_tenant PK starts with lease_id)
+- idx_invoice_status_due: invoice list filtered by payment_status, newest due date first
+- idx_invoice_open: overdue/partial totals, index-only through INCLUDE
+- idx_rate_room_start: electricity rate lookups by room and date
+- idx_cf_room_date / idx_cf_building_date: ledger filtered by room or building
+
+Indexes are built CONCURRENTLY (outside the migration transaction) so the
+tables stay writable while they are created.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0007_hot_path_indexes'
+down_revision = '0006_cash_flow_monthly_rollup'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "idx_lease_active_end": """
+        ON lease(end_date, start_date) INCLUDE (room_id)
+        WHERE deleted_at IS NULL
+          AND submitted_at IS NOT NULL
+          AND terminated_at IS NULL
+    """,
+    "idx_lease_created_id": "ON lease(created_at DESC, id DESC)",
+    "idx_lease_tenant_tenant": "ON lease_tenant(tenant_id)",
+    "idx_invoice_status_due": """
+        ON invoice(payment_status, period_end DESC, id DESC)
+        WHERE deleted_at IS NULL
+    """,
+    "idx_invoice_open": """
+        ON invoice(lease_id) INCLUDE (due_amount, paid_amount)
+        WHERE deleted_at IS NULL
+          AND payment_status IN ('overdue', 'partial')
+    """,
+    "idx_rate_room_start": "ON electricity_rate(room_id, start_date DESC) INCLUDE (end_date, rate_per_kwh)",
+    "idx_cf_room_date": "ON cash_flow(room_id, flow_date) WHERE deleted_at IS NULL",
+    "idx_cf_building_date": "ON cash_flow(building_id, flow_date) WHERE deleted_at IS NULL",
+}
+
+
+def upgrade() -> None:
+    """Create the hot path indexes"""
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+
+
+def downgrade() -> None:
+    """Drop the hot path indexes"""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,33 @@
+"""exclusion constraint for overlapping submitted leases
+
+Revision ID: 0008_lease_period_exclusion
+Revises: 0007_hot_path_indexes
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Enables btree_gist
+- Adds lease.period, a generated daterange of the occupied days
+- Adds excl_lease_room_period: submitted, non-terminated leases of a room cannot overlap
+- Adds idx_lease_period (GiST) for date range occupancy searches
+"""
+from alembic import op
+
+from db_tools.migration_utils import execute_sql_file
+
+# revision identifiers, used by Alembic.
+revision = '0008_lease_period_exclusion'
+down_revision = '0007_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the lease period column, exclusion constraint and index"""
+    execute_sql_file(op, "0008_lease_period_exclusion.sql")
+
+
+def downgrade() -> None:
+    """Drop the lease period column, exclusion constraint and index"""
+    op.execute("DROP INDEX IF EXISTS idx_lease_period")
+    op.execute("ALTER TABLE lease DROP CONSTRAINT IF EXISTS excl_lease_room_period")
+    op.execute("ALTER TABLE lease DROP COLUMN IF EXISTS period")
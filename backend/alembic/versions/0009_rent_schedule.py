@@ -0,0 +1,33 @@
+"""rent schedule of submitted leases
+
+Revision ID: 0009_rent_schedule
+Revises: 0008_lease_period_exclusion
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Creates rent_schedule (one row per billing period of a submitted lease)
+
+The table starts empty, since the periods are generated in Python with
+InvoiceService.calculate_period_end. InvoiceGenerationJob builds the schedule of
+submitted leases that have none before billing; POST /leases/rent-schedule/rebuild
+(RentScheduleService.rebuild_all) populates it for every lease at once.
+"""
+from alembic import op
+
+from db_tools.migration_utils import execute_sql_file
+
+# revision identifiers, used by Alembic.
+revision = '0009_rent_schedule'
+down_revision = '0008_lease_period_exclusion'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the rent schedule table"""
+    execute_sql_file(op, "0009_rent_schedule.sql")
+
+
+def downgrade() -> None:
+    """Drop the rent schedule table"""
+    op.execute("DROP TABLE IF EXISTS rent_schedule")
@@ -0,0 +1,34 @@
+"""trigram tenant search
+
+Revision ID: 0010_tenant_search
+Revises: 0009_rent_schedule
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Enables pg_trgm
+- Adds tenant_search_normalize() and tenant.search_key, a generated, normalized
+  name / phone / personal_id string
+- Adds trigram GIN indexes on tenant.search_key and on normalized lease vehicle plates
+"""
+from alembic import op
+
+from db_tools.migration_utils import execute_sql_file
+
+# revision identifiers, used by Alembic.
+revision = '0010_tenant_search'
+down_revision = '0009_rent_schedule'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the tenant search key and trigram indexes"""
+    execute_sql_file(op, "0010_tenant_search.sql")
+
+
+def downgrade() -> None:
+    """Drop the tenant search key and trigram indexes"""
+    op.execute("DROP INDEX IF EXISTS idx_lease_plate_search")
+    op.execute("DROP INDEX IF EXISTS idx_tenant_search_key")
+    op.execute("ALTER TABLE tenant DROP COLUMN IF EXISTS search_key")
+    op.execute("DROP FUNCTION IF EXISTS tenant_search_normalize(TEXT)")
@@ -0,0 +1,29 @@
+"""slim tenant list view
+
+Revision ID: 0011_v_tenant_summary
+Revises: 0010_tenant_search
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration adds v_tenant_summary, the column subset of v_tenant_complete
+shown by the tenant list (GET /tenants/?view=summary), without the emergency
+contact and lease asset aggregations.
+"""
+from alembic import op
+
+from db_tools.migration_utils import execute_sql_file
+
+# revision identifiers, used by Alembic.
+revision = '0011_v_tenant_summary'
+down_revision = '0010_tenant_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create v_tenant_summary"""
+    execute_sql_file(op, "0011_v_tenant_summary.sql")
+
+
+def downgrade() -> None:
+    """Drop v_tenant_summary"""
+    op.execute("DROP VIEW IF EXISTS v_tenant_summary")
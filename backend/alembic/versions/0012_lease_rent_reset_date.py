@@ -0,0 +1,28 @@
+"""rent reset date of renewed leases
+
+Revision ID: 0012_lease_rent_reset_date
+Revises: 0011_v_tenant_summary
+Create Date: 2026-10-16 12:00:00.000000
+
+This migration:
+- Adds lease.rent_reset_date, the first day of the monthly_rent set by the last
+  renewal. rent_change amendments effective before it stop applying on that day,
+  and the rent schedule before it is kept as history (RentScheduleService)
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0012_lease_rent_reset_date'
+down_revision = '0011_v_tenant_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add lease.rent_reset_date"""
+    op.execute("ALTER TABLE lease ADD COLUMN IF NOT EXISTS rent_reset_date DATE")
+
+
+def downgrade() -> None:
+    """Drop lease.rent_reset_date"""
+    op.execute("ALTER TABLE lease DROP COLUMN IF EXISTS rent_reset_date")
@@ -92,9 +92,30 @@ class Settings(BaseSettings):
         
         return False
 
+    # Connection pool settings
+    DB_POOL_SIZE: int = 10  # Connections kept open in the pool
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT: float = 10.0  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced (avoids server-side idle disconnects)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # PostgreSQL statement_timeout per connection (0 disables)
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statement cache (set 0 behind pgbouncer transaction pooling)
+
+    # Health checks
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0  # Readiness ping / diagnostics query timeout
+    HEALTH_DB_CACHE_SECONDS: int = 30  # Minimum interval between /health/db diagnostics refreshes
+
     # App settings
     APP_NAME: str = "FormosaStay"
     DEBUG: bool = True
+    SQL_ECHO: bool = False  # Log every SQL statement (independent of DEBUG)
+    QUERY_PROFILER_ENABLED: bool = False  # Per-request SQL profiling (Server-Timing header and /debug/profile)
+
+    # Seconds an in-process electricity rate index stays valid before it is reloaded
+    # (picks up rate changes made by other workers)
+    ELECTRICITY_RATE_CACHE_TTL_SECONDS: int = 60
+
+    # Seconds cached cash flow categories / the default cash account stay valid
+    REFERENCE_DATA_CACHE_TTL_SECONDS: int = 300
 
     class Config:
         env_file = ".env"
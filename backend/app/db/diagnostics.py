@@ -0,0 +1,112 @@
+# app/db/diagnostics.py
+"""Database health checks used by the /health endpoints"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+async def ping(engine: AsyncEngine, timeout: float) -> None:
+    """
+    Run SELECT 1 on a pooled connection.
+
+    Raises:
+        asyncio.TimeoutError: If no connection is available or the query does not finish within timeout
+        Exception: Any connection or driver error
+    """
+    async def _ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.wait_for(_ping(), timeout=timeout)
+
+
+def describe_connection_error(error: Exception) -> str:
+    """Turn a connection error into a message with a hint about the likely cause"""
+    error_detail = str(error) or error.__class__.__name__
+    message = f"Database connection failed: {error_detail}"
+    lowered = error_detail.lower()
+    if any(s in lowered for s in ("connection refused", "could not connect", "connect call failed")):
+        message += " (Is PostgreSQL running?)"
+    elif "authentication failed" in lowered:
+        message += " (Check DATABASE_USER and DATABASE_PASSWORD in .env)"
+    elif "does not exist" in lowered:
+        message += " (Database doesn't exist. Create it with: createdb formosastay)"
+    return message
+
+
+class DiagnosticsCache:
+    """
+    Last database diagnostics snapshot, refreshed at most once per interval.
+
+    Only the first call waits for the database; afterwards a stale snapshot is
+    returned immediately while a single background task refreshes it, so frequent
+    probes never queue up catalog queries.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval_seconds: float, timeout_seconds: float):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self._snapshot: Optional[dict] = None
+        self._checked_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def _collect(self) -> dict:
+        async def _query():
+            async with self.engine.connect() as conn:
+                result = await conn.execute(text("""
+                    SELECT
+                        version() AS version,
+                        (SELECT COUNT(*)
+                         FROM information_schema.tables
+                         WHERE table_schema = 'public') AS tables_count
+                """))
+                return result.one()
+
+        try:
+            row = await asyncio.wait_for(_query(), timeout=self.timeout_seconds)
+        except Exception as e:
+            logger.warning("Database health check failed: %s", e)
+            return {
+                "status": "error",
+                "database": "unavailable",
+                "detail": describe_connection_error(e),
+            }
+
+        return {
+            "status": "ok",
+            "database": "connected",
+            "postgresql_version": row.version.split(",")[0] if row.version else "unknown",
+            "tables_count": row.tables_count,
+        }
+
+    async def refresh(self) -> dict:
+        """Collect a new snapshot now"""
+        async with self._lock:
+            self._snapshot = await self._collect()
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def get(self) -> dict:
+        """Return the latest snapshot with its age, refreshing it if stale"""
+        if self._snapshot is None:
+            await self.refresh()
+        elif time.monotonic() - self._checked_at >= self.interval_seconds:
+            self._schedule_refresh()
+
+        return {
+            **self._snapshot,
+            "age_seconds": round(time.monotonic() - self._checked_at, 3),
+        }
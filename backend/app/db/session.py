@@ -9,6 +9,7 @@ from typing import AsyncGenerator
 import logging
 
 from app.config import settings
+from app.db.pool import InstrumentedAsyncPool
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +18,19 @@ logger = logging.getLogger(__name__)
 # ----------------------------
 engine = create_async_engine(
     settings.async_database_url,
-    echo=settings.DEBUG,
+    echo=settings.SQL_ECHO,
+    poolclass=InstrumentedAsyncPool,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+        },
+    },
 )
 
 # ----------------------------
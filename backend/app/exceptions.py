@@ -21,3 +21,8 @@ class LeaseAmendmentError(DomainError):
     def __init__(self, detail: str):
         super().__init__(detail=detail, status_code=status.HTTP_400_BAD_REQUEST)
 
+
+class InvalidCursorError(DomainError):
+    """Raised when a pagination cursor cannot be decoded"""
+    def __init__(self, detail: str):
+        super().__init__(detail=detail, status_code=status.HTTP_400_BAD_REQUEST)
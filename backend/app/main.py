@@ -1,12 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import rooms, health, leases, buildings, tenants, dashboard, cash_flow, invoices, users
+from app.config import settings
+from app.db.session import engine
+from app.middleware.metrics import MetricsMiddleware, install_db_metrics
+from app.middleware.query_profiler import QueryProfilerMiddleware, install_query_profiler
+from app.responses import ORJSONResponse
+from app.routers import rooms, health, leases, buildings, tenants, dashboard, cash_flow, invoices, users, electricity, meter_readings, reports, debug, metrics, analytics
 
 
 app = FastAPI(
     title="FormosaStay API",
     version="0.1.0",
     description="RESTful API for FormosaStay rental management system",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -21,10 +27,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
+# Request latency and SQL metrics for /metrics
+install_db_metrics(engine)
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in SQL profiling per request
+if settings.QUERY_PROFILER_ENABLED:
+    install_query_profiler(engine)
+    app.add_middleware(QueryProfilerMiddleware)
+
 # Include routers
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(buildings.router)
 app.include_router(rooms.router)
 app.include_router(tenants.router)
@@ -33,6 +50,12 @@ app.include_router(dashboard.router)
 app.include_router(cash_flow.router)
 app.include_router(invoices.router)
 app.include_router(users.router)
+app.include_router(electricity.router)
+app.include_router(meter_readings.router)
+app.include_router(reports.router)
+app.include_router(analytics.router)
+if settings.QUERY_PROFILER_ENABLED:
+    app.include_router(debug.router)
 
 
 @app.get("/", tags=["System"])
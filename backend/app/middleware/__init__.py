@@ -0,0 +1 @@
+# app/middleware/__init__.py
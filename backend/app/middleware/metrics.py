@@ -0,0 +1,93 @@
+# app/middleware/metrics.py
+"""Request and SQL metrics collection for /metrics"""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.pool import pool_status
+from app.metrics import (
+    db_pool_checkout_wait_seconds_total,
+    db_pool_checkouts_total,
+    db_pool_connections,
+    db_query_duration_seconds,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_start", None)
+    if started is not None:
+        db_query_duration_seconds.observe(time.perf_counter() - started)
+
+
+def install_db_metrics(engine: AsyncEngine) -> None:
+    """Time every SQL statement and report pool usage at scrape time (idempotent)"""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+    def connections():
+        status = pool_status(engine.pool)
+        return {
+            (state,): status[state]
+            for state in ("size", "checked_in", "checked_out", "overflow")
+            if state in status
+        }
+
+    def checkouts():
+        status = pool_status(engine.pool)
+        return {("ok",): status["checkouts"], ("timeout",): status["timeouts"]}
+
+    db_pool_connections.set_function(connections)
+    db_pool_checkouts_total.set_function(checkouts)
+    db_pool_checkout_wait_seconds_total.set_function(
+        lambda: {(): pool_status(engine.pool)["total_wait_seconds"]}
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency and in-flight requests.
+    
+    Requests are labelled with the route template (e.g. /rooms/{room_id}/dashboard) so
+    label cardinality stays bounded; unmatched paths are grouped as <unmatched>.
+    Latency covers the full response, including streamed bodies.
+    """
+
+    def __init__(self, app, exclude_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            method = scope.get("method", "")
+            http_request_duration_seconds.observe(time.perf_counter() - started, method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
@@ -0,0 +1,190 @@
+# app/middleware/query_profiler.py
+"""
+Opt-in per-request SQL profiler.
+
+SQLAlchemy cursor events on the engine record every statement into the profile of the
+request being served (tracked with a context variable, which SQLAlchemy propagates into
+the greenlet that runs the driver calls). The middleware reports the profile in the
+Server-Timing response header and aggregates it per route for /debug/profile.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+# Upper bounds of the per-route histogram buckets (the last bucket is open-ended)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+MAX_STATEMENT_LENGTH = 500
+
+
+class RequestProfile:
+    """SQL statistics of one request"""
+    __slots__ = ("query_count", "db_seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("query_profile", default=None)
+
+
+def _histogram(bounds: tuple) -> dict:
+    return {**{f"le_{b}": 0 for b in bounds}, "inf": 0}
+
+
+def _observe(histogram: dict, bounds: tuple, value: float) -> None:
+    i = bisect_left(bounds, value)
+    histogram[f"le_{bounds[i]}" if i < len(bounds) else "inf"] += 1
+
+
+class RouteStats:
+    """Aggregated profile of one route"""
+
+    def __init__(self):
+        self.requests = 0
+        self.total_queries = 0
+        self.max_queries = 0
+        self.total_db_seconds = 0.0
+        self.total_request_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.query_count_histogram = _histogram(QUERY_COUNT_BUCKETS)
+        self.db_time_histogram_ms = _histogram(DB_TIME_BUCKETS_MS)
+
+    def add(self, profile: RequestProfile, request_seconds: float) -> None:
+        self.requests += 1
+        self.total_queries += profile.query_count
+        self.max_queries = max(self.max_queries, profile.query_count)
+        self.total_db_seconds += profile.db_seconds
+        self.total_request_seconds += request_seconds
+        if profile.slowest_seconds >= self.slowest_seconds and profile.slowest_statement:
+            self.slowest_seconds = profile.slowest_seconds
+            self.slowest_statement = profile.slowest_statement
+        _observe(self.query_count_histogram, QUERY_COUNT_BUCKETS, profile.query_count)
+        _observe(self.db_time_histogram_ms, DB_TIME_BUCKETS_MS, profile.db_seconds * 1000)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "avg_queries": round(self.total_queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.total_db_seconds / self.requests * 1000, 3),
+            "avg_request_ms": round(self.total_request_seconds / self.requests * 1000, 3),
+            "slowest_query_ms": round(self.slowest_seconds * 1000, 3),
+            "slowest_statement": self.slowest_statement,
+            "query_count_histogram": dict(self.query_count_histogram),
+            "db_time_histogram_ms": dict(self.db_time_histogram_ms),
+        }
+
+
+class ProfileRegistry:
+    """Per-route aggregates, keyed by 'METHOD /path/{template}'"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[str, RouteStats] = {}
+
+    def add(self, route: str, profile: RequestProfile, request_seconds: float) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteStats()
+            stats.add(profile, request_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {route: stats.to_dict() for route, stats in self._routes.items()}
+        return dict(sorted(routes.items(), key=lambda item: item[1]["avg_queries"], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+profile_registry = ProfileRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile.get() is not None:
+        context._query_profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_query_profiler_start", None)
+    if profile is None or started is None:
+        return
+    profile.record(statement[:MAX_STATEMENT_LENGTH], time.perf_counter() - started)
+
+
+def install_query_profiler(engine: AsyncEngine) -> None:
+    """Attach the cursor execute listeners to the engine (idempotent)"""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_name(scope: dict) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware recording the SQL statements issued while serving each request.
+    
+    Adds a Server-Timing header, e.g.
+        Server-Timing: db;dur=12.4;desc="7 queries", db-slowest;dur=5.1
+    Statements run after the headers were sent (streaming responses) are only
+    counted in the per-route aggregates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                server_timing = (
+                    f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.query_count} queries", '
+                    f"db-slowest;dur={profile.slowest_seconds * 1000:.1f}"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", server_timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            profile_registry.add(_route_name(scope), profile, time.perf_counter() - started)
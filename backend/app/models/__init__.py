@@ -2,11 +2,11 @@
 from app.models.building import Building
 from app.models.room import Room
 from app.models.tenant import Tenant, TenantEmergencyContact
-from app.models.lease import Lease, LeaseTenant, LeaseAmendment
+from app.models.lease import Lease, LeaseTenant, LeaseAmendment, RentSchedule
 from app.models.electricity import ElectricityRate, MeterReading
 from app.models.invoice import Invoice, InvoiceAdjustment
 from app.models.user import UserAccount, Role, UserRole, Employee
-from app.models.cash_flow import CashFlowCategory, CashAccount, CashFlow, CashFlowAttachment
+from app.models.cash_flow import CashFlowCategory, CashAccount, CashFlow, CashFlowAttachment, CashFlowMonthlyRollup
 
 __all__ = [
     "Building",
@@ -16,6 +16,7 @@ __all__ = [
     "Lease",
     "LeaseTenant",
     "LeaseAmendment",
+    "RentSchedule",
     "ElectricityRate",
     "MeterReading",
     "Invoice",
@@ -28,5 +29,6 @@ __all__ = [
     "CashAccount",
     "CashFlow",
     "CashFlowAttachment",
+    "CashFlowMonthlyRollup",
 ]
 
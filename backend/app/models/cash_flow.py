@@ -1,5 +1,5 @@
 # app/models/cash_flow.py
-from sqlalchemy import Column, BigInteger, String, Date, Numeric, ForeignKey, CheckConstraint, Index, Text
+from sqlalchemy import Column, BigInteger, Integer, String, Date, Numeric, ForeignKey, CheckConstraint, Index, Text, func, literal_column
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import relationship
 from app.models.base import Base, AuditMixin
@@ -79,3 +79,19 @@ class CashFlowAttachment(Base, AuditMixin):
     # Relationships
     cash_flow = relationship("CashFlow", back_populates="attachments")
 
+
+class CashFlowMonthlyRollup(Base):
+    """Cash flow totals per building x category x month (maintained by ReportService)"""
+    __tablename__ = "cash_flow_monthly_rollup"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    building_id = Column(BigInteger, ForeignKey("building.id"), nullable=True)  # NULL = not tied to a building
+    category_id = Column(BigInteger, ForeignKey("cash_flow_category.id"), nullable=False)
+    month = Column(Date, nullable=False)  # First day of the month
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("uq_cf_rollup_key", func.coalesce(building_id, literal_column("0")), "category_id", "month", unique=True),
+        Index("idx_cf_rollup_month", "month"),
+    )
@@ -1,6 +1,6 @@
 # app/models/lease.py
-from sqlalchemy import Column, BigInteger, Date, Numeric, SmallInteger, String, ForeignKey, CheckConstraint, Index, text, Integer, DateTime, func
-from sqlalchemy.dialects.postgresql import ENUM, JSONB
+from sqlalchemy import Column, BigInteger, Date, Numeric, SmallInteger, String, ForeignKey, CheckConstraint, Index, text, Integer, DateTime, func, Computed
+from sqlalchemy.dialects.postgresql import ENUM, JSONB, DATERANGE, ExcludeConstraint
 from sqlalchemy.orm import relationship
 from datetime import date
 from typing import Optional
@@ -26,11 +26,14 @@ class Lease(Base, AuditMixin):
     submitted_at = Column(DateTime(timezone=True), nullable=True)  # When lease was submitted (moves from draft to pending)
 
     monthly_rent = Column(Numeric(10, 2), nullable=False)
+    rent_reset_date = Column(Date, nullable=True)  # First day of monthly_rent set by the last renewal (NULL: never reset)
     deposit = Column(Numeric(10, 2), nullable=False)
     pay_rent_on = Column(SmallInteger, nullable=False)  # 1-31
     payment_term = Column(payment_term_type, nullable=False)  # 'annual', 'semi-annual', 'seasonal', 'monthly'
     assets = Column(JSONB, nullable=True)  # JSONB array of assets: [{"type": "鑰匙", "quantity": 1}, ...]
     vehicle_plate = Column(String, nullable=True)  # Vehicle/motorcycle plate number
+    # Occupied days [start_date, COALESCE(terminated_at, end_date)], maintained by PostgreSQL
+    period = Column(DATERANGE, Computed("daterange(start_date, COALESCE(terminated_at, end_date), '[]')", persisted=True))
 
     # Relationships
     room = relationship("Room", back_populates="leases")
@@ -38,6 +41,7 @@ class Lease(Base, AuditMixin):
     invoices = relationship("Invoice", back_populates="lease")  # No cascade - keep invoices for audit even if lease is deleted
     cash_flows = relationship("CashFlow", back_populates="lease")
     amendments = relationship("LeaseAmendment", back_populates="lease", cascade="all, delete-orphan")
+    rent_schedule = relationship("RentSchedule", back_populates="lease", order_by="RentSchedule.period_start")
 
     def get_status(self, today: Optional[date] = None) -> str:
         """
@@ -82,9 +86,14 @@ class Lease(Base, AuditMixin):
         CheckConstraint("monthly_rent >= 0", name="chk_monthly_rent"),
         CheckConstraint("deposit >= 0", name="chk_deposit"),
         Index("idx_lease_room", "room_id"),
-        # Note: Unique constraint for active leases per room cannot be enforced via partial index
-        # because CURRENT_DATE is not immutable. Uniqueness is enforced at application level
-        # in lease_service.py which checks for active leases before creating new ones.
+        # Submitted, non-terminated leases of a room cannot overlap (LEASE_OVERLAP_CONSTRAINT in lease_service)
+        ExcludeConstraint(
+            ("room_id", "="),
+            ("period", "&&"),
+            name="excl_lease_room_period",
+            using="gist",
+            where=text("submitted_at IS NOT NULL AND terminated_at IS NULL AND deleted_at IS NULL"),
+        ),
     )
 
 
@@ -145,3 +154,31 @@ class LeaseAmendment(Base):
         Index("uq_rent_change_effective", "lease_id", "effective_date", unique=True, postgresql_where=text("amendment_type = 'rent_change' AND deleted_at IS NULL")),
     )
 
+
+
+class RentSchedule(Base):
+    """Billing period of a submitted lease (generated by RentScheduleService)"""
+    __tablename__ = "rent_schedule"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    lease_id = Column(BigInteger, ForeignKey("lease.id", ondelete="CASCADE"), nullable=False)
+    period_no = Column(Integer, nullable=False)  # 1-based, in period order
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)  # Inclusive, cut short at the termination / end date
+    due_date = Column(Date, nullable=False)  # First pay_rent_on day on or after period_start
+    monthly_rent = Column(Numeric(10, 2), nullable=False)  # After rent_change amendments
+    base_amount = Column(Numeric(10, 2), nullable=False)
+    discount_amount = Column(Numeric(10, 2), nullable=False, default=0)
+    amount = Column(Numeric(10, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relationships
+    lease = relationship("Lease", back_populates="rent_schedule")
+
+    __table_args__ = (
+        CheckConstraint("period_end >= period_start", name="chk_rent_schedule_period"),
+        CheckConstraint("base_amount >= 0 AND discount_amount >= 0 AND amount >= 0", name="chk_rent_schedule_amount"),
+        Index("uq_rent_schedule_period", "lease_id", "period_start", unique=True),
+        Index("idx_rent_schedule_due", "due_date", postgresql_include=["lease_id", "amount"]),
+        Index("idx_rent_schedule_start", "period_start", postgresql_include=["lease_id", "period_end"]),
+    )
@@ -1,5 +1,5 @@
 # app/models/tenant.py
-from sqlalchemy import Column, BigInteger, Text, Date, ForeignKey
+from sqlalchemy import Column, BigInteger, Text, Date, ForeignKey, Computed, Index, text
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import relationship as rel
 from app.models.base import Base, AuditMixin
@@ -21,11 +21,32 @@ class Tenant(Base, AuditMixin):
     email = Column(Text, nullable=True)
     line_id = Column(Text, nullable=True)
     home_address = Column(Text, nullable=False)
+    # Normalized ' <last+first> <first+last> <phone> <personal_id>' for trigram search, maintained by PostgreSQL
+    search_key = Column(
+        Text,
+        Computed(
+            "' ' || tenant_search_normalize(last_name || first_name)"
+            " || ' ' || tenant_search_normalize(first_name || last_name)"
+            " || ' ' || tenant_search_normalize(phone)"
+            " || ' ' || tenant_search_normalize(personal_id)",
+            persisted=True,
+        ),
+    )
 
     # Relationships
     lease_tenants = rel("LeaseTenant", back_populates="tenant")
     emergency_contacts = rel("TenantEmergencyContact", back_populates="tenant", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index(
+            "idx_tenant_search_key",
+            "search_key",
+            postgresql_using="gin",
+            postgresql_ops={"search_key": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+
 
 class TenantEmergencyContact(Base):
     __tablename__ = "tenant_emergency_contact"
@@ -0,0 +1,42 @@
+# app/pagination.py
+"""Keyset (cursor) pagination helpers shared by list endpoints"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Sequence
+
+from app.exceptions import InvalidCursorError
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Dates and datetimes are stored as ISO strings; everything else must be JSON serializable.
+    """
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string from a previous page
+        parsers: One callable per key column converting the JSON value back
+                 (e.g. datetime.fromisoformat, date.fromisoformat, int)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or does not match the expected key
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or len(payload) != len(parsers):
+            raise ValueError("cursor key length mismatch")
+        return tuple(parse(value) for parse, value in zip(parsers, payload))
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}") from e
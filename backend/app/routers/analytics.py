@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date
+
+from app.db.session import get_db
+from app.schemas.occupancy import OccupancyPeriod
+from app.services.occupancy_service import OCCUPANCY_GRANULARITIES, OccupancyService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/occupancy", response_model=List[OccupancyPeriod])
+async def get_occupancy(
+    date_from: date = Query(..., alias="from", description="First day of the window (YYYY-MM-DD)"),
+    date_to: date = Query(..., alias="to", description="Last day of the window (YYYY-MM-DD)"),
+    granularity: str = Query("month", description=f"Period length: {', '.join(OCCUPANCY_GRANULARITIES)}"),
+    building_id: Optional[int] = Query(None, description="Filter by building ID"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Occupancy timeline: occupied room-days, occupancy / vacancy rate and vacancy
+    spells per period between from and to.
+    
+    Submitted leases count as occupied up to their termination date; draft leases do not.
+    """
+    try:
+        return await OccupancyService.get_occupancy_timeline(
+            db,
+            date_from=date_from,
+            date_to=date_to,
+            granularity=granularity,
+            building_id=building_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,11 +1,13 @@
 # app/routers/cash_flow.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from typing import List, Optional
 from datetime import date
 
 from app.db.session import get_db
+from app.pagination import encode_cursor, decode_cursor
+from app.responses import ORJSONResponse
 from app.models.cash_flow import CashFlowCategory, CashFlow, CashAccount
 from app.schemas.cash_flow import (
     CashFlowCategoryResponse,
@@ -13,6 +15,8 @@ from app.schemas.cash_flow import (
     CashFlowUpdate,
     CashFlowResponse
 )
+from app.services.cash_flow_service import AGGREGATE_DIMENSIONS, CashFlowService
+from app.services.report_service import ReportService
 
 router = APIRouter(prefix="/cash-flow", tags=["Cash Flow"])
 
@@ -48,25 +52,48 @@ async def list_cash_flow_categories(
 
 @router.get("/", response_model=List[dict])
 async def list_cash_flows(
+    response: Response,
     direction: Optional[str] = Query(None, description="Filter by direction ('in', 'out', 'transfer')"),
+    date_from: Optional[date] = Query(None, alias="from", description="Only entries on or after this date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Only entries on or before this date (YYYY-MM-DD)"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    building_id: Optional[int] = Query(None, description="Filter by building ID"),
+    room_id: Optional[int] = Query(None, description="Filter by room ID"),
+    lease_id: Optional[int] = Query(None, description="Filter by lease ID"),
+    cash_account_id: Optional[int] = Query(None, description="Filter by cash account ID"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of records to return (all when omitted)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all cash flow entries, optionally filtered by direction"""
+    """
+    List cash flow entries, newest first, with optional filters.
+    
+    When limit is given and a full page is returned, the X-Next-Cursor response header
+    holds the cursor for the next page.
+    """
+    after = decode_cursor(cursor, (date.fromisoformat, int)) if cursor else None
     try:
-        query = (
-            select(CashFlow, CashFlowCategory)
-            .join(CashFlowCategory, CashFlow.category_id == CashFlowCategory.id)
+        query = CashFlowService.list_query(
+            cursor=after,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+            direction=direction,
+            category_id=category_id,
+            building_id=building_id,
+            room_id=room_id,
+            lease_id=lease_id,
+            cash_account_id=cash_account_id,
         )
         
-        if direction:
-            query = query.where(CashFlowCategory.direction == direction)
-        
-        query = query.order_by(CashFlow.flow_date.desc())
-        
         result = await db.execute(query)
         flows = result.all()
         
-        return [
+        if limit and len(flows) == limit:
+            last = flows[-1][0]
+            response.headers["X-Next-Cursor"] = encode_cursor(last.flow_date, last.id)
+        
+        return ORJSONResponse([
             {
                 "id": flow.id,
                 "category_id": flow.category_id,
@@ -74,8 +101,8 @@ async def list_cash_flows(
                 "lease_id": flow.lease_id,
                 "building_id": flow.building_id,
                 "room_id": flow.room_id,
-                "flow_date": flow.flow_date.isoformat() if flow.flow_date else None,
-                "amount": float(flow.amount),
+                "flow_date": flow.flow_date,
+                "amount": flow.amount,
                 "payment_method": flow.payment_method,
                 "note": flow.note,
                 "category_name": category.chinese_name,
@@ -84,7 +111,7 @@ async def list_cash_flows(
                 "direction": category.direction
             }
             for flow, category in flows
-        ]
+        ])
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -92,6 +119,56 @@ async def list_cash_flows(
         ) from e
 
 
+@router.get("/aggregate", response_model=List[dict])
+async def aggregate_cash_flows(
+    group_by: str = Query("month", description=f"Comma-separated dimensions: {', '.join(AGGREGATE_DIMENSIONS)}"),
+    date_from: Optional[date] = Query(None, alias="from", description="Only entries on or after this date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Only entries on or before this date (YYYY-MM-DD)"),
+    direction: Optional[str] = Query(None, description="Filter by direction ('in', 'out', 'transfer')"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    building_id: Optional[int] = Query(None, description="Filter by building ID"),
+    room_id: Optional[int] = Query(None, description="Filter by room ID"),
+    cash_account_id: Optional[int] = Query(None, description="Filter by cash account ID"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Sum cash flows in the database, grouped by the requested dimensions.
+    
+    Example: /cash-flow/aggregate?group_by=month,category&from=2025-01-01&to=2025-12-31
+    
+    Each row holds the dimension columns plus total_in, total_out, net (in - out;
+    transfers are excluded) and entry_count.
+    """
+    dimensions = [d.strip() for d in group_by.split(",") if d.strip()]
+    try:
+        query = CashFlowService.aggregate_query(
+            dimensions,
+            date_from=date_from,
+            date_to=date_to,
+            direction=direction,
+            category_id=category_id,
+            building_id=building_id,
+            room_id=room_id,
+            cash_account_id=cash_account_id,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    
+    try:
+        result = await db.execute(query)
+        rows = result.mappings().all()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error aggregating cash flows: {str(e)}"
+        ) from e
+    
+    return ORJSONResponse([dict(row) for row in rows])
+
+
 @router.post("/", response_model=CashFlowResponse)
 async def create_cash_flow(
     cash_flow: CashFlowCreate,
@@ -135,6 +212,8 @@ async def create_cash_flow(
         )
         
         db.add(new_cash_flow)
+        await db.flush()
+        await ReportService.add_cash_flow(db, new_cash_flow)
         await db.commit()
         await db.refresh(new_cash_flow)
         
@@ -181,6 +260,9 @@ async def update_cash_flow(
                 detail=f"Cash flow with id {cash_flow_id} not found"
             )
         
+        # Take the entry out of the monthly rollup with its current values
+        await ReportService.remove_cash_flow(db, cash_flow)
+        
         # Update fields if provided
         if cash_flow_update.category_id is not None:
             category_result = await db.execute(
@@ -219,6 +301,7 @@ async def update_cash_flow(
         if cash_flow_update.note is not None:
             cash_flow.note = cash_flow_update.note
         
+        await ReportService.add_cash_flow(db, cash_flow)
         await db.commit()
         await db.refresh(cash_flow)
         
@@ -270,6 +353,7 @@ async def delete_cash_flow(
                 detail=f"Cash flow with id {cash_flow_id} not found"
             )
         
+        await ReportService.remove_cash_flow(db, cash_flow)
         await db.delete(cash_flow)
         await db.commit()
     except HTTPException:
@@ -0,0 +1,22 @@
+# app/routers/debug.py
+from fastapi import APIRouter, status
+
+from app.middleware.query_profiler import profile_registry
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/profile")
+async def get_query_profile():
+    """
+    SQL statistics per route since startup (or the last reset), most queries per request first.
+    
+    Routes with a high avg_queries that grows with the data size are N+1 candidates.
+    """
+    return profile_registry.snapshot()
+
+
+@router.delete("/profile", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_profile():
+    """Clear the collected route statistics"""
+    profile_registry.reset()
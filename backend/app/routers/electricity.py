@@ -0,0 +1,62 @@
+# app/routers/electricity.py
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.electricity import (
+    BillingRunCreate,
+    BillingRunResponse,
+    ElectricityRateCreate,
+    ElectricityRateResponse,
+)
+from app.services.electricity_service import ElectricityService
+
+router = APIRouter(prefix="/electricity", tags=["Electricity"])
+
+
+@router.post("/billing-runs", response_model=BillingRunResponse, status_code=status.HTTP_201_CREATED)
+async def create_billing_run(
+    billing_run: BillingRunCreate,
+    db: AsyncSession = Depends(get_db),
+    # TODO: Add authentication
+    # current_user: User = Depends(get_current_user)
+):
+    """
+    Bill electricity for every room of a building in one request (month-end close).
+    
+    Records the submitted meter readings and creates one electricity invoice per room
+    with an active lease. Usage = current reading - previous reading, cost = usage * rate.
+    Re-running the same billing run does not create duplicate invoices.
+    Rooms that cannot be billed are returned with status 'skipped' and a reason.
+    """
+    results = await ElectricityService.bill_building(
+        db,
+        building_id=billing_run.building_id,
+        reading_date=billing_run.reading_date,
+        readings=billing_run.readings,
+    )
+    
+    return BillingRunResponse(
+        building_id=billing_run.building_id,
+        reading_date=billing_run.reading_date,
+        billed=sum(1 for r in results if r["status"] == "billed"),
+        already_billed=sum(1 for r in results if r["status"] == "already_billed"),
+        skipped=sum(1 for r in results if r["status"] == "skipped"),
+        results=results,
+    )
+
+
+@router.post("/rates", response_model=ElectricityRateResponse, status_code=status.HTTP_201_CREATED)
+async def create_electricity_rate(
+    rate: ElectricityRateCreate,
+    db: AsyncSession = Depends(get_db),
+    # TODO: Add authentication
+    # current_user: User = Depends(get_current_user)
+):
+    """
+    Create an electricity rate.
+    
+    With room_id the rate applies to that room only; without it, it is the default
+    rate for rooms that have no room-specific rate on a given date.
+    """
+    return await ElectricityService.create_electricity_rate(db, rate)
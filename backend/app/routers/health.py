@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from fastapi import APIRouter, HTTPException
 
-from app.db.session import get_db
+from app.config import settings
+from app.db.diagnostics import DiagnosticsCache, describe_connection_error, ping
+from app.db.pool import pool_status
+from app.db.session import engine
 
 router = APIRouter()
 
+db_diagnostics = DiagnosticsCache(
+    engine,
+    interval_seconds=settings.HEALTH_DB_CACHE_SECONDS,
+    timeout_seconds=settings.HEALTH_DB_TIMEOUT_SECONDS,
+)
+
 
 @router.get("/health", tags=["Health"])
 async def health():
@@ -13,50 +20,46 @@ async def health():
     return {"status": "ok"}
 
 
-@router.get("/health/db", tags=["Health"])
-async def db_health_check(db: AsyncSession = Depends(get_db)):
-    """Database health check endpoint with detailed diagnostics"""
+@router.get("/health/live", tags=["Health"])
+async def liveness():
+    """Liveness probe: the process is serving requests (no database access)"""
+    return {"status": "ok"}
+
+
+@router.get("/health/ready", tags=["Health"])
+async def readiness():
+    """
+    Readiness probe: a pooled connection answers SELECT 1 within HEALTH_DB_TIMEOUT_SECONDS.
+
+    Returns 503 when the database is unreachable or the pool is exhausted.
+    """
     try:
-        # Test basic connection
-        result = await db.execute(text("SELECT 1 as test"))
-        test_value = result.scalar()
-        
-        # Get database version
-        version_result = await db.execute(text("SELECT version()"))
-        db_version = version_result.scalar()
-        
-        # Count tables
-        tables_result = await db.execute(text("""
-            SELECT COUNT(*) 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-        """))
-        table_count = tables_result.scalar()
-        
-        return {
-            "status": "ok",
-            "database": "connected",
-            "test_query": test_value,
-            "postgresql_version": db_version.split(',')[0] if db_version else "unknown",
-            "tables_count": table_count
-        }
+        await ping(engine, timeout=settings.HEALTH_DB_TIMEOUT_SECONDS)
     except Exception as e:
-        import traceback
-        error_detail = str(e)
-        error_trace = traceback.format_exc()
-        print(f"Database connection error: {error_detail}")
-        print(f"Traceback: {error_trace}")
-        
-        # Provide helpful error message
-        error_message = f"Database connection failed: {error_detail}"
-        if "connection refused" in error_detail.lower() or "could not connect" in error_detail.lower():
-            error_message += " (Is PostgreSQL running?)"
-        elif "authentication failed" in error_detail.lower():
-            error_message += " (Check DATABASE_USER and DATABASE_PASSWORD in .env)"
-        elif "does not exist" in error_detail.lower():
-            error_message += " (Database doesn't exist. Create it with: createdb formosastay)"
-        
-        raise HTTPException(
-            status_code=500,
-            detail=error_message
-        )
\ No newline at end of file
+        raise HTTPException(status_code=503, detail=describe_connection_error(e))
+    return {"status": "ok", "database": "connected"}
+
+
+@router.get("/health/pool", tags=["Health"])
+async def pool_health():
+    """
+    Connection pool usage (no database round trip).
+
+    checked_out / overflow show current usage; checkouts, timeouts and the wait
+    times accumulate since startup and reveal pool exhaustion under load.
+    """
+    return pool_status(engine.pool)
+
+
+@router.get("/health/db", tags=["Health"])
+async def db_health_check():
+    """
+    Database diagnostics (server version, table count).
+
+    Served from a snapshot refreshed in the background at most once every
+    HEALTH_DB_CACHE_SECONDS; age_seconds tells how old it is.
+    """
+    snapshot = await db_diagnostics.get()
+    if snapshot["status"] != "ok":
+        raise HTTPException(status_code=500, detail=snapshot["detail"])
+    return snapshot
@@ -1,17 +1,19 @@
 # app/routers/invoices.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List
+from sqlalchemy import select
+from typing import List, Optional
 from datetime import date
+import orjson
 
 from app.db.session import get_db
+from app.metrics import invoices_generated_total
+from app.pagination import encode_cursor, decode_cursor
 from app.models.invoice import Invoice
 from app.models.lease import Lease
-from app.models.room import Room
 from app.models.tenant import Tenant
 from app.models.lease import LeaseTenant
-from app.models.cash_flow import CashFlow, CashFlowCategory, CashAccount
 from app.schemas.invoice import (
     RentCalculationRequest,
     RentCalculationResponse,
@@ -21,8 +23,13 @@ from app.schemas.invoice import (
     RentNoteResponse,
     InvoiceTransactionCreate,
     InvoiceTransactionUpdate,
-    InvoiceTransactionResponse
+    InvoiceTransactionResponse,
+    InvoiceGenerationRequest,
+    InvoiceGenerationResponse,
+    InvoiceStatusSweepRequest,
+    InvoiceStatusSweepResponse,
 )
+from app.services.invoice_jobs import InvoiceGenerationJob, InvoiceStatusSweeper
 from app.services.invoice_service import InvoiceService
 
 router = APIRouter(prefix="/invoices", tags=["Invoices"])
@@ -116,24 +123,6 @@ async def format_rent_note(request: RentNoteRequest):
         ) from e
 
 
-async def get_or_create_default_cash_account(db: AsyncSession) -> int:
-    """Get or create a default cash account"""
-    result = await db.execute(select(CashAccount).limit(1))
-    account = result.scalar_one_or_none()
-    
-    if not account:
-        # Create default account
-        default_account = CashAccount(
-            name="Default Account",
-            account_type="bank"
-        )
-        db.add(default_account)
-        await db.flush()
-        return default_account.id
-    
-    return account.id
-
-
 def map_category_to_invoice_category(category: str) -> str:
     """Map frontend category to invoice category"""
     mapping = {
@@ -147,166 +136,63 @@ def map_category_to_invoice_category(category: str) -> str:
 
 
 
+@router.post("/generate", response_model=InvoiceGenerationResponse)
+async def generate_rent_invoices(
+    request: InvoiceGenerationRequest,
+    db: AsyncSession = Depends(get_db),
+    # TODO: Add authentication
+    # current_user: User = Depends(get_current_user)
+):
+    """
+    Create the missing rent invoices of every lease for periods starting on or before target_date.
+    
+    Amounts come from the rent schedule. Safe to re-run: periods that already
+    have a rent invoice are skipped.
+    """
+    try:
+        result = await InvoiceGenerationJob.run(
+            db,
+            target_date=request.target_date,
+            since=request.since,
+            building_id=request.building_id,
+            dry_run=request.dry_run,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return InvoiceGenerationResponse(target_date=request.target_date, **result)
+
+
+@router.post("/status-sweep", response_model=InvoiceStatusSweepResponse)
+async def sweep_invoice_status(
+    request: InvoiceStatusSweepRequest,
+    db: AsyncSession = Depends(get_db),
+    # TODO: Add authentication
+    # current_user: User = Depends(get_current_user)
+):
+    """
+    Mark unpaid invoices past their due date as overdue (nightly maintenance).
+    
+    Rent invoices are due on their rent schedule due date, other invoices on period_end.
+    """
+    invoice_ids = await InvoiceStatusSweeper.mark_overdue(db, as_of=request.as_of, grace_days=request.grace_days)
+    return InvoiceStatusSweepResponse(as_of=request.as_of, marked_overdue=len(invoice_ids), invoice_ids=invoice_ids)
+
+
 @router.post("/", response_model=InvoiceTransactionResponse)
 async def create_invoice_transaction(
     invoice: InvoiceTransactionCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Create an invoice transaction (rent, electricity, deposit, fee)"""
+    """
+    Create an invoice transaction (rent, electricity, deposit, fee) and its cash flow entry.
+    
+    The lease is invoice.lease_id or, when omitted, the room's active lease. Both rows
+    are written by one statement (see InvoiceService.create_transaction).
+    """
     try:
-        # Get or infer lease_id
-        lease_id = invoice.lease_id
-        if not lease_id:
-            # Get active lease for the room
-            room_result = await db.execute(
-                select(Room).where(Room.id == invoice.room_id)
-            )
-            room = room_result.scalar_one_or_none()
-            if not room:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Room with id {invoice.room_id} not found"
-                )
-            
-            # Get active lease for this room (submitted, not terminated, and within date range)
-            lease_result = await db.execute(
-                select(Lease).where(
-                    and_(
-                        Lease.room_id == invoice.room_id,
-                        ~Lease.submitted_at.is_(None),
-                        Lease.terminated_at.is_(None),
-                        Lease.start_date <= func.current_date(),
-                        Lease.end_date >= func.current_date()
-                    )
-                ).order_by(Lease.start_date.desc())
-            )
-            lease = lease_result.scalar_one_or_none()
-            if not lease:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"No active lease found for room {invoice.room_id}"
-                )
-            lease_id = lease.id
-        
-        # Verify lease exists
-        lease_result = await db.execute(
-            select(Lease).where(Lease.id == lease_id)
-        )
-        lease = lease_result.scalar_one_or_none()
-        if not lease:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lease with id {lease_id} not found"
-            )
-        
-        # Get tenant name
-        tenant_result = await db.execute(
-            select(Tenant, LeaseTenant)
-            .join(LeaseTenant, Tenant.id == LeaseTenant.tenant_id)
-            .where(
-                LeaseTenant.lease_id == lease_id,
-                LeaseTenant.tenant_role == 'primary'
-            )
-        )
-        tenant_data = tenant_result.first()
-        tenant_name = f"{tenant_data[0].last_name}{tenant_data[0].first_name}" if tenant_data else "Unknown"
-        
-        # Set period dates - use provided or default to due_date
-        period_start = invoice.period_start or invoice.due_date
-        period_end = invoice.period_end or invoice.due_date
-        
-        # Create invoice
-        invoice_obj = Invoice(
-            lease_id=lease_id,
-            category=invoice.category,
-            period_start=period_start,
-            period_end=period_end,
-            due_date=invoice.due_date,
-            due_amount=invoice.amount,
-            paid_amount=invoice.amount if invoice.status == "paid" else 0,
-            status=invoice.status
-        )
-        
-        db.add(invoice_obj)
-        await db.flush()
-        
-        # Create cash flow entry
-        # Map invoice category to cash flow category code
-        invoice_to_cf_category_map = {
-            'rent': 'rent',
-            'electricity': 'tenant_electricity',
-            'deposit': 'deposit_received',
-            'penalty': 'misc'
-        }
-        category_code = invoice_to_cf_category_map.get(invoice.category, 'rent')
-        category_result = await db.execute(
-            select(CashFlowCategory).where(CashFlowCategory.code == category_code)
-        )
-        cash_flow_category = category_result.scalar_one_or_none()
-        
-        if not cash_flow_category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Cash flow category with code {category_code} not found"
-            )
-        
-        # Get or create default cash account
-        cash_account_id = invoice.cash_account_id or await get_or_create_default_cash_account(db)
-        
-        # Get room for building_id
-        room_result = await db.execute(
-            select(Room).where(Room.id == invoice.room_id)
-        )
-        room = room_result.scalar_one()
-        
-        # Map payment method
-        payment_method_map = {
-            'bank': 'bank',
-            'Transfer': 'bank',
-            'cash': 'cash',
-            'Cash': 'cash',
-            'LINE_Pay': 'LINE_Pay',
-            'LINE Pay': 'LINE_Pay',
-            'LinePay': 'LINE_Pay',
-            'other': 'other',
-            'Other': 'other'
-        }
-        backend_payment_method = payment_method_map.get(invoice.payment_method or "Transfer", 'bank')
-        
-        # Create cash flow
-        cash_flow = CashFlow(
-            category_id=cash_flow_category.id,
-            cash_account_id=cash_account_id,
-            lease_id=lease_id,
-            building_id=room.building_id,
-            room_id=invoice.room_id,
-            invoice_id=invoice_obj.id,
-            flow_date=invoice.paid_date or invoice.due_date,
-            amount=invoice.amount,
-            payment_method=backend_payment_method,
-            note=invoice.note
-        )
-        
-        db.add(cash_flow)
-        await db.commit()
-        await db.refresh(invoice_obj)
-        
-        return InvoiceTransactionResponse(
-            id=invoice_obj.id,
-            invoice_id=invoice_obj.id,
-            room_id=invoice.room_id,
-            lease_id=lease_id,
-            tenant_name=tenant_name,
-            category=invoice.category,
-            amount=invoice.amount,
-            due_date=invoice.due_date,
-            period_start=period_start,
-            period_end=period_end,
-            status=invoice.status,
-            paid_date=invoice.paid_date,
-            payment_method=invoice.payment_method,
-            note=invoice.note
-        )
+        result = await InvoiceService.create_transaction(db, invoice)
+        invoices_generated_total.inc(category=invoice.category, source="manual")
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -319,45 +205,65 @@ async def create_invoice_transaction(
 
 @router.get("/", response_model=List[InvoiceTransactionResponse])
 async def list_invoice_transactions(
+    response: Response,
+    room_id: Optional[int] = Query(None, description="Filter by room ID"),
+    building_id: Optional[int] = Query(None, description="Filter by building ID"),
+    category: Optional[str] = Query(None, description="Filter by category (rent, electricity, penalty, deposit)"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by invoice status (unmatured, overdue, paid, partial, uncollectable, returned, canceled)"),
+    due_from: Optional[date] = Query(None, description="Only invoices due on or after this date (YYYY-MM-DD)"),
+    due_to: Optional[date] = Query(None, description="Only invoices due on or before this date (YYYY-MM-DD)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="'ndjson' streams every matching row as newline-delimited JSON (limit is ignored)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all invoice transactions"""
+    """
+    List invoice transactions, newest due date first.
+    
+    Filters are applied in the database. When a full page is returned, the X-Next-Cursor
+    response header holds the cursor for the next page.
+    With format=ndjson, all rows after the cursor are streamed one JSON object per line
+    without loading the whole result into memory.
+    """
+    after = decode_cursor(cursor, (date.fromisoformat, int)) if cursor else None
     try:
-        result = await db.execute(
-            select(Invoice, Lease, Room, Tenant, LeaseTenant)
-            .join(Lease, Invoice.lease_id == Lease.id)
-            .join(Room, Lease.room_id == Room.id)
-            .join(LeaseTenant, Lease.id == LeaseTenant.lease_id)
-            .join(Tenant, LeaseTenant.tenant_id == Tenant.id)
-            .where(LeaseTenant.tenant_role == 'primary')
-            .order_by(Invoice.due_date.desc())
+        query = InvoiceService.list_invoice_transactions_query(
+            room_id=room_id,
+            building_id=building_id,
+            category=category,
+            status=status_filter,
+            due_from=due_from,
+            due_to=due_to,
+            cursor=after,
+            limit=None if format == "ndjson" else limit,
         )
-        transactions = result.all()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+    
+    if format == "ndjson":
+        result = await db.stream(query)
         
-        return [
-            InvoiceTransactionResponse(
-                id=inv.id,
-                invoice_id=inv.id,
-                room_id=lease.room_id,
-                lease_id=lease.id,
-                tenant_name=f"{tenant.last_name}{tenant.first_name}",
-                category=inv.category,
-                amount=inv.due_amount,
-                due_date=inv.due_date,
-                period_start=inv.period_start,
-                period_end=inv.period_end,
-                status=inv.status,
-                paid_date=inv.due_date if inv.status == "paid" else None,
-                payment_method=None,
-                note=None
-            )
-            for inv, lease, room, tenant, lt in transactions
-        ]
+        async def stream_rows():
+            async for row in result.mappings():
+                # Amounts stay strings (default=str), as in the JSON response
+                yield orjson.dumps(dict(row), default=str) + b"\n"
+        
+        return StreamingResponse(stream_rows(), media_type="application/x-ndjson")
+    
+    try:
+        rows = (await db.execute(query)).mappings().all()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching invoice transactions: {str(e)}"
         ) from e
+    
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["due_date"], rows[-1]["id"])
+    return rows
 
 
 @router.put("/{invoice_id}", response_model=InvoiceTransactionResponse)
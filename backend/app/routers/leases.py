@@ -1,14 +1,16 @@
 # app/routers/leases.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi import status as http_status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import Optional, List
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 import json
 
 from app.db.session import get_db
+from app.pagination import encode_cursor, decode_cursor
 from app.services.lease_service import LeaseService, determine_lease_status
+from app.services.rent_schedule_service import RentScheduleService
 from app.schemas.lease import (
     LeaseCreate,
     LeaseUpdate,
@@ -20,6 +22,8 @@ from app.schemas.lease import (
     LeaseTenantResponse,
     ProrationCalculationRequest,
     ProrationCalculationResponse,
+    RentSchedulePeriodResponse,
+    RentScheduleRebuildResponse,
 )
 from app.models.lease import Lease
 
@@ -70,25 +74,48 @@ def build_lease_response(lease: Lease) -> LeaseResponse:
 
 @router.get("/", response_model=List[LeaseResponse])
 async def list_leases(
+    response: Response,
     tenant_id: Optional[int] = Query(None, description="Filter by tenant ID"),
     room_id: Optional[int] = Query(None, description="Filter by room ID"),
     status: Optional[str] = Query(None, description="Filter by status (draft, pending, active, expired, terminated)"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
     """
     List leases with optional filters.
     
     You can filter by tenant_id, room_id, or status.
-    Status is recalculated on read from facts.
+    Status is recalculated on read from facts (in SQL, so filtering and pagination happen in the database).
+    When a full page is returned, the X-Next-Cursor response header holds the cursor for the next page.
     """
+    after = decode_cursor(cursor, (datetime.fromisoformat, int)) if cursor else None
     leases = await LeaseService.list_leases(
-        db, tenant_id=tenant_id, room_id=room_id, status=status, skip=skip, limit=limit
+        db, tenant_id=tenant_id, room_id=room_id, status=status, skip=skip, limit=limit, cursor=after
     )
+    if len(leases) == limit:
+        last = leases[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     return [build_lease_response(lease) for lease in leases]
 
 
+@router.post("/rent-schedule/rebuild", response_model=RentScheduleRebuildResponse)
+async def rebuild_rent_schedule(
+    db: AsyncSession = Depends(get_db),
+    # TODO: Add authentication
+    # current_user: User = Depends(get_current_user)
+):
+    """
+    Regenerate the rent schedule of every submitted lease.
+    
+    The schedule is maintained on submit / renew / amend / terminate, and invoice
+    generation builds missing ones; this is only needed after manual SQL edits.
+    """
+    rows = await RentScheduleService.rebuild_all(db)
+    return RentScheduleRebuildResponse(rows=rows)
+
+
 @router.get("/{lease_id}", response_model=LeaseResponse)
 async def get_lease(
     lease_id: int,
@@ -107,6 +134,24 @@ async def get_lease(
     return build_lease_response(lease)
 
 
+@router.get("/{lease_id}/rent-schedule", response_model=List[RentSchedulePeriodResponse])
+async def get_rent_schedule(
+    lease_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the billing periods of a lease with due dates and amounts.
+    Draft leases have no schedule.
+    """
+    lease = await LeaseService.get_lease(db, lease_id)
+    if not lease:
+        raise HTTPException(
+            status_code=http_status.HTTP_404_NOT_FOUND,
+            detail=f"Lease with id {lease_id} not found"
+        )
+    return await RentScheduleService.get_schedule(db, lease_id)
+
+
 @router.post("/", response_model=LeaseResponse, status_code=http_status.HTTP_201_CREATED)
 async def create_lease(
     lease_data: LeaseCreate,
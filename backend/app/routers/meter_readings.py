@@ -0,0 +1,111 @@
+# app/routers/meter_readings.py
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter, ValidationError
+from typing import List
+import csv
+import io
+
+from app.db.session import get_db
+from app.schemas.electricity import MeterReadingCreate, MeterReadingBulkResponse
+from app.services.electricity_service import ElectricityService
+
+router = APIRouter(prefix="/meter-readings", tags=["Electricity"])
+
+_readings_adapter = TypeAdapter(List[MeterReadingCreate])
+
+CSV_COLUMNS = ("room_id", "read_date", "read_amount")
+
+
+def parse_readings_csv(content: str) -> List[MeterReadingCreate]:
+    """
+    Parse meter readings from CSV text.
+    
+    The first line must be a header containing room_id, read_date (YYYY-MM-DD)
+    and read_amount columns; other columns are ignored.
+    """
+    reader = csv.DictReader(io.StringIO(content))
+    missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV header is missing required column(s): {', '.join(missing)}"
+        )
+    
+    readings = []
+    for line_no, row in enumerate(reader, start=2):
+        if not any((row.get(c) or "").strip() for c in CSV_COLUMNS):
+            continue  # Skip blank lines
+        try:
+            readings.append(MeterReadingCreate(
+                room_id=row["room_id"].strip(),
+                read_date=row["read_date"].strip(),
+                read_amount=row["read_amount"].strip(),
+            ))
+        except (ValidationError, AttributeError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid meter reading on CSV line {line_no}: {e}"
+            ) from e
+    return readings
+
+
+@router.post(
+    "/bulk",
+    response_model=MeterReadingBulkResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": MeterReadingCreate.model_json_schema()}
+                },
+                "text/csv": {
+                    "schema": {"type": "string", "example": "room_id,read_date,read_amount\n17,2025-01-31,1234.5"}
+                },
+            },
+        }
+    },
+)
+async def bulk_import_meter_readings(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import many meter readings at once.
+    
+    Accepts either a JSON array of {room_id, read_date, read_amount} objects
+    (Content-Type: application/json) or a CSV file with a room_id,read_date,read_amount
+    header (Content-Type: text/csv).
+    
+    Readings for an existing room/date are overwritten. A reading lower than the
+    room's previous reading or higher than its next reading is rejected and returned
+    in 'rejected'; all other readings are stored.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    body = await request.body()
+    
+    if content_type in ("text/csv", "application/csv"):
+        try:
+            readings = parse_readings_csv(body.decode("utf-8-sig"))
+        except UnicodeDecodeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV file must be UTF-8 encoded"
+            ) from e
+    elif content_type in ("application/json", ""):
+        try:
+            readings = _readings_adapter.validate_json(body)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=e.errors(include_url=False)
+            ) from e
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type: {content_type}. Use application/json or text/csv"
+        )
+    
+    result = await ElectricityService.bulk_upsert_meter_readings(db, readings)
+    return MeterReadingBulkResponse(**result)
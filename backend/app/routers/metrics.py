@@ -0,0 +1,19 @@
+# app/routers/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """
+    Metrics in the Prometheus text exposition format.
+    
+    HTTP latency per route, in-flight requests, SQL statement durations, connection
+    pool usage and business counters (invoices generated, meter readings ingested).
+    Values are per worker process.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,71 @@
+# app/routers/reports.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date
+
+from app.db.session import get_db
+from app.schemas.report import NAOIReport, RollupRebuildResponse
+from app.services.report_service import ReportService
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+
+def _year_range(year: Optional[int], from_year: Optional[int], to_year: Optional[int]) -> tuple[int, int]:
+    """Resolve the requested year range (defaults to the current year)"""
+    if year:
+        return year, year
+    current_year = date.today().year
+    start, end = from_year or to_year or current_year, to_year or from_year or current_year
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"from_year ({start}) must not be after to_year ({end})"
+        )
+    return start, end
+
+
+@router.get("/naoi", response_model=List[NAOIReport])
+async def get_naoi_by_building(
+    year: Optional[int] = Query(None, ge=1900, le=9999, description="Single year (overrides from_year/to_year)"),
+    from_year: Optional[int] = Query(None, ge=1900, le=9999, description="First year of a multi-year report"),
+    to_year: Optional[int] = Query(None, ge=1900, le=9999, description="Last year of a multi-year report"),
+    building_id: Optional[int] = Query(None, description="Only this building"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Net Annual Operating Income per building and year.
+    
+    NAOI = operating income - operating expenses. Deposits, capital expenditure
+    (new equipment) and transfers are excluded. Entries not tied to a building are
+    reported with building_id null.
+    """
+    start, end = _year_range(year, from_year, to_year)
+    return await ReportService.get_naoi(db, start, end, building_id=building_id)
+
+
+@router.get("/naoi/portfolio", response_model=List[NAOIReport])
+async def get_naoi_portfolio(
+    year: Optional[int] = Query(None, ge=1900, le=9999, description="Single year (overrides from_year/to_year)"),
+    from_year: Optional[int] = Query(None, ge=1900, le=9999, description="First year of a multi-year report"),
+    to_year: Optional[int] = Query(None, ge=1900, le=9999, description="Last year of a multi-year report"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Net Annual Operating Income of the whole portfolio (all buildings and company-level entries) per year"""
+    start, end = _year_range(year, from_year, to_year)
+    return await ReportService.get_naoi(db, start, end, portfolio=True)
+
+
+@router.post("/rollup/rebuild", response_model=RollupRebuildResponse)
+async def rebuild_cash_flow_rollup(
+    db: AsyncSession = Depends(get_db),
+    # TODO: Add authentication
+    # current_user: User = Depends(get_current_user)
+):
+    """
+    Recompute the cash flow monthly rollup from the ledger.
+    
+    Only needed after writing cash_flow outside the API (bulk imports, manual SQL).
+    """
+    rows = await ReportService.rebuild_rollup(db)
+    return RollupRebuildResponse(rows=rows)
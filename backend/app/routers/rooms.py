@@ -1,14 +1,19 @@
 # app/routers/rooms.py
 from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, text, func
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from datetime import datetime
+from datetime import date
+import orjson
 
 from app.db.session import get_db
 from app.models.room import Room
 from app.models.lease import Lease
+from app.responses import ORJSONResponse
+from app.schemas.occupancy import RoomAvailability
+from app.services.occupancy_service import OccupancyService
 
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
@@ -43,14 +48,14 @@ async def list_rooms(
     )
     active_leases = {lease.room_id: lease for lease in leases_result.scalars().all()}
     
-    return [
+    return ORJSONResponse([
         {
             "id": r.id,
             "building_id": r.building_id,
             "floor_no": r.floor_no,
             "room_no": r.room_no,
             "room_number": f"{r.floor_no}{r.room_no}",
-            "size_ping": float(r.size_ping) if r.size_ping else None,
+            "size_ping": r.size_ping or None,  # 0 is sent as null
             "status": "Occupied" if r.id in active_leases else "Vacant",
             "currentMeterReading": 0,  # Would need to fetch from meter_reading
             "building": {
@@ -60,7 +65,126 @@ async def list_rooms(
             } if r.building else None,
         }
         for r in rooms
-    ]
+    ])
+
+
+# Declared before /{room_id} so "dashboard" is not parsed as a room id
+@router.get("/dashboard")
+async def get_rooms_dashboard(
+    building_id: Optional[int] = Query(None, description="Filter by building ID"),
+    include_tenant: bool = Query(False, description="Embed the current primary tenant (same fields as /rooms/{room_id}/tenant)"),
+    invoice_limit: int = Query(0, ge=0, le=100, description="Embed the last N invoices of each room (same fields as /rooms/{room_id}/invoices)"),
+    reading_limit: int = Query(0, ge=0, le=100, description="Embed the last N meter readings of each room (same fields as /rooms/{room_id}/electricity)"),
+    use_stats: bool = Query(True, description="Read aggregates from v_room_dashboard_stats instead of v_room_dashboard_summary"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the dashboard summary of all rooms in one request.
+    
+    Returns the same fields as /rooms/{room_id}/dashboard for every room, optionally
+    with the current tenant, recent invoices and recent meter readings embedded, so the
+    room grid does not need one request per room. Rows are built as JSON by the database
+    with lateral joins and streamed to the client as a JSON array.
+    """
+    view = "v_room_dashboard_stats" if use_stats else "v_room_dashboard_summary"
+    columns = ["to_jsonb(s)"]
+    joins = []
+    params = {}
+    
+    if include_tenant:
+        columns.append("jsonb_build_object('tenant', to_jsonb(ct))")
+        joins.append("""
+            LEFT JOIN (
+                SELECT * FROM v_room_current_tenant
+                WHERE tenant_role = 'primary' AND tenant_id IS NOT NULL
+            ) ct ON ct.room_id = s.room_id
+        """)
+    
+    if invoice_limit:
+        columns.append("jsonb_build_object('invoices', inv.invoices)")
+        joins.append("""
+            LEFT JOIN LATERAL (
+                SELECT COALESCE(jsonb_agg(to_jsonb(ph) ORDER BY ph.due_date DESC, ph.invoice_created_at DESC), '[]'::jsonb) AS invoices
+                FROM (
+                    SELECT * FROM v_room_payment_history
+                    WHERE room_id = s.room_id AND invoice_id IS NOT NULL
+                    ORDER BY due_date DESC, invoice_created_at DESC
+                    LIMIT :invoice_limit
+                ) ph
+            ) inv ON true
+        """)
+        params["invoice_limit"] = invoice_limit
+    
+    if reading_limit:
+        columns.append("jsonb_build_object('electricity', el.readings)")
+        joins.append("""
+            LEFT JOIN LATERAL (
+                SELECT COALESCE(jsonb_agg(to_jsonb(eh) ORDER BY eh.read_date DESC), '[]'::jsonb) AS readings
+                FROM (
+                    SELECT * FROM v_room_electricity_history
+                    WHERE room_id = s.room_id
+                    ORDER BY read_date DESC
+                    LIMIT :reading_limit
+                ) eh
+            ) el ON true
+        """)
+        params["reading_limit"] = reading_limit
+    
+    query = f"SELECT ({' || '.join(columns)})::text AS doc FROM {view} s {''.join(joins)}"
+    if building_id:
+        query += " WHERE s.building_id = :building_id"
+        params["building_id"] = building_id
+    query += " ORDER BY s.building_id, s.floor_no, s.room_no"
+    
+    try:
+        result = await db.stream(text(query), params)
+    except Exception as e:
+        if "does not exist" in str(e) or "relation" in str(e).lower():
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="SQL views not found. Please run backend/app/db/views/room_dashboard_views.sql to create the views."
+            )
+        raise
+    
+    async def stream_rows():
+        yield "["
+        separator = ""
+        async for doc in result.scalars():
+            yield separator + doc
+            separator = ","
+        yield "]"
+    
+    return StreamingResponse(stream_rows(), media_type="application/json")
+
+
+# Declared before /{room_id} so "availability" is not parsed as a room id
+@router.get("/availability", response_model=List[RoomAvailability])
+async def get_rooms_availability(
+    date_from: date = Query(..., alias="from", description="First day of the window (YYYY-MM-DD)"),
+    date_to: date = Query(..., alias="to", description="Last day of the window (YYYY-MM-DD)"),
+    building_id: Optional[int] = Query(None, description="Filter by building ID"),
+    min_days: int = Query(1, ge=1, description="Ignore free intervals shorter than this many days"),
+    available_only: bool = Query(False, description="Only return rooms with at least one free interval"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Free intervals of every rentable room between from and to (inclusive).
+    
+    A room is taken on the days covered by a submitted lease (pending, active, or
+    terminated up to its termination date); draft leases do not reserve it.
+    Computed for all rooms in a single query.
+    """
+    try:
+        return await OccupancyService.get_room_availability(
+            db,
+            date_from=date_from,
+            date_to=date_to,
+            building_id=building_id,
+            min_days=min_days,
+            available_only=available_only,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{room_id}")
@@ -95,37 +219,37 @@ async def get_room(room_id: int, db: AsyncSession = Depends(get_db)):
     )
     has_active_lease = lease_result.scalar_one_or_none() is not None
     
-    return {
+    return ORJSONResponse({
         "id": room.id,
         "building_id": room.building_id,
         "floor_no": room.floor_no,
         "room_no": room.room_no,
         "roomNumber": f"{room.floor_no}{room.room_no}",
-        "size_ping": float(room.size_ping) if room.size_ping else None,
+        "size_ping": room.size_ping or None,
         "status": "Occupied" if has_active_lease else "Vacant",
         "building": {
             "id": room.building.id,
             "building_no": room.building.building_no,
             "address": room.building.address,
         } if room.building else None,
-    }
-
-
-def _serialize_row(row) -> dict:
-    """Convert row to dict and serialize datetime objects to ISO format strings"""
-    data = dict(row._mapping)
-    for key, value in data.items():
-        if isinstance(value, datetime):
-            data[key] = value.isoformat()
-    return data
+    })
 
 
 @router.get("/{room_id}/dashboard")
-async def get_room_dashboard(room_id: int, db: AsyncSession = Depends(get_db)):
+async def get_room_dashboard(
+    room_id: int,
+    use_stats: bool = Query(
+        True,
+        description="Read aggregates from the trigger-maintained summary tables (v_room_dashboard_stats) "
+                    "instead of recomputing them from invoice/meter_reading (v_room_dashboard_summary)"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
     """Get complete dashboard summary for a room"""
+    view = "v_room_dashboard_stats" if use_stats else "v_room_dashboard_summary"
     try:
         result = await db.execute(
-            text("SELECT * FROM v_room_dashboard_summary WHERE room_id = :room_id"),
+            text(f"SELECT * FROM {view} WHERE room_id = :room_id"),
             {"room_id": room_id}
         )
         row = result.first()
@@ -136,7 +260,7 @@ async def get_room_dashboard(room_id: int, db: AsyncSession = Depends(get_db)):
                 detail=f"Room with id {room_id} not found"
             )
         
-        return _serialize_row(row)
+        return ORJSONResponse(dict(row._mapping))
     except Exception as e:
         if "does not exist" in str(e) or "relation" in str(e).lower():
             raise HTTPException(
@@ -168,15 +292,14 @@ async def get_room_tenant(room_id: int, db: AsyncSession = Depends(get_db)):
         if not tenant_id:
             return None
         
-        data = _serialize_row(row)
+        data = dict(row._mapping)
         
         # Format assets if present
         if data.get('assets'):
-            import json
             if isinstance(data['assets'], str):
-                data['assets'] = json.loads(data['assets'])
+                data['assets'] = orjson.loads(data['assets'])
         
-        return data
+        return ORJSONResponse(data)
     except Exception as e:
         if "does not exist" in str(e) or "relation" in str(e).lower():
             raise HTTPException(
@@ -207,17 +330,16 @@ async def get_room_tenants(room_id: int, db: AsyncSession = Depends(get_db)):
         for row in rows:
             tenant_id = row._mapping.get('tenant_id')
             if tenant_id:
-                data = _serialize_row(row)
+                data = dict(row._mapping)
                 
                 # Format assets if present
                 if data.get('assets'):
-                    import json
                     if isinstance(data['assets'], str):
-                        data['assets'] = json.loads(data['assets'])
+                        data['assets'] = orjson.loads(data['assets'])
                 
                 tenants.append(data)
         
-        return tenants
+        return ORJSONResponse(tenants)
     except Exception as e:
         if "does not exist" in str(e) or "relation" in str(e).lower():
             raise HTTPException(
@@ -254,9 +376,8 @@ async def get_room_invoices(
         params["offset"] = offset
         
         result = await db.execute(text(query), params)
-        rows = result.all()
         
-        return [_serialize_row(row) for row in rows]
+        return ORJSONResponse([dict(row) for row in result.mappings()])
     except Exception as e:
         if "does not exist" in str(e) or "relation" in str(e).lower():
             raise HTTPException(
@@ -293,9 +414,8 @@ async def get_room_electricity(
         params["offset"] = offset
         
         result = await db.execute(text(query), params)
-        rows = result.all()
         
-        return [_serialize_row(row) for row in rows]
+        return ORJSONResponse([dict(row) for row in result.mappings()])
     except Exception as e:
         if "does not exist" in str(e) or "relation" in str(e).lower():
             raise HTTPException(
@@ -367,8 +487,8 @@ async def get_electricity_rate(
     Returns the rate that applies to the room on the given date.
     Priority:
     1. Room-specific rate that covers the date
-    2. Building-level rate that covers the date
-    3. Default rate (6.0) if no rate is found
+    2. Default rate (room_id NULL) that covers the date
+    3. Fallback rate (6.0) if no rate is found
     
     Returns the rate_per_kwh value.
     """
@@ -401,10 +521,10 @@ async def get_electricity_rate(
             "is_default": True
         }
     
-    return {
-        "rate_per_kwh": float(rate.rate_per_kwh),
+    return ORJSONResponse({
+        "rate_per_kwh": rate.rate_per_kwh,
         "is_default": False,
         "rate_id": rate.id,
-        "start_date": rate.start_date.isoformat() if rate.start_date else None,
-        "end_date": rate.end_date.isoformat() if rate.end_date else None
-    }
+        "start_date": rate.start_date,
+        "end_date": rate.end_date
+    })
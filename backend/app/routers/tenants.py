@@ -3,64 +3,71 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Literal, Optional, Union
+from pydantic import TypeAdapter
 import json
-import re
 
 from app.db.session import get_db
 from app.models.tenant import Tenant
 from app.models.lease import Lease, LeaseTenant
 from app.models.room import Room
-from app.schemas.tenant import TenantCreate
+from app.responses import ORJSONResponse
+from app.schemas.tenant import TenantCreate, TenantSearchResult, TenantSuggestion, TenantSummary
+from app.services.tenant_service import TENANT_SUMMARY_FIELDS, TenantService, tenant_list_filter
 
 router = APIRouter(prefix="/tenants", tags=["Tenants"])
 
+_summaries_adapter = TypeAdapter(List[TenantSummary])
 
-@router.get("/", response_model=List[dict])
+
+@router.get("/", response_model=Union[List[TenantSummary], List[dict]])
 async def list_tenants(
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: str = Query(None, description="Search by tenant name or room format (e.g., '6.1A')"),
+    view: Optional[Literal["summary", "full"]] = Query(
+        None,
+        description="summary: flat rows from v_tenant_summary; full: nested rows from v_tenant_complete "
+                    "(default, or summary when fields is given)"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated summary fields to return (implies view=summary). "
+                    f"Allowed: {', '.join(TENANT_SUMMARY_FIELDS)}"
+    ),
 ):
-    """List all tenants using v_tenant_complete view"""
+    """
+    List tenants.
+
+    view=summary (or fields=...) selects only the list columns from v_tenant_summary and
+    returns flat TenantSummary rows; view=full keeps the nested v_tenant_complete rows
+    with emergency contacts and lease assets.
+    """
+    if view is None:
+        view = "summary" if fields else "full"
+    if view == "full" and fields:
+        raise HTTPException(status_code=400, detail="fields is only supported with view=summary")
+
+    if view == "summary":
+        try:
+            rows = await TenantService.list_tenant_summaries(
+                db,
+                fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+                search=search,
+                skip=skip,
+                limit=limit,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Validated as TenantSummary; with fields=, only the selected keys are sent
+        summaries = _summaries_adapter.validate_python(rows)
+        return ORJSONResponse(_summaries_adapter.dump_python(summaries, exclude_unset=bool(fields)))
+
     try:
-        # Build WHERE clause based on search parameter
-        where_clause = ""
-        params = {"limit": limit, "offset": skip}
-        
-        if search:
-            search_lower = search.strip().lower()
-            # Check if search matches room format: building.floor_room (e.g., "6.1A")
-            room_pattern = re.match(r'^(\d+)\.(\d+)([a-zA-Z]+)$', search)
-            
-            if room_pattern:
-                # Search by building and room format
-                building_no = room_pattern.group(1)
-                floor_no = room_pattern.group(2)
-                room_no = room_pattern.group(3)
-                where_clause = """
-                    WHERE building_no = :building_no 
-                    AND floor_no = :floor_no 
-                    AND room_no = :room_no
-                """
-                params.update({
-                    "building_no": int(building_no),
-                    "floor_no": int(floor_no),
-                    "room_no": room_no
-                })
-            else:
-                # Search by tenant name (first_name, last_name, or full name)
-                where_clause = """
-                    WHERE (
-                        LOWER(first_name) LIKE :search_pattern 
-                        OR LOWER(last_name) LIKE :search_pattern
-                        OR LOWER(CONCAT(last_name, first_name)) LIKE :search_pattern
-                        OR LOWER(CONCAT(first_name, ' ', last_name)) LIKE :search_pattern
-                    )
-                """
-                params["search_pattern"] = f"%{search_lower}%"
-        
+        where_clause, params = tenant_list_filter(search)
+        params.update({"limit": limit, "offset": skip})
+
         result = await db.execute(
             text(f"""
                 SELECT * FROM v_tenant_complete 
@@ -93,7 +100,7 @@ async def list_tenants(
                 "last_name": tenant_dict['last_name'],
                 "name": tenant_dict['tenant_name'],
                 "gender": tenant_dict['gender'],
-                "birthday": str(tenant_dict['birthday']) if tenant_dict['birthday'] else None,
+                "birthday": tenant_dict['birthday'],
                 "personal_id": tenant_dict['personal_id'],
                 "idNumber": tenant_dict['personal_id'],
                 "phone": tenant_dict['phone'],
@@ -104,17 +111,17 @@ async def list_tenants(
                 "emergency_contacts": tenant_dict['emergency_contacts'],
                 "active_lease": {
                     "id": tenant_dict['lease_id'],
-                    "start_date": str(tenant_dict['lease_start_date']) if tenant_dict['lease_start_date'] else None,
-                    "end_date": str(tenant_dict['terminated_at']) if tenant_dict.get('terminated_at') else (str(tenant_dict['lease_end_date']) if tenant_dict['lease_end_date'] else None),
-                    "monthly_rent": float(tenant_dict['monthly_rent']) if tenant_dict['monthly_rent'] else None,
-                    "deposit": float(tenant_dict['deposit']) if tenant_dict['deposit'] else None,
+                    "start_date": tenant_dict['lease_start_date'],
+                    "end_date": tenant_dict['terminated_at'] or tenant_dict['lease_end_date'],
+                    "monthly_rent": tenant_dict['monthly_rent'] or None,  # 0 is sent as null
+                    "deposit": tenant_dict['deposit'] or None,
                     "status": tenant_dict['lease_status'],
                     "payment_term": tenant_dict['payment_term'],
                     "vehicle_plate": tenant_dict['vehicle_plate'],
                     "assets": tenant_dict['lease_assets'],
-                    "asset_keys_quantity": int(tenant_dict.get('asset_keys_quantity', 0)) if tenant_dict.get('asset_keys_quantity') is not None else 0,
-                    "asset_fob_quantity": int(tenant_dict.get('asset_fob_quantity', 0)) if tenant_dict.get('asset_fob_quantity') is not None else 0,
-                    "asset_remote_quantity": int(tenant_dict.get('asset_remote_quantity', 0)) if tenant_dict.get('asset_remote_quantity') is not None else 0,
+                    "asset_keys_quantity": tenant_dict['asset_keys_quantity'] or 0,
+                    "asset_fob_quantity": tenant_dict['asset_fob_quantity'] or 0,
+                    "asset_remote_quantity": tenant_dict['asset_remote_quantity'] or 0,
                     "room": {
                         "id": tenant_dict['room_id'],
                         "floor_no": tenant_dict['floor_no'],
@@ -139,7 +146,7 @@ async def list_tenants(
                 } if tenant_dict['building_id'] else None,
             })
         
-        return tenants
+        return ORJSONResponse(tenants)
     except Exception as e:
         if "does not exist" in str(e) or "relation" in str(e).lower():
             raise HTTPException(
@@ -149,6 +156,29 @@ async def list_tenants(
         raise
 
 
+@router.get("/search", response_model=List[TenantSearchResult])
+async def search_tenants(
+    q: str = Query(..., min_length=1, description="Name, phone, personal ID or vehicle plate"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Ranked tenant search over names (CJK without spaces, either name order), phone
+    numbers (digits only), personal IDs and vehicle plates.
+    """
+    return await TenantService.search_tenants(db, q, limit=limit)
+
+
+@router.get("/autocomplete", response_model=List[TenantSuggestion])
+async def autocomplete_tenants(
+    q: str = Query(..., min_length=1, description="Start of a name, phone number or personal ID"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """Type-ahead suggestions: id, name and room of tenants matching the prefix"""
+    return await TenantService.autocomplete_tenants(db, q, limit=limit)
+
+
 @router.get("/{tenant_id}", response_model=dict)
 async def get_tenant(tenant_id: int, db: AsyncSession = Depends(get_db)):
     """Get a tenant by ID using v_tenant_complete view"""
@@ -200,13 +230,13 @@ async def get_tenant(tenant_id: int, db: AsyncSession = Depends(get_db)):
                     "landlord_address": building_row['landlord_address'],
                 }
         
-        return {
+        return ORJSONResponse({
             "id": tenant_dict['tenant_id'],
             "first_name": tenant_dict['first_name'],
             "last_name": tenant_dict['last_name'],
             "name": tenant_dict['tenant_name'],
             "gender": tenant_dict['gender'],
-            "birthday": str(tenant_dict['birthday']) if tenant_dict['birthday'] else None,
+            "birthday": tenant_dict['birthday'],
             "personal_id": tenant_dict['personal_id'],
             "idNumber": tenant_dict['personal_id'],
             "phone": tenant_dict['phone'],
@@ -217,17 +247,17 @@ async def get_tenant(tenant_id: int, db: AsyncSession = Depends(get_db)):
             "emergency_contacts": tenant_dict['emergency_contacts'],
             "active_lease": {
                 "id": tenant_dict['lease_id'],
-                "start_date": str(tenant_dict['lease_start_date']) if tenant_dict['lease_start_date'] else None,
-                "end_date": str(tenant_dict['terminated_at']) if tenant_dict.get('terminated_at') else (str(tenant_dict['lease_end_date']) if tenant_dict['lease_end_date'] else None),
-                "monthly_rent": float(tenant_dict['monthly_rent']) if tenant_dict['monthly_rent'] else None,
-                "deposit": float(tenant_dict['deposit']) if tenant_dict['deposit'] else None,
+                "start_date": tenant_dict['lease_start_date'],
+                "end_date": tenant_dict['terminated_at'] or tenant_dict['lease_end_date'],
+                "monthly_rent": tenant_dict['monthly_rent'] or None,
+                "deposit": tenant_dict['deposit'] or None,
                 "status": tenant_dict['lease_status'],
                 "payment_term": tenant_dict['payment_term'],
                 "vehicle_plate": tenant_dict['vehicle_plate'],
                 "assets": tenant_dict['lease_assets'],
-                "asset_keys_quantity": int(tenant_dict.get('asset_keys_quantity', 0)) if tenant_dict.get('asset_keys_quantity') is not None else 0,
-                "asset_fob_quantity": int(tenant_dict.get('asset_fob_quantity', 0)) if tenant_dict.get('asset_fob_quantity') is not None else 0,
-                "asset_remote_quantity": int(tenant_dict.get('asset_remote_quantity', 0)) if tenant_dict.get('asset_remote_quantity') is not None else 0,
+                "asset_keys_quantity": tenant_dict['asset_keys_quantity'] or 0,
+                "asset_fob_quantity": tenant_dict['asset_fob_quantity'] or 0,
+                "asset_remote_quantity": tenant_dict['asset_remote_quantity'] or 0,
                 "room": {
                     "id": tenant_dict['room_id'],
                     "floor_no": tenant_dict['floor_no'],
@@ -250,7 +280,7 @@ async def get_tenant(tenant_id: int, db: AsyncSession = Depends(get_db)):
                 "landlord_name": building_landlord_info['landlord_name'] if building_landlord_info else None,
                 "landlord_address": building_landlord_info['landlord_address'] if building_landlord_info else None,
             } if tenant_dict['building_id'] else None,
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -268,8 +298,6 @@ async def create_tenant(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new tenant"""
-    from app.services.tenant_service import TenantService
-    
     tenant = await TenantService.create_or_update_tenant(db, tenant_data)
     
     # Reload with relationships to get emergency contacts
@@ -304,8 +332,6 @@ async def update_tenant(
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing tenant"""
-    from app.services.tenant_service import TenantService
-    
     # Update tenant using the service method with tenant_id
     updated_tenant = await TenantService.create_or_update_tenant(
         db, 
@@ -1,8 +1,8 @@
 # app/schemas/electricity.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 
 class MeterReadingCreate(BaseModel):
@@ -25,8 +25,7 @@ class MeterReadingResponse(BaseModel):
 
 class ElectricityRateCreate(BaseModel):
     """Schema for creating an electricity rate"""
-    building_id: int = Field(..., description="ID of the building")
-    room_id: Optional[int] = Field(None, description="ID of the room (optional, for room-specific rates)")
+    room_id: Optional[int] = Field(None, description="ID of the room (omit for a default rate that applies to all rooms)")
     start_date: date = Field(..., description="Start date of the rate")
     end_date: date = Field(..., description="End date of the rate")
     rate_per_kwh: Decimal = Field(..., gt=0, description="Rate per kWh")
@@ -35,7 +34,6 @@ class ElectricityRateCreate(BaseModel):
 class ElectricityRateResponse(BaseModel):
     """Schema for electricity rate response"""
     id: int
-    building_id: int
     room_id: Optional[int]
     start_date: date
     end_date: date
@@ -55,3 +53,66 @@ class ElectricityBillCalculation(BaseModel):
     period_start: date = Field(..., description="Period start date")
     period_end: date = Field(..., description="Period end date")
 
+
+
+class BillingRunReading(BaseModel):
+    """Schema for one room's meter reading in a building billing run"""
+    room_id: int = Field(..., description="ID of the room")
+    read_amount: Decimal = Field(..., ge=0, description="Meter reading amount (kWh) on the billing date")
+
+
+class BillingRunCreate(BaseModel):
+    """Schema for billing electricity for every room of a building in one run"""
+    building_id: int = Field(..., description="ID of the building")
+    reading_date: date = Field(..., description="Date of the meter readings (period end of the bills)")
+    readings: List[BillingRunReading] = Field(..., min_length=1, description="Current meter readings, one per room")
+
+    @field_validator("readings")
+    @classmethod
+    def validate_unique_rooms(cls, v: List[BillingRunReading]) -> List[BillingRunReading]:
+        room_ids = [r.room_id for r in v]
+        if len(room_ids) != len(set(room_ids)):
+            raise ValueError("readings must contain at most one entry per room_id")
+        return v
+
+
+class BillingRunRoomResult(BaseModel):
+    """Schema for the billing outcome of one room"""
+    room_id: int
+    status: str = Field(..., description="'billed', 'already_billed' or 'skipped'")
+    reason: Optional[str] = Field(None, description="Why the room was skipped")
+    lease_id: Optional[int] = None
+    invoice_id: Optional[int] = None
+    previous_reading: Optional[Decimal] = None
+    current_reading: Decimal
+    usage_kwh: Optional[Decimal] = None
+    rate_per_kwh: Optional[Decimal] = None
+    bill_amount: Optional[Decimal] = None
+    period_start: Optional[date] = None
+    period_end: date
+
+
+class BillingRunResponse(BaseModel):
+    """Schema for building billing run response"""
+    building_id: int
+    reading_date: date
+    billed: int = Field(..., description="Number of invoices created")
+    already_billed: int = Field(..., description="Rooms whose invoice for the period already existed")
+    skipped: int = Field(..., description="Rooms that could not be billed")
+    results: List[BillingRunRoomResult]
+
+
+class MeterReadingRejection(BaseModel):
+    """Schema for a meter reading rejected by a bulk import"""
+    room_id: int
+    read_date: date
+    read_amount: Decimal
+    reason: str
+
+
+class MeterReadingBulkResponse(BaseModel):
+    """Schema for bulk meter reading import response"""
+    received: int = Field(..., description="Number of readings in the request")
+    inserted: int = Field(..., description="Number of new readings stored")
+    updated: int = Field(..., description="Number of existing readings (same room and date) overwritten")
+    rejected: List[MeterReadingRejection] = Field(default=[], description="Readings that were not stored")
@@ -2,7 +2,7 @@
 from pydantic import BaseModel, Field
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 
 class RentCalculationRequest(BaseModel):
@@ -90,3 +90,32 @@ class InvoiceTransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class InvoiceGenerationRequest(BaseModel):
+    """Schema for a batch rent invoice generation run"""
+    target_date: date = Field(default_factory=date.today, description="Bill periods starting on or before this date (default: today)")
+    since: Optional[date] = Field(None, description="Ignore periods starting before this date")
+    building_id: Optional[int] = Field(None, description="Only leases in this building")
+    dry_run: bool = Field(default=False, description="Only count the invoices that would be created")
+
+
+class InvoiceGenerationResponse(BaseModel):
+    """Schema for the result of a rent invoice generation run"""
+    target_date: date
+    created: int = Field(..., description="Number of rent invoices created (or that would be created on a dry run)")
+    total_amount: Decimal = Field(..., description="Sum of their due amounts")
+    dry_run: bool
+
+
+class InvoiceStatusSweepRequest(BaseModel):
+    """Schema for an overdue status sweep"""
+    as_of: date = Field(default_factory=date.today, description="Day the sweep runs for (default: today)")
+    grace_days: int = Field(default=0, ge=0, description="Days after the due date before an invoice counts as overdue")
+
+
+class InvoiceStatusSweepResponse(BaseModel):
+    """Schema for the result of an overdue status sweep"""
+    as_of: date
+    marked_overdue: int = Field(..., description="Number of invoices moved from 'unmatured' to 'overdue'")
+    invoice_ids: List[int]
@@ -192,3 +192,23 @@ class ProrationCalculationResponse(BaseModel):
     days_used: int = Field(..., description="Number of days used in the termination month")
     days_in_month: int = Field(..., description="Total number of days in the termination month")
 
+
+
+class RentSchedulePeriodResponse(BaseModel):
+    """Schema for one billing period of the rent schedule"""
+    period_no: int
+    period_start: date
+    period_end: date
+    due_date: date = Field(..., description="First pay_rent_on day on or after period_start")
+    monthly_rent: Decimal = Field(..., description="Monthly rent in effect on period_start (after rent changes)")
+    base_amount: Decimal = Field(..., description="Rent for the period before discounts (partial months prorated)")
+    discount_amount: Decimal
+    amount: Decimal = Field(..., description="Rent due for the period")
+
+    class Config:
+        from_attributes = True
+
+
+class RentScheduleRebuildResponse(BaseModel):
+    """Result of rebuilding the rent schedule"""
+    rows: int = Field(..., description="Number of rent schedule periods written")
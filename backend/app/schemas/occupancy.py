@@ -0,0 +1,38 @@
+# app/schemas/occupancy.py
+from pydantic import BaseModel, Field
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+
+class FreeInterval(BaseModel):
+    """A period in which a room has no submitted lease"""
+    start: date
+    end: date = Field(..., description="Last free day (inclusive)")
+    days: int
+
+
+class RoomAvailability(BaseModel):
+    """Free intervals of one room within the requested window"""
+    room_id: int
+    building_id: int
+    building_no: int
+    floor_no: int
+    room_no: str
+    room_number: str
+    free_days: int = Field(..., description="Total free days in the window (intervals shorter than min_days excluded)")
+    free_intervals: List[FreeInterval]
+
+
+class OccupancyPeriod(BaseModel):
+    """Occupancy and vacancy of the rentable rooms in one period"""
+    period_start: date
+    period_end: date = Field(..., description="Last day of the period (inclusive, clipped to the requested window)")
+    rooms: int = Field(..., description="Rentable rooms counted")
+    room_days: int = Field(..., description="rooms x days in the period")
+    occupied_room_days: int
+    vacant_room_days: int
+    occupancy_rate: Decimal = Field(..., description="occupied_room_days / room_days")
+    vacancy_rate: Decimal = Field(..., description="vacant_room_days / room_days")
+    vacancy_count: int = Field(..., description="Vacancy spells starting in this period")
+    avg_vacancy_days: Optional[Decimal] = Field(None, description="Average length of those spells within the window")
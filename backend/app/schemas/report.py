@@ -0,0 +1,38 @@
+# app/schemas/report.py
+from pydantic import BaseModel, Field
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+
+class NAOIMonth(BaseModel):
+    """Operating income and expenses of one month"""
+    month: date = Field(..., description="First day of the month")
+    income: Decimal
+    expenses: Decimal
+    net: Decimal
+
+
+class NAOICategory(BaseModel):
+    """Yearly total of one cash flow category"""
+    category_id: int
+    category_code: str
+    category_name: str
+    direction: str
+    amount: Decimal
+
+
+class NAOIReport(BaseModel):
+    """Net Annual Operating Income of one year for a building (or the whole portfolio)"""
+    year: int
+    building_id: Optional[int] = Field(None, description="Building ID (null for portfolio-wide or company-level entries)")
+    operating_income: Decimal
+    operating_expenses: Decimal
+    naoi: Decimal = Field(..., description="operating_income - operating_expenses")
+    months: List[NAOIMonth]
+    categories: List[NAOICategory]
+
+
+class RollupRebuildResponse(BaseModel):
+    """Result of rebuilding the cash flow monthly rollup"""
+    rows: int = Field(..., description="Number of rollup rows written")
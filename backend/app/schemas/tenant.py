@@ -1,6 +1,7 @@
 # app/schemas/tenant.py
 from pydantic import BaseModel, Field, field_validator
 from datetime import date
+from decimal import Decimal
 from typing import List, Optional
 
 
@@ -66,3 +67,50 @@ class TenantResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class TenantSearchResult(BaseModel):
+    """Schema for a ranked tenant search result"""
+    id: int
+    name: str
+    first_name: str
+    last_name: str
+    phone: str
+    room_id: Optional[int] = Field(None, description="Room of the current (or latest) lease")
+    room: Optional[str] = Field(None, description="Room as building.floor+room, e.g. '6.1A'")
+    score: float = Field(..., description="Match rank: 2 = word prefix, 1 = substring, plus trigram word similarity")
+
+
+class TenantSuggestion(BaseModel):
+    """Schema for a tenant autocomplete suggestion"""
+    id: int
+    name: str
+    room_id: Optional[int] = None
+    room: Optional[str] = Field(None, description="Room as building.floor+room, e.g. '6.1A'")
+
+
+class TenantSummary(BaseModel):
+    """
+    Schema for a tenant list row (GET /tenants/?view=summary).
+
+    With fields=, only id and the requested fields are present.
+    """
+    id: int
+    name: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    gender: Optional[str] = None
+    phone: Optional[str] = None
+    personal_id: Optional[str] = None
+    email: Optional[str] = None
+    line_id: Optional[str] = None
+    lease_id: Optional[int] = None
+    lease_status: Optional[str] = Field(None, description="draft, pending, active, expired or terminated")
+    lease_start_date: Optional[date] = None
+    lease_end_date: Optional[date] = Field(None, description="Termination date if terminated, otherwise end date")
+    monthly_rent: Optional[Decimal] = None
+    payment_term: Optional[str] = None
+    room_id: Optional[int] = None
+    room: Optional[str] = Field(None, description="Room as building.floor+room, e.g. '6.1A'")
+    building_id: Optional[int] = None
+    building_no: Optional[int] = None
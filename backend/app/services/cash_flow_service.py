@@ -0,0 +1,131 @@
+# app/services/cash_flow_service.py
+from datetime import date
+from typing import Optional, Sequence
+
+from sqlalchemy import Date, Select, cast, func, literal_column, select, tuple_
+
+from app.models.cash_flow import CashFlow, CashFlowCategory
+
+
+# Dimensions accepted by CashFlowService.aggregate_query (group_by)
+AGGREGATE_DIMENSIONS = ("month", "year", "category", "building", "account")
+
+
+class CashFlowService:
+    """Service for querying the cash flow ledger"""
+
+    @staticmethod
+    def _filter(
+        query: Select,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        direction: Optional[str] = None,
+        category_id: Optional[int] = None,
+        building_id: Optional[int] = None,
+        room_id: Optional[int] = None,
+        lease_id: Optional[int] = None,
+        cash_account_id: Optional[int] = None,
+    ) -> Select:
+        """Apply the ledger filters shared by listing and aggregation"""
+        query = query.where(CashFlow.deleted_at.is_(None))
+        if date_from:
+            query = query.where(CashFlow.flow_date >= date_from)
+        if date_to:
+            query = query.where(CashFlow.flow_date <= date_to)
+        if direction:
+            query = query.where(CashFlowCategory.direction == direction)
+        if category_id:
+            query = query.where(CashFlow.category_id == category_id)
+        if building_id:
+            query = query.where(CashFlow.building_id == building_id)
+        if room_id:
+            query = query.where(CashFlow.room_id == room_id)
+        if lease_id:
+            query = query.where(CashFlow.lease_id == lease_id)
+        if cash_account_id:
+            query = query.where(CashFlow.cash_account_id == cash_account_id)
+        return query
+
+    @staticmethod
+    def list_query(
+        cursor: Optional[tuple[date, int]] = None,
+        limit: Optional[int] = None,
+        **filters
+    ) -> Select:
+        """
+        Build the cash flow listing query, newest first.
+        
+        Args:
+            cursor: (flow_date, id) of the last row of the previous page (keyset pagination)
+            limit: Maximum number of rows (None for no limit)
+            **filters: See _filter
+        """
+        query = select(CashFlow, CashFlowCategory).join(
+            CashFlowCategory, CashFlow.category_id == CashFlowCategory.id
+        )
+        query = CashFlowService._filter(query, **filters)
+        if cursor:
+            query = query.where(tuple_(CashFlow.flow_date, CashFlow.id) < tuple_(*cursor))
+        query = query.order_by(CashFlow.flow_date.desc(), CashFlow.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    @staticmethod
+    def aggregate_query(group_by: Sequence[str], **filters) -> Select:
+        """
+        Build a GROUP BY query summing the ledger per requested dimensions.
+        
+        Every row has total_in, total_out (transfers are excluded from both),
+        net = total_in - total_out and entry_count, plus one column per dimension:
+        - month / year: first day of the period (date_trunc on flow_date)
+        - category: category_id, category_code, category_name, direction
+        - building: building_id (NULL for entries not tied to a building)
+        - account: cash_account_id
+        
+        Args:
+            group_by: Dimensions from AGGREGATE_DIMENSIONS
+            **filters: See _filter
+        """
+        unknown = [d for d in group_by if d not in AGGREGATE_DIMENSIONS]
+        if unknown:
+            raise ValueError(
+                f"Invalid group_by dimension(s): {', '.join(unknown)}. "
+                f"Allowed: {', '.join(AGGREGATE_DIMENSIONS)}"
+            )
+        
+        columns = []
+        for dimension in dict.fromkeys(group_by):
+            if dimension in ("month", "year"):
+                # Inline the field name so SELECT and GROUP BY render the same expression
+                # (a bound parameter would make them differ for PostgreSQL)
+                period = func.date_trunc(literal_column(f"'{dimension}'"), CashFlow.flow_date)
+                columns.append(cast(period, Date).label(dimension))
+            elif dimension == "category":
+                columns += [
+                    CashFlow.category_id.label("category_id"),
+                    CashFlowCategory.code.label("category_code"),
+                    CashFlowCategory.chinese_name.label("category_name"),
+                    CashFlowCategory.direction.label("direction"),
+                ]
+            elif dimension == "building":
+                columns.append(CashFlow.building_id.label("building_id"))
+            elif dimension == "account":
+                columns.append(CashFlow.cash_account_id.label("cash_account_id"))
+        
+        total_in = func.coalesce(func.sum(CashFlow.amount).filter(CashFlowCategory.direction == "in"), 0)
+        total_out = func.coalesce(func.sum(CashFlow.amount).filter(CashFlowCategory.direction == "out"), 0)
+        query = select(
+            *columns,
+            total_in.label("total_in"),
+            total_out.label("total_out"),
+            (total_in - total_out).label("net"),
+            func.count().label("entry_count"),
+        ).select_from(CashFlow).join(
+            CashFlowCategory, CashFlow.category_id == CashFlowCategory.id
+        )
+        query = CashFlowService._filter(query, **filters)
+        
+        if columns:
+            query = query.group_by(*columns).order_by(*columns)
+        return query
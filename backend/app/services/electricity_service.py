@@ -1,15 +1,116 @@
 # app/services/electricity_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, func, literal_column, text, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import date
 from decimal import Decimal
 from typing import Optional
 
+from app.metrics import invoices_generated_total, meter_readings_ingested_total
 from app.models.electricity import ElectricityRate, MeterReading
+from app.models.invoice import Invoice
+from app.models.lease import Lease
 from app.models.room import Room
+from app.schemas.electricity import BillingRunReading, ElectricityRateCreate, MeterReadingCreate
+from app.services.rate_resolver import ResolvedRate, rate_resolver
 from fastapi import HTTPException, status as http_status
 
 
+# Above this many rows, bulk imports are staged with COPY into a temp table
+# instead of being bound as array parameters.
+BULK_COPY_THRESHOLD = 5000
+
+# Validates staged readings in two passes, then upserts the valid ones in the same
+# statement:
+# 1. Against stored readings only: a reading must not be lower than any earlier stored
+#    reading nor higher than any later one of the same room, and the room must exist.
+# 2. Across the readings that passed, with window functions: consecutive staged
+#    readings of a room must not go backwards. Stored readings between two of them
+#    already lie between both after pass 1, so only staged neighbours are compared.
+# A bad reading is thus rejected on its own when stored readings show it is wrong;
+# only conflicts between staged readings reject both sides.
+_BULK_UPSERT_METER_READINGS_SQL = """
+WITH staged AS (
+    {staged}
+),
+combined AS (
+    SELECT s.room_id, s.read_date, s.read_amount, TRUE AS is_staged
+    FROM staged s
+    UNION ALL
+    SELECT mr.room_id, mr.read_date, mr.read_amount, FALSE AS is_staged
+    FROM meter_reading mr
+    WHERE mr.room_id IN (SELECT room_id FROM staged)
+      AND NOT EXISTS (
+          SELECT 1 FROM staged s
+          WHERE s.room_id = mr.room_id AND s.read_date = mr.read_date
+      )
+),
+stored_bounds AS (
+    SELECT
+        c.*,
+        MAX(CASE WHEN NOT c.is_staged THEN c.read_amount END) OVER (
+            w ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+        ) AS previous_amount,
+        MIN(CASE WHEN NOT c.is_staged THEN c.read_amount END) OVER (
+            w ROWS BETWEEN 1 FOLLOWING AND UNBOUNDED FOLLOWING
+        ) AS next_amount,
+        EXISTS (
+            SELECT 1 FROM room r WHERE r.id = c.room_id AND r.deleted_at IS NULL
+        ) AS room_exists
+    FROM combined c
+    WINDOW w AS (PARTITION BY c.room_id ORDER BY c.read_date)
+),
+first_pass AS (
+    SELECT *
+    FROM stored_bounds
+    WHERE is_staged
+      AND room_exists
+      AND (previous_amount IS NULL OR read_amount >= previous_amount)
+      AND (next_amount IS NULL OR read_amount <= next_amount)
+),
+second_pass AS (
+    SELECT
+        f.room_id, f.read_date, f.read_amount,
+        LAG(f.read_date) OVER w AS staged_previous_date,
+        LAG(f.read_amount) OVER w AS staged_previous_amount,
+        LEAD(f.read_date) OVER w AS staged_next_date,
+        LEAD(f.read_amount) OVER w AS staged_next_amount
+    FROM first_pass f
+    WINDOW w AS (PARTITION BY f.room_id ORDER BY f.read_date)
+),
+upserted AS (
+    INSERT INTO meter_reading (room_id, read_date, read_amount, created_by)
+    SELECT room_id, read_date, read_amount, CAST(:created_by AS BIGINT)
+    FROM second_pass
+    WHERE (staged_previous_amount IS NULL OR read_amount >= staged_previous_amount)
+      AND (staged_next_amount IS NULL OR read_amount <= staged_next_amount)
+    ON CONFLICT (room_id, read_date) DO UPDATE
+    SET read_amount = EXCLUDED.read_amount,
+        updated_by = EXCLUDED.created_by,
+        updated_at = now()
+    RETURNING room_id, read_date, (xmax = 0) AS inserted
+)
+SELECT b.room_id, b.read_date, b.read_amount, b.previous_amount, b.next_amount,
+       b.room_exists, p.staged_previous_date, p.staged_previous_amount,
+       p.staged_next_date, p.staged_next_amount, u.inserted
+FROM stored_bounds b
+LEFT JOIN second_pass p ON p.room_id = b.room_id AND p.read_date = b.read_date
+LEFT JOIN upserted u ON u.room_id = b.room_id AND u.read_date = b.read_date
+WHERE b.is_staged
+"""
+
+_STAGED_FROM_ARRAYS = """
+    SELECT *
+    FROM unnest(
+        CAST(:room_ids AS BIGINT[]),
+        CAST(:read_dates AS DATE[]),
+        CAST(:read_amounts AS NUMERIC[])
+    ) AS t(room_id, read_date, read_amount)
+"""
+
+_STAGED_FROM_TEMP_TABLE = "SELECT room_id, read_date, read_amount FROM meter_reading_stage"
+
+
 class ElectricityService:
     """Service for managing electricity rates and meter readings"""
 
@@ -18,60 +119,55 @@ class ElectricityService:
         db: AsyncSession,
         room_id: int,
         target_date: date
-    ) -> Optional[ElectricityRate]:
+    ) -> Optional[ResolvedRate]:
         """
         Get the electricity rate for a room on a specific date.
         
         Priority:
         1. Room-specific rate that covers the date
-        2. Building-level rate that covers the date
+        2. Default rate (room_id NULL) that covers the date
+        
+        Served from the in-process rate index (see RateResolver), so repeated
+        lookups do not hit the database.
         """
-        # First try to get room-specific rate
-        room_result = await db.execute(
-            select(Room).where(Room.id == room_id)
-        )
-        room = room_result.scalar_one_or_none()
-        if not room:
+        if not await rate_resolver.room_exists(db, room_id):
             raise HTTPException(
                 status_code=http_status.HTTP_404_NOT_FOUND,
                 detail=f"Room with id {room_id} not found"
             )
 
-        # Try room-specific rate first
-        room_rate_result = await db.execute(
-            select(ElectricityRate)
-            .where(
-                and_(
-                    ElectricityRate.room_id == room_id,
-                    ElectricityRate.start_date <= target_date,
-                    ElectricityRate.end_date >= target_date
-                )
-            )
-            .order_by(desc(ElectricityRate.start_date))
-            .limit(1)
-        )
-        room_rate = room_rate_result.scalar_one_or_none()
-
-        if room_rate:
-            return room_rate
+        return await rate_resolver.resolve(db, room_id, target_date)
 
-        # Fall back to building-level rate
-        building_rate_result = await db.execute(
-            select(ElectricityRate)
-            .where(
-                and_(
-                    ElectricityRate.building_id == room.building_id,
-                    ElectricityRate.room_id.is_(None),
-                    ElectricityRate.start_date <= target_date,
-                    ElectricityRate.end_date >= target_date
-                )
+    @staticmethod
+    async def create_electricity_rate(
+        db: AsyncSession,
+        rate_data: ElectricityRateCreate,
+        created_by: Optional[int] = None
+    ) -> ElectricityRate:
+        """Create an electricity rate and invalidate the rate index"""
+        if rate_data.end_date < rate_data.start_date:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="end_date must be on or after start_date"
+            )
+        if rate_data.room_id is not None and not await rate_resolver.room_exists(db, rate_data.room_id):
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail=f"Room with id {rate_data.room_id} not found"
             )
-            .order_by(desc(ElectricityRate.start_date))
-            .limit(1)
-        )
-        building_rate = building_rate_result.scalar_one_or_none()
 
-        return building_rate
+        rate = ElectricityRate(
+            room_id=rate_data.room_id,
+            start_date=rate_data.start_date,
+            end_date=rate_data.end_date,
+            rate_per_kwh=rate_data.rate_per_kwh,
+            created_by=created_by,
+        )
+        db.add(rate)
+        await db.commit()
+        await db.refresh(rate)
+        rate_resolver.invalidate()
+        return rate
 
     @staticmethod
     async def get_previous_meter_reading(
@@ -117,6 +213,7 @@ class ElectricityService:
             existing.read_amount = read_amount
             existing.updated_by = created_by
             await db.flush()
+            meter_readings_ingested_total.inc(result="updated")
             return existing
 
         # Create new reading
@@ -128,6 +225,7 @@ class ElectricityService:
         )
         db.add(reading)
         await db.flush()
+        meter_readings_ingested_total.inc(result="inserted")
         return reading
 
     @staticmethod
@@ -271,3 +369,323 @@ class ElectricityService:
             "previous_reading": float(previous_reading)
         }
 
+    @staticmethod
+    async def bill_building(
+        db: AsyncSession,
+        building_id: int,
+        reading_date: date,
+        readings: list[BillingRunReading],
+        created_by: Optional[int] = None
+    ) -> list[dict]:
+        """
+        Record meter readings and create electricity invoices for a whole building.
+        
+        Runs in three statements regardless of the number of rooms:
+        1. One query resolving, per room, the previous and next readings, the active lease and
+           the applicable rate (room-specific first, then the default rate) via LATERAL joins
+        2. One multi-row upsert of the new meter readings
+        3. One multi-row INSERT ... ON CONFLICT DO NOTHING of the invoices on
+           uq_invoice_period_active, so re-running a billing run is idempotent
+        
+        Rooms that cannot be billed (not in the building, no previous reading, reading
+        going backwards or above a later stored reading, no active lease, no rate) are
+        reported instead of failing the run.
+        
+        Returns:
+            list of per-room result dicts (see BillingRunRoomResult)
+        """
+        readings_by_room = {r.room_id: r.read_amount for r in readings}
+        
+        previous = (
+            select(MeterReading.read_date, MeterReading.read_amount)
+            .where(
+                MeterReading.room_id == Room.id,
+                MeterReading.read_date < reading_date
+            )
+            .order_by(desc(MeterReading.read_date))
+            .limit(1)
+            .lateral("previous")
+        )
+        following = (
+            select(MeterReading.read_date, MeterReading.read_amount)
+            .where(
+                MeterReading.room_id == Room.id,
+                MeterReading.read_date > reading_date
+            )
+            .order_by(MeterReading.read_date)
+            .limit(1)
+            .lateral("following")
+        )
+        active_lease = (
+            select(Lease.id)
+            .where(
+                Lease.room_id == Room.id,
+                ~Lease.submitted_at.is_(None),
+                Lease.terminated_at.is_(None),
+                Lease.deleted_at.is_(None),
+                Lease.start_date <= reading_date,
+                Lease.end_date >= reading_date
+            )
+            .order_by(desc(Lease.start_date))
+            .limit(1)
+            .lateral("active_lease")
+        )
+        rate = (
+            select(ElectricityRate.rate_per_kwh)
+            .where(
+                (ElectricityRate.room_id == Room.id) | ElectricityRate.room_id.is_(None),
+                ElectricityRate.start_date <= reading_date,
+                ElectricityRate.end_date >= reading_date
+            )
+            # Room-specific rates win over the default (room_id IS NULL) rate
+            .order_by(ElectricityRate.room_id.is_(None), desc(ElectricityRate.start_date))
+            .limit(1)
+            .lateral("rate")
+        )
+        context_result = await db.execute(
+            select(
+                Room.id.label("room_id"),
+                previous.c.read_date.label("previous_date"),
+                previous.c.read_amount.label("previous_amount"),
+                following.c.read_date.label("next_date"),
+                following.c.read_amount.label("next_amount"),
+                active_lease.c.id.label("lease_id"),
+                rate.c.rate_per_kwh
+            )
+            .select_from(Room)
+            .outerjoin(previous, true())
+            .outerjoin(following, true())
+            .outerjoin(active_lease, true())
+            .outerjoin(rate, true())
+            .where(
+                Room.building_id == building_id,
+                Room.id.in_(list(readings_by_room)),
+                Room.deleted_at.is_(None)
+            )
+        )
+        context = {row.room_id: row for row in context_result.all()}
+        
+        results = []
+        invoice_rows = []
+        rejected_rooms = set()
+        for room_id, current in readings_by_room.items():
+            row = context.get(room_id)
+            result = {
+                "room_id": room_id,
+                "status": "skipped",
+                "current_reading": current,
+                "period_end": reading_date,
+            }
+            results.append(result)
+            
+            if row is None:
+                result["reason"] = f"Room {room_id} not found in building {building_id}"
+                continue
+            
+            result["lease_id"] = row.lease_id
+            result["previous_reading"] = row.previous_amount
+            result["period_start"] = row.previous_date
+            result["rate_per_kwh"] = row.rate_per_kwh
+            
+            if row.previous_amount is not None and current < row.previous_amount:
+                result["reason"] = f"Current reading ({current}) cannot be less than previous reading ({row.previous_amount})"
+                rejected_rooms.add(room_id)
+                continue
+            if row.next_amount is not None and current > row.next_amount:
+                result["reason"] = (
+                    f"Current reading ({current}) cannot be greater than the reading "
+                    f"of {row.next_date} ({row.next_amount})"
+                )
+                rejected_rooms.add(room_id)
+                continue
+            if row.previous_amount is None:
+                result["reason"] = f"No previous meter reading before {reading_date}"
+                continue
+            
+            result["usage_kwh"] = current - row.previous_amount
+            
+            if row.lease_id is None:
+                result["reason"] = f"No active lease on {reading_date}"
+                continue
+            if row.rate_per_kwh is None:
+                result["reason"] = f"No electricity rate found for {reading_date}"
+                continue
+            
+            result["bill_amount"] = (result["usage_kwh"] * row.rate_per_kwh).quantize(Decimal("0.01"))
+            invoice_rows.append({
+                "lease_id": row.lease_id,
+                "category": "electricity",
+                "period_start": row.previous_date,
+                "period_end": reading_date,
+                "due_amount": result["bill_amount"],
+                "paid_amount": Decimal(0),
+                "payment_status": "unmatured",
+                "created_by": created_by,
+            })
+        
+        # Upsert the readings of every room that belongs to the building, except
+        # non-monotonic ones: stored, they would break the next billing run
+        reading_rows = [
+            {
+                "room_id": room_id,
+                "read_date": reading_date,
+                "read_amount": amount,
+                "created_by": created_by,
+            }
+            for room_id, amount in readings_by_room.items()
+            if room_id in context and room_id not in rejected_rooms
+        ]
+        inserted = 0
+        if reading_rows:
+            stmt = pg_insert(MeterReading).values(reading_rows)
+            upsert_result = await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[MeterReading.room_id, MeterReading.read_date],
+                    set_={
+                        "read_amount": stmt.excluded.read_amount,
+                        "updated_by": stmt.excluded.created_by,
+                        "updated_at": func.now(),
+                    }
+                )
+                .returning(literal_column("xmax = 0").label("inserted"))
+            )
+            inserted = sum(1 for row in upsert_result.all() if row.inserted)
+        
+        created = {}
+        if invoice_rows:
+            insert_result = await db.execute(
+                pg_insert(Invoice)
+                .values(invoice_rows)
+                .on_conflict_do_nothing(
+                    index_elements=[Invoice.lease_id, Invoice.category, Invoice.period_start, Invoice.period_end],
+                    index_where=Invoice.deleted_at.is_(None)
+                )
+                .returning(Invoice.id, Invoice.lease_id)
+            )
+            created = {row.lease_id: row.id for row in insert_result.all()}
+        
+        for result in results:
+            if "bill_amount" not in result:
+                continue
+            invoice_id = created.get(result["lease_id"])
+            if invoice_id is not None:
+                result["status"] = "billed"
+                result["invoice_id"] = invoice_id
+            else:
+                result["status"] = "already_billed"
+        
+        await db.commit()
+        invoices_generated_total.inc(len(created), category="electricity", source="billing_run")
+        meter_readings_ingested_total.inc(inserted, result="inserted")
+        meter_readings_ingested_total.inc(len(reading_rows) - inserted, result="updated")
+        meter_readings_ingested_total.inc(len(readings_by_room) - len(reading_rows), result="rejected")
+        return results
+
+    @staticmethod
+    async def bulk_upsert_meter_readings(
+        db: AsyncSession,
+        readings: list[MeterReadingCreate],
+        created_by: Optional[int] = None
+    ) -> dict:
+        """
+        Insert or update many meter readings in a single statement.
+        
+        Readings are staged (bound as arrays, or COPY'd into a temp table above
+        BULK_COPY_THRESHOLD rows), checked for monotonicity in SQL, first against the
+        room's stored readings and then against each other, and upserted with INSERT ... ON CONFLICT (room_id, read_date).
+        When the same room/date appears more than once, the last occurrence wins.
+        
+        Returns:
+            dict with keys: received, inserted, updated, rejected (list of dicts)
+        """
+        rejected = []
+        latest: dict[tuple[int, date], MeterReadingCreate] = {}
+        for reading in readings:
+            key = (reading.room_id, reading.read_date)
+            if key in latest:
+                superseded = latest[key]
+                rejected.append({
+                    "room_id": superseded.room_id,
+                    "read_date": superseded.read_date,
+                    "read_amount": superseded.read_amount,
+                    "reason": "Superseded by a later reading for the same room and date in this import",
+                })
+            latest[key] = reading
+        staged = list(latest.values())
+        
+        if not staged:
+            meter_readings_ingested_total.inc(len(rejected), result="rejected")
+            return {"received": len(readings), "inserted": 0, "updated": 0, "rejected": rejected}
+        
+        if len(staged) > BULK_COPY_THRESHOLD:
+            await db.execute(text("""
+                CREATE TEMP TABLE meter_reading_stage (
+                    room_id BIGINT NOT NULL,
+                    read_date DATE NOT NULL,
+                    read_amount NUMERIC(10,2) NOT NULL
+                ) ON COMMIT DROP
+            """))
+            connection = await db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                "meter_reading_stage",
+                records=[(r.room_id, r.read_date, r.read_amount) for r in staged],
+                columns=["room_id", "read_date", "read_amount"],
+            )
+            result = await db.execute(
+                text(_BULK_UPSERT_METER_READINGS_SQL.format(staged=_STAGED_FROM_TEMP_TABLE)),
+                {"created_by": created_by}
+            )
+        else:
+            result = await db.execute(
+                text(_BULK_UPSERT_METER_READINGS_SQL.format(staged=_STAGED_FROM_ARRAYS)),
+                {
+                    "room_ids": [r.room_id for r in staged],
+                    "read_dates": [r.read_date for r in staged],
+                    "read_amounts": [r.read_amount for r in staged],
+                    "created_by": created_by,
+                }
+            )
+        
+        inserted = updated = 0
+        for row in result.all():
+            if row.inserted is True:
+                inserted += 1
+                continue
+            if row.inserted is False:
+                updated += 1
+                continue
+            
+            if not row.room_exists:
+                reason = f"Room with id {row.room_id} not found"
+            elif row.previous_amount is not None and row.read_amount < row.previous_amount:
+                reason = f"Reading ({row.read_amount}) cannot be less than previous reading ({row.previous_amount})"
+            elif row.next_amount is not None and row.read_amount > row.next_amount:
+                reason = f"Reading ({row.read_amount}) cannot be greater than next reading ({row.next_amount})"
+            elif row.staged_previous_amount is not None and row.read_amount < row.staged_previous_amount:
+                reason = (
+                    f"Reading ({row.read_amount}) is less than the reading of {row.staged_previous_date} "
+                    f"({row.staged_previous_amount}) in this import"
+                )
+            else:
+                reason = (
+                    f"Reading ({row.read_amount}) is greater than the reading of {row.staged_next_date} "
+                    f"({row.staged_next_amount}) in this import"
+                )
+            rejected.append({
+                "room_id": row.room_id,
+                "read_date": row.read_date,
+                "read_amount": row.read_amount,
+                "reason": reason,
+            })
+        
+        await db.commit()
+        meter_readings_ingested_total.inc(inserted, result="inserted")
+        meter_readings_ingested_total.inc(updated, result="updated")
+        meter_readings_ingested_total.inc(len(rejected), result="rejected")
+        return {
+            "received": len(readings),
+            "inserted": inserted,
+            "updated": updated,
+            "rejected": rejected,
+        }
@@ -0,0 +1,198 @@
+# app/services/invoice_jobs.py
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import func, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.metrics import invoices_generated_total
+from app.models.invoice import Invoice
+from app.services.rent_schedule_service import RentScheduleService
+
+
+# Rent periods of submitted leases that have started by :target_date and have no
+# active rent invoice yet (served by idx_rent_schedule_start and uq_invoice_period_active)
+_DUE_RENT_PERIODS_SQL = """
+SELECT rs.lease_id, rs.period_start, rs.period_end, rs.amount
+FROM rent_schedule rs
+JOIN lease l ON l.id = rs.lease_id
+{room_join}
+WHERE rs.period_start <= :target_date
+  {since_filter}
+  AND l.submitted_at IS NOT NULL
+  AND l.deleted_at IS NULL
+  {building_filter}
+  AND NOT EXISTS (
+      SELECT 1 FROM invoice i
+      WHERE i.lease_id = rs.lease_id
+        AND i.category = 'rent'
+        AND i.period_start = rs.period_start
+        AND i.deleted_at IS NULL
+  )
+"""
+
+_GENERATE_RENT_INVOICES_SQL = """
+WITH due AS ({due})
+INSERT INTO invoice (lease_id, category, period_start, period_end, due_amount, paid_amount, payment_status, created_by)
+SELECT due.lease_id, 'rent'::invoice_category, due.period_start, due.period_end, due.amount, 0,
+       'unmatured'::payment_status, CAST(:created_by AS BIGINT)
+FROM due
+ON CONFLICT (lease_id, category, period_start, period_end) WHERE deleted_at IS NULL DO NOTHING
+RETURNING id, due_amount
+"""
+
+_PREVIEW_RENT_INVOICES_SQL = """
+WITH due AS ({due})
+SELECT COUNT(*) AS invoices, COALESCE(SUM(due.amount), 0) AS total_amount
+FROM due
+"""
+
+
+# Unpaid invoices past their due date: the rent schedule due date for rent invoices,
+# period_end otherwise (and for rent invoices issued outside the schedule)
+_MARK_OVERDUE_SQL = """
+UPDATE invoice i
+SET payment_status = 'overdue', updated_at = now()
+WHERE i.payment_status = 'unmatured'
+  AND i.deleted_at IS NULL
+  AND i.paid_amount < i.due_amount
+  AND COALESCE(
+      (SELECT rs.due_date FROM rent_schedule rs
+       WHERE i.category = 'rent' AND rs.lease_id = i.lease_id AND rs.period_start = i.period_start),
+      i.period_end
+  ) < :due_before
+RETURNING i.id
+"""
+
+
+def _due_rent_periods(since: Optional[date], building_id: Optional[int]) -> str:
+    return _DUE_RENT_PERIODS_SQL.format(
+        room_join="JOIN room r ON r.id = l.room_id" if building_id else "",
+        since_filter="AND rs.period_start >= :since" if since else "",
+        building_filter="AND r.building_id = :building_id" if building_id else "",
+    )
+
+
+class InvoiceGenerationJob:
+    """Batch creation of rent invoices from the rent schedule"""
+
+    @staticmethod
+    async def run(
+        db: AsyncSession,
+        target_date: date,
+        since: Optional[date] = None,
+        building_id: Optional[int] = None,
+        dry_run: bool = False,
+        created_by: Optional[int] = None
+    ) -> dict:
+        """
+        Create the missing rent invoices for every billing period starting on or before target_date.
+
+        Amounts come from rent_schedule (amendment-aware rent, prorated last period,
+        discounts), so the whole portfolio is billed with a single
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING on uq_invoice_period_active.
+        Re-running the job for the same date creates nothing: periods that already
+        have a rent invoice are skipped, and a concurrent run loses the conflict.
+
+        Submitted leases without a schedule (leases from before the rent_schedule
+        migration, bulk loads) get theirs built first, also on dry runs, so they are
+        not silently left unbilled.
+
+        Args:
+            target_date: Bill periods starting on or before this date
+            since: Ignore periods starting before this date (skip historical periods)
+            building_id: Only leases of rooms in this building
+            dry_run: Only count what would be created
+
+        Returns:
+            dict with created (count), total_amount and dry_run
+        """
+        if since and since > target_date:
+            raise ValueError(f"since ({since}) must not be after target_date ({target_date})")
+
+        params = {"target_date": target_date}
+        if since:
+            params["since"] = since
+        if building_id:
+            params["building_id"] = building_id
+        due = _due_rent_periods(since, building_id)
+
+        await RentScheduleService.rebuild_all(db, only_missing=True)
+
+        if dry_run:
+            row = (await db.execute(text(_PREVIEW_RENT_INVOICES_SQL.format(due=due)), params)).one()
+            return {"created": row.invoices, "total_amount": row.total_amount, "dry_run": True}
+
+        result = await db.execute(
+            text(_GENERATE_RENT_INVOICES_SQL.format(due=due)),
+            {**params, "created_by": created_by}
+        )
+        created = result.all()
+        await db.commit()
+
+        invoices_generated_total.inc(len(created), category="rent", source="job")
+        return {
+            "created": len(created),
+            "total_amount": sum((row.due_amount for row in created), Decimal("0")),
+            "dry_run": False,
+        }
+
+
+class InvoiceStatusSweeper:
+    """Set-based payment_status maintenance"""
+
+    @staticmethod
+    async def mark_overdue(
+        db: AsyncSession,
+        as_of: Optional[date] = None,
+        grace_days: int = 0
+    ) -> List[int]:
+        """
+        Move unpaid 'unmatured' invoices whose due date has passed to 'overdue', in one UPDATE.
+
+        The due date is the rent schedule due date for rent invoices and period_end for
+        everything else. Partially paid invoices keep their status.
+
+        Args:
+            as_of: Day the sweep runs for (default: today)
+            grace_days: Days after the due date before an invoice counts as overdue
+
+        Returns:
+            Ids of the invoices marked overdue
+        """
+        if grace_days < 0:
+            raise ValueError("grace_days cannot be negative")
+        due_before = (as_of or date.today()) - timedelta(days=grace_days)
+
+        result = await db.execute(text(_MARK_OVERDUE_SQL), {"due_before": due_before})
+        invoice_ids = list(result.scalars())
+        await db.commit()
+        return invoice_ids
+
+    @staticmethod
+    async def cancel_after(
+        db: AsyncSession,
+        lease_id: int,
+        after: date,
+        updated_by: Optional[int] = None
+    ) -> int:
+        """
+        Cancel the invoices of a lease whose period starts after a date, in one UPDATE.
+
+        Runs in the caller's transaction (terminate_lease commits).
+
+        Returns:
+            Number of invoices canceled
+        """
+        result = await db.execute(
+            update(Invoice)
+            .where(
+                Invoice.lease_id == lease_id,
+                Invoice.period_start > after,
+                Invoice.deleted_at.is_(None),
+            )
+            .values(payment_status="canceled", updated_by=updated_by, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -3,6 +3,107 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import Optional
 
+from fastapi import HTTPException, status as http_status
+from sqlalchemy import Select, and_, case, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.invoice import Invoice, invoice_category_type, payment_status_type
+from app.models.lease import Lease, LeaseTenant
+from app.models.room import Room
+from app.models.tenant import Tenant
+from app.schemas.invoice import InvoiceTransactionCreate
+from app.services.reference_data import reference_data
+from app.services.report_service import ReportService
+
+
+# Invoice category -> cash flow category code of the matching ledger entry
+INVOICE_CASH_FLOW_CATEGORY_CODES = {
+    "rent": "rent",
+    "electricity": "tenant_electricity",
+    "deposit": "deposit_received",
+    "penalty": "misc",
+}
+
+# Payment method labels sent by the frontend -> payment_method_type
+PAYMENT_METHODS = {
+    "bank": "bank",
+    "Transfer": "bank",
+    "cash": "cash",
+    "Cash": "cash",
+    "LINE_Pay": "LINE_Pay",
+    "LINE Pay": "LINE_Pay",
+    "LinePay": "LINE_Pay",
+    "other": "other",
+    "Other": "other",
+}
+
+# Lease billed when the request has no lease_id: the room's active lease
+_ACTIVE_ROOM_LEASE = """
+    l.room_id = r.id
+    AND l.submitted_at IS NOT NULL
+    AND l.terminated_at IS NULL
+    AND l.deleted_at IS NULL
+    AND CURRENT_DATE BETWEEN l.start_date AND l.end_date
+"""
+
+# Resolves room, lease, building and primary tenant and writes the invoice and its
+# cash flow entry in one statement. Returns no row for an unknown room, and a row
+# with a NULL lease_id (nothing inserted) when there is no lease to bill.
+_CREATE_INVOICE_TRANSACTION_SQL = """
+WITH target AS (
+    SELECT
+        r.id AS room_id,
+        r.building_id,
+        l.id AS lease_id,
+        NULLIF(CONCAT(t.last_name, t.first_name), '') AS tenant_name
+    FROM room r
+    LEFT JOIN LATERAL (
+        SELECT l.id
+        FROM lease l
+        WHERE {lease_match}
+        ORDER BY l.start_date DESC
+        LIMIT 1
+    ) l ON true
+    LEFT JOIN LATERAL (
+        SELECT t.last_name, t.first_name
+        FROM lease_tenant lt
+        JOIN tenant t ON t.id = lt.tenant_id
+        WHERE lt.lease_id = l.id AND lt.tenant_role = 'primary'
+        LIMIT 1
+    ) t ON true
+    WHERE r.id = :room_id
+),
+new_invoice AS (
+    INSERT INTO invoice (lease_id, category, period_start, period_end, due_amount, paid_amount, payment_status)
+    SELECT target.lease_id, CAST(:category AS invoice_category), CAST(:period_start AS DATE),
+           CAST(:period_end AS DATE), CAST(:amount AS NUMERIC), CAST(:paid_amount AS NUMERIC),
+           CAST(:status AS payment_status)
+    FROM target
+    WHERE target.lease_id IS NOT NULL
+    RETURNING id, lease_id
+),
+new_cash_flow AS (
+    INSERT INTO cash_flow (
+        category_id, cash_account_id, lease_id, building_id, room_id, invoice_id,
+        flow_date, amount, payment_method, note
+    )
+    SELECT CAST(:cash_flow_category_id AS BIGINT), CAST(:cash_account_id AS BIGINT), i.lease_id,
+           target.building_id, target.room_id, i.id, CAST(:flow_date AS DATE), CAST(:amount AS NUMERIC),
+           CAST(:payment_method AS payment_method_type), CAST(:note AS TEXT)
+    FROM new_invoice i
+    CROSS JOIN target
+    RETURNING id
+)
+SELECT
+    target.room_id,
+    target.building_id,
+    target.lease_id,
+    target.tenant_name,
+    (SELECT id FROM new_invoice) AS invoice_id,
+    (SELECT id FROM new_cash_flow) AS cash_flow_id
+FROM target
+"""
+
 
 class InvoiceService:
     """Service for invoice and rent calculations"""
@@ -121,3 +222,179 @@ class InvoiceService:
         else:
             return base_note or ""
 
+    @staticmethod
+    def list_invoice_transactions_query(
+        room_id: Optional[int] = None,
+        building_id: Optional[int] = None,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+        cursor: Optional[tuple[date, int]] = None,
+        limit: Optional[int] = None
+    ) -> Select:
+        """
+        Build the query behind the invoice transaction list.
+        
+        Selects plain columns (no ORM entities) shaped like InvoiceTransactionResponse,
+        newest due date first. The invoice table has no due date column, so period_end
+        is the due date (as in v_room_payment_history).
+        
+        Args:
+            room_id, building_id, category, status: Optional equality filters
+            due_from, due_to: Optional inclusive due date range
+            cursor: (due_date, id) of the last row of the previous page (keyset pagination)
+            limit: Maximum number of rows (None for no limit)
+        
+        Raises:
+            ValueError: If category or status is not a value of its enum type
+        """
+        if category and category not in invoice_category_type.enums:
+            raise ValueError(
+                f"Invalid category: {category}. "
+                f"Allowed: {', '.join(invoice_category_type.enums)}"
+            )
+        if status and status not in payment_status_type.enums:
+            raise ValueError(
+                f"Invalid status: {status}. "
+                f"Allowed: {', '.join(payment_status_type.enums)}"
+            )
+        
+        due_date = Invoice.period_end
+        query = (
+            select(
+                Invoice.id.label("id"),
+                Invoice.id.label("invoice_id"),
+                Lease.room_id.label("room_id"),
+                Invoice.lease_id.label("lease_id"),
+                func.nullif(func.concat(Tenant.last_name, Tenant.first_name), "").label("tenant_name"),
+                Invoice.category.label("category"),
+                Invoice.due_amount.label("amount"),
+                due_date.label("due_date"),
+                Invoice.period_start.label("period_start"),
+                Invoice.period_end.label("period_end"),
+                Invoice.payment_status.label("status"),
+                case((Invoice.payment_status == "paid", due_date)).label("paid_date"),
+            )
+            .join(Lease, Invoice.lease_id == Lease.id)
+            .outerjoin(
+                LeaseTenant,
+                and_(LeaseTenant.lease_id == Lease.id, LeaseTenant.tenant_role == "primary")
+            )
+            .outerjoin(Tenant, LeaseTenant.tenant_id == Tenant.id)
+            .where(Invoice.deleted_at.is_(None))
+        )
+        
+        if room_id:
+            query = query.where(Lease.room_id == room_id)
+        if building_id:
+            query = query.join(Room, Lease.room_id == Room.id).where(Room.building_id == building_id)
+        if category:
+            query = query.where(Invoice.category == category)
+        if status:
+            query = query.where(Invoice.payment_status == status)
+        if due_from:
+            query = query.where(due_date >= due_from)
+        if due_to:
+            query = query.where(due_date <= due_to)
+        if cursor:
+            query = query.where(tuple_(due_date, Invoice.id) < tuple_(*cursor))
+        
+        query = query.order_by(due_date.desc(), Invoice.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    @staticmethod
+    async def create_transaction(
+        db: AsyncSession,
+        invoice: InvoiceTransactionCreate
+    ) -> dict:
+        """
+        Record an invoice and its cash flow entry (a payment), then commit.
+
+        Cash flow categories and the default cash account come from the reference data
+        cache; room, lease (invoice.lease_id, or the room's active lease), building and
+        primary tenant are resolved and both rows inserted by a single CTE statement.
+        Together with the monthly rollup update that is two statements per payment.
+
+        Returns:
+            dict shaped like InvoiceTransactionResponse
+
+        Raises:
+            HTTPException 404: Unknown room, no lease to bill, or missing reference data
+        """
+        category_code = INVOICE_CASH_FLOW_CATEGORY_CODES.get(invoice.category, "rent")
+        cash_flow_category = await reference_data.category_by_code(db, category_code)
+        if cash_flow_category is None:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail=f"Cash flow category with code {category_code} not found"
+            )
+
+        cash_account_id = invoice.cash_account_id or await reference_data.default_cash_account_id(db)
+        if cash_account_id is None:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail="No cash account found"
+            )
+
+        # Period dates default to the due date
+        period_start = invoice.period_start or invoice.due_date
+        period_end = invoice.period_end or invoice.due_date
+        flow_date = invoice.paid_date or invoice.due_date
+
+        params = {
+            "room_id": invoice.room_id,
+            "category": invoice.category,
+            "period_start": period_start,
+            "period_end": period_end,
+            "amount": invoice.amount,
+            "paid_amount": invoice.amount if invoice.status == "paid" else Decimal("0"),
+            "status": invoice.status,
+            "cash_flow_category_id": cash_flow_category.id,
+            "cash_account_id": cash_account_id,
+            "flow_date": flow_date,
+            "payment_method": PAYMENT_METHODS.get(invoice.payment_method or "Transfer", "bank"),
+            "note": invoice.note,
+        }
+        if invoice.lease_id:
+            lease_match = "l.id = :lease_id"
+            params["lease_id"] = invoice.lease_id
+        else:
+            lease_match = _ACTIVE_ROOM_LEASE
+
+        row = (await db.execute(
+            text(_CREATE_INVOICE_TRANSACTION_SQL.format(lease_match=lease_match)), params
+        )).one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail=f"Room with id {invoice.room_id} not found"
+            )
+        if row.lease_id is None:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail=f"Lease with id {invoice.lease_id} not found" if invoice.lease_id
+                else f"No active lease found for room {invoice.room_id}"
+            )
+
+        await ReportService.apply_cash_flow(db, row.building_id, cash_flow_category.id, flow_date, invoice.amount)
+        await db.commit()
+
+        return {
+            "id": row.invoice_id,
+            "invoice_id": row.invoice_id,
+            "room_id": row.room_id,
+            "lease_id": row.lease_id,
+            "tenant_name": row.tenant_name or "Unknown",
+            "category": invoice.category,
+            "amount": invoice.amount,
+            "due_date": invoice.due_date,
+            "period_start": period_start,
+            "period_end": period_end,
+            "status": invoice.status,
+            "paid_date": invoice.paid_date,
+            "payment_method": invoice.payment_method,
+            "note": invoice.note,
+        }
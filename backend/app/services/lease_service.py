@@ -1,6 +1,7 @@
 # app/services/lease_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, func, case, literal, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from typing import Optional, Literal
 from datetime import date, datetime, timedelta
@@ -12,6 +13,8 @@ from app.models.invoice import Invoice
 from app.models.cash_flow import CashFlow
 from app.schemas.lease import LeaseCreate, LeaseUpdate, LeaseRenew, LeaseTerminate, LeaseAmend
 from app.services.electricity_service import ElectricityService
+from app.services.invoice_jobs import InvoiceStatusSweeper
+from app.services.rent_schedule_service import RentScheduleService
 from app.services.tenant_service import TenantService
 from app.exceptions import LeaseNotEditableError, LeaseAmendmentError
 from fastapi import HTTPException, status as http_status
@@ -21,6 +24,9 @@ from decimal import Decimal
 # Type alias for lease status
 LeaseStatus = Literal["draft", "pending", "active", "expired", "terminated"]
 
+# Exclusion constraint keeping submitted, non-terminated leases of a room from overlapping
+LEASE_OVERLAP_CONSTRAINT = "excl_lease_room_period"
+
 
 def get_primary_tenant_info(lease: Lease) -> str:
     """
@@ -73,6 +79,26 @@ def determine_lease_status(lease: Lease, today: Optional[date] = None) -> LeaseS
         return "active"
 
 
+def lease_status_expr(today: Optional[date] = None):
+    """
+    SQL counterpart of determine_lease_status.
+    
+    Returns a CASE expression over the lease columns that yields the same status
+    strings, so status can be used in WHERE / ORDER BY and paginated in the database.
+    The branch order must stay identical to determine_lease_status.
+    """
+    if today is None:
+        today = date.today()
+    
+    return case(
+        (Lease.terminated_at.is_not(None), literal("terminated")),
+        (Lease.end_date < today, literal("expired")),
+        (Lease.submitted_at.is_(None), literal("draft")),
+        (Lease.start_date > today, literal("pending")),
+        else_=literal("active"),
+    )
+
+
 async def assert_no_financial_activity(db: AsyncSession, lease_id: int) -> None:
     """
     Assert that no financial activity (invoices or cashflows) exists for a lease.
@@ -162,26 +188,79 @@ async def find_overlapping_submitted_lease(
     - deleted_at IS NULL (not deleted)
     - date overlap: start_date <= existing.end_date AND end_date >= existing.start_date
     - exclude exclude_lease_id if provided
+    
+    The same rules as excl_lease_room_period, so the lookup is served by its GiST index.
     """
     conditions = [
         Lease.room_id == room_id,
         ~Lease.submitted_at.is_(None),  # Submitted leases
         Lease.terminated_at.is_(None),  # Not terminated
         Lease.deleted_at.is_(None),     # Not deleted
-        # Date range overlap: start_date <= existing.end_date AND end_date >= existing.start_date
-        start_date <= Lease.end_date,
-        end_date >= Lease.start_date
+        # Date range overlap on the inclusive [start_date, end_date] ranges
+        Lease.period.overlaps(func.daterange(start_date, end_date, literal("[]")))
     ]
     
     if exclude_lease_id is not None:
         conditions.append(Lease.id != exclude_lease_id)
     
     result = await db.execute(
-        select(Lease).where(and_(*conditions))
+        select(Lease).where(and_(*conditions)).order_by(Lease.start_date).limit(1)
     )
     return result.scalar_one_or_none()
 
 
+def is_lease_overlap_violation(error: IntegrityError) -> bool:
+    """Whether an IntegrityError was raised by the lease overlap exclusion constraint"""
+    return LEASE_OVERLAP_CONSTRAINT in str(error.orig)
+
+
+async def commit_lease_period(
+    db: AsyncSession,
+    *,
+    lease_id: int,
+    room_id: int,
+    start_date: date,
+    end_date: date,
+    action: str,
+    tenant_info: str
+) -> None:
+    """
+    Commit a lease whose submitted period changed, mapping an overlap to a 400 response.
+    
+    excl_lease_room_period rejects the write atomically, so concurrent submits of
+    overlapping leases cannot both succeed. The conflicting lease is only looked up
+    (for the error message) once the constraint has fired.
+    
+    Args:
+        lease_id, room_id, start_date, end_date: The period being written (read before commit,
+            since a failed commit expires the lease instance)
+        action: Verb for the error message ("submit", "renew")
+        tenant_info: Primary tenant description appended to the error message
+    """
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_lease_overlap_violation(e):
+            raise
+        overlapping_lease = await find_overlapping_submitted_lease(
+            db,
+            room_id=room_id,
+            start_date=start_date,
+            end_date=end_date,
+            exclude_lease_id=lease_id
+        )
+        existing = (
+            f"(lease_id: {overlapping_lease.id}, period: {overlapping_lease.start_date} to {overlapping_lease.end_date}) "
+            if overlapping_lease else ""
+        )
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot {action} lease: room {room_id} already has a submitted lease {existing}"
+                   f"that overlaps with the requested period ({start_date} to {end_date}). {tenant_info}"
+        ) from e
+
+
 class LeaseService:
 
     """Service for managing lease contracts"""
@@ -192,9 +271,18 @@ class LeaseService:
         room_id: Optional[int] = None,
         status: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[tuple[datetime, int]] = None
     ) -> list[Lease]:
-        """List leases with optional filters"""
+        """
+        List leases with optional filters.
+        
+        Status filtering, ordering and pagination all run in the database using
+        lease_status_expr, so the cost does not grow with the lease history.
+        Results are ordered by (created_at, id) descending. Pass the key of the last
+        row of the previous page as cursor for keyset pagination; skip is still
+        honoured as an offset for callers that do not use cursors.
+        """
         query = select(Lease).options(
             selectinload(Lease.tenants).selectinload(LeaseTenant.tenant),
             selectinload(Lease.room)
@@ -206,22 +294,20 @@ class LeaseService:
             query = query.join(LeaseTenant).where(LeaseTenant.tenant_id == tenant_id)
         if room_id:
             conditions.append(Lease.room_id == room_id)
-        # Note: status filtering is done in Python after fetching since status is computed
+        if status:
+            conditions.append(lease_status_expr() == status)
+        if cursor is not None:
+            # Keyset pagination: rows strictly after the last (created_at, id) seen
+            conditions.append(tuple_(Lease.created_at, Lease.id) < tuple_(*cursor))
 
         if conditions:
             query = query.where(and_(*conditions))
 
-        query = query.order_by(Lease.created_at.desc())
+        query = query.order_by(Lease.created_at.desc(), Lease.id.desc())
+        query = query.offset(skip).limit(limit)
 
         result = await db.execute(query)
-        leases = list(result.scalars().all())
-        
-        # Filter by status if provided (status is computed, so filter in Python)
-        if status:
-            leases = [l for l in leases if determine_lease_status(l) == status]
-        
-        # Apply pagination after status filtering
-        return leases[skip:skip + limit]
+        return list(result.scalars().all())
 
     @staticmethod
     async def create_lease(
@@ -544,35 +630,25 @@ class LeaseService:
                 detail=f"Cannot submit lease with status '{current_status}'. Only draft leases can be submitted. {tenant_info}"
             )
         
-        # Check for overlapping submitted leases in the same room
-        # This overlap check is necessary because:
-        # 1. Draft leases don't block room availability (see create_lease)
-        # 2. When a lease transitions from draft to submitted, it becomes room-reserving
-        # 3. Another draft lease created earlier for the same room/period may have been submitted
-        #    in the meantime, creating a conflict that didn't exist at creation time
-        # Date range overlap: lease.start_date <= existing.end_date AND lease.end_date >= existing.start_date
-        overlapping_lease = await find_overlapping_submitted_lease(
-            db,
-            room_id=lease.room_id,
-            start_date=lease.start_date,
-            end_date=lease.end_date,
-            exclude_lease_id=lease.id
-        )
-        if overlapping_lease:
-            raise HTTPException(
-                status_code=http_status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot submit lease: room {lease.room_id} already has a submitted lease (lease_id: {overlapping_lease.id}, "
-                       f"period: {overlapping_lease.start_date} to {overlapping_lease.end_date}) that overlaps with this lease period "
-                       f"({lease.start_date} to {lease.end_date}). {tenant_info}"
-            )
-        
         # Check 3 & 4: no invoices or cashflows must exist
         await assert_no_financial_activity(db, lease.id)
         
         # All conditions met - submit the lease
+        # Submitting makes the lease room-reserving (draft leases do not block the room, so
+        # another lease for the same room/period may have been submitted in the meantime).
+        # excl_lease_room_period rejects the overlap atomically at commit.
         lease.submitted_at = datetime.now()
         lease.updated_by = submitted_by
-        await db.commit()
+        await RentScheduleService.regenerate(db, lease)
+        await commit_lease_period(
+            db,
+            lease_id=lease.id,
+            room_id=lease.room_id,
+            start_date=lease.start_date,
+            end_date=lease.end_date,
+            action="submit",
+            tenant_info=tenant_info
+        )
         await db.refresh(lease)
         return lease
 
@@ -626,27 +702,13 @@ class LeaseService:
                 detail=f"new_end_date ({renew_data.new_end_date}) must be after current end_date ({lease.end_date}). {tenant_info}"
             )
 
-        # Check for overlapping submitted leases in the same room
-        # Date range overlap: lease.start_date <= existing.end_date AND renew_data.new_end_date >= existing.start_date
-        overlapping_lease = await find_overlapping_submitted_lease(
-            db,
-            room_id=lease.room_id,
-            start_date=lease.start_date,
-            end_date=renew_data.new_end_date,
-            exclude_lease_id=lease.id
-        )
-        if overlapping_lease:
-            raise HTTPException(
-                status_code=http_status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot renew lease: room {lease.room_id} already has a submitted lease (lease_id: {overlapping_lease.id}, "
-                       f"period: {overlapping_lease.start_date} to {overlapping_lease.end_date}) that overlaps with the proposed renewal period "
-                       f"({lease.start_date} to {renew_data.new_end_date}). {tenant_info}"
-            )
-
         # Update lease fields
+        previous_end_date = lease.end_date
         lease.end_date = renew_data.new_end_date
         if renew_data.new_monthly_rent is not None:
             lease.monthly_rent = renew_data.new_monthly_rent
+            # Earlier rent_change amendments stop applying when the new rent starts
+            lease.rent_reset_date = previous_end_date + timedelta(days=1)
         if renew_data.new_deposit is not None:
             lease.deposit = renew_data.new_deposit
         if renew_data.new_pay_rent_on is not None:
@@ -657,7 +719,19 @@ class LeaseService:
             lease.vehicle_plate = renew_data.new_vehicle_plate
         lease.updated_by = updated_by
 
-        await db.commit()
+        # Only the extension is scheduled with the renewed terms, earlier periods are kept
+        await RentScheduleService.regenerate(db, lease, from_date=previous_end_date + timedelta(days=1))
+
+        # The extended period is checked against other submitted leases by excl_lease_room_period
+        await commit_lease_period(
+            db,
+            lease_id=lease.id,
+            room_id=lease.room_id,
+            start_date=lease.start_date,
+            end_date=renew_data.new_end_date,
+            action="renew",
+            tenant_info=tenant_info
+        )
         await db.refresh(lease)
         return lease
 
@@ -761,24 +835,18 @@ class LeaseService:
                 ) from e
 
         # Cancel all future invoices (invoices with period_start > termination_date)
-        future_invoices = await db.execute(
-            select(Invoice).where(
-                and_(
-                    Invoice.lease_id == lease.id,
-                    Invoice.period_start > terminate_data.termination_date,
-                    Invoice.deleted_at.is_(None)
-                )
-            )
+        await InvoiceStatusSweeper.cancel_after(
+            db, lease.id, terminate_data.termination_date, updated_by=updated_by
         )
-        for invoice in future_invoices.scalars().all():
-            invoice.payment_status = "canceled"
-            invoice.updated_by = updated_by
         
         # Update lease: set terminated_at and termination_reason
         lease.terminated_at = terminate_data.termination_date
         lease.termination_reason = terminate_data.reason
         lease.updated_by = updated_by
 
+        # Drop the periods after the termination date and cut the current one short
+        await RentScheduleService.regenerate(db, lease, from_date=terminate_data.termination_date)
+
         await db.commit()
         await db.refresh(lease)
         return lease
@@ -839,6 +907,11 @@ class LeaseService:
         )
         
         db.add(amendment)
+        await db.flush()
+
+        # Periods starting on or after the effective date are billed at the new rent
+        await RentScheduleService.regenerate(db, lease, from_date=amend_data.effective_date)
+
         await db.commit()
         await db.refresh(amendment)
         return amendment
@@ -0,0 +1,225 @@
+# app/services/occupancy_service.py
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Leases that hold a room: submitted and not deleted. lease.period already ends at
+# terminated_at, so terminated leases occupy the room until their termination date.
+_OCCUPYING_LEASE = "l.submitted_at IS NOT NULL AND l.deleted_at IS NULL"
+
+_AVAILABILITY_SQL = f"""
+SELECT
+    r.id AS room_id,
+    r.building_id,
+    b.building_no,
+    r.floor_no,
+    r.room_no,
+    CONCAT(r.floor_no, r.room_no) AS room_number,
+    COALESCE(fi.free_intervals, '[]'::jsonb) AS free_intervals,
+    COALESCE(fi.free_days, 0) AS free_days
+FROM room r
+JOIN building b ON b.id = r.building_id
+-- Window minus the union of the overlapping lease periods (idx_lease_period / excl_lease_room_period)
+CROSS JOIN LATERAL (
+    SELECT datemultirange(daterange(CAST(:date_from AS DATE), CAST(:date_to AS DATE), '[]'))
+           - COALESCE(range_agg(l.period), '{{}}'::datemultirange) AS free
+    FROM lease l
+    WHERE l.room_id = r.id
+      AND l.period && daterange(CAST(:date_from AS DATE), CAST(:date_to AS DATE), '[]')
+      AND {_OCCUPYING_LEASE}
+) occ
+LEFT JOIN LATERAL (
+    SELECT
+        jsonb_agg(
+            jsonb_build_object('start', lower(g), 'end', upper(g) - 1, 'days', upper(g) - lower(g))
+            ORDER BY lower(g)
+        ) AS free_intervals,
+        SUM(upper(g) - lower(g)) AS free_days
+    FROM unnest(occ.free) AS g
+    WHERE upper(g) - lower(g) >= :min_days
+) fi ON true
+WHERE r.deleted_at IS NULL
+  AND r.is_rentable
+"""
+
+# date_trunc field -> generate_series step
+OCCUPANCY_GRANULARITIES = {
+    "day": "1 day",
+    "week": "1 week",
+    "month": "1 month",
+    "quarter": "3 months",
+    "year": "1 year",
+}
+
+_OCCUPANCY_SQL = """
+WITH periods AS (
+    SELECT
+        GREATEST(g::date, CAST(:date_from AS DATE)) AS period_start,
+        LEAST((g + interval '{step}' - interval '1 day')::date, CAST(:date_to AS DATE)) AS period_end
+    FROM generate_series(
+        date_trunc('{granularity}', CAST(:date_from AS DATE)),
+        CAST(:date_to AS DATE),
+        interval '{step}'
+    ) AS g
+),
+rooms AS (
+    SELECT r.id
+    FROM room r
+    WHERE r.deleted_at IS NULL
+      AND r.is_rentable
+      {building_filter}
+),
+-- Days each room is taken within the window (union of its lease periods)
+room_occupancy AS (
+    SELECT
+        r.id AS room_id,
+        COALESCE(
+            range_agg(l.period * daterange(CAST(:date_from AS DATE), CAST(:date_to AS DATE), '[]'))
+                FILTER (WHERE l.id IS NOT NULL),
+            '{{}}'::datemultirange
+        ) AS occupied
+    FROM rooms r
+    LEFT JOIN lease l ON l.room_id = r.id
+        AND l.period && daterange(CAST(:date_from AS DATE), CAST(:date_to AS DATE), '[]')
+        AND {occupying}
+    GROUP BY r.id
+),
+-- Vacancy spells: the window minus the occupied days, attributed to the period they start in
+vacancies AS (
+    SELECT lower(v) AS vacancy_start, upper(v) - lower(v) AS days
+    FROM room_occupancy o
+    CROSS JOIN LATERAL unnest(
+        datemultirange(daterange(CAST(:date_from AS DATE), CAST(:date_to AS DATE), '[]')) - o.occupied
+    ) AS v
+),
+period_days AS (
+    SELECT
+        p.period_start,
+        p.period_end,
+        COUNT(o.room_id) AS rooms,
+        COALESCE(SUM(p.period_end - p.period_start + 1) FILTER (WHERE o.room_id IS NOT NULL), 0) AS room_days,
+        COALESCE(SUM(od.days), 0) AS occupied_room_days
+    FROM periods p
+    LEFT JOIN room_occupancy o ON true
+    LEFT JOIN LATERAL (
+        SELECT COALESCE(SUM(upper(x) - lower(x)), 0) AS days
+        FROM unnest(o.occupied * datemultirange(daterange(p.period_start, p.period_end, '[]'))) AS x
+    ) od ON true
+    GROUP BY p.period_start, p.period_end
+)
+SELECT
+    pd.period_start,
+    pd.period_end,
+    pd.rooms,
+    pd.room_days,
+    pd.occupied_room_days,
+    pd.room_days - pd.occupied_room_days AS vacant_room_days,
+    CASE WHEN pd.room_days > 0
+         THEN ROUND(pd.occupied_room_days::numeric / pd.room_days, 4) ELSE 0 END AS occupancy_rate,
+    CASE WHEN pd.room_days > 0
+         THEN ROUND((pd.room_days - pd.occupied_room_days)::numeric / pd.room_days, 4) ELSE 0 END AS vacancy_rate,
+    vs.vacancy_count,
+    vs.avg_vacancy_days
+FROM period_days pd
+LEFT JOIN LATERAL (
+    SELECT COUNT(*) AS vacancy_count, ROUND(AVG(v.days), 1) AS avg_vacancy_days
+    FROM vacancies v
+    WHERE v.vacancy_start BETWEEN pd.period_start AND pd.period_end
+) vs ON true
+ORDER BY pd.period_start
+"""
+
+
+class OccupancyService:
+    """Service for room availability and occupancy analytics"""
+
+    @staticmethod
+    async def get_room_availability(
+        db: AsyncSession,
+        date_from: date,
+        date_to: date,
+        building_id: Optional[int] = None,
+        min_days: int = 1,
+        available_only: bool = False
+    ) -> list[dict]:
+        """
+        Free intervals of every rentable room within [date_from, date_to], in one query.
+
+        The free time of a room is the window minus the union (range_agg) of the periods
+        of its submitted leases, so it is computed per room in the database instead of
+        one overlap query per room. Draft leases do not reserve a room.
+
+        Args:
+            date_from, date_to: Inclusive window
+            building_id: Only rooms of this building
+            min_days: Drop free intervals shorter than this many days
+            available_only: Only return rooms with at least one free interval
+
+        Returns:
+            One dict per room with free_intervals ([{start, end, days}], inclusive end) and free_days
+        """
+        if date_to < date_from:
+            raise ValueError(f"to ({date_to}) must not be before from ({date_from})")
+
+        query = _AVAILABILITY_SQL
+        params = {"date_from": date_from, "date_to": date_to, "min_days": min_days}
+        if building_id:
+            query += " AND r.building_id = :building_id"
+            params["building_id"] = building_id
+        if available_only:
+            query += " AND fi.free_intervals IS NOT NULL"
+        query += " ORDER BY b.building_no, r.floor_no, r.room_no"
+
+        result = await db.execute(text(query), params)
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def get_occupancy_timeline(
+        db: AsyncSession,
+        date_from: date,
+        date_to: date,
+        granularity: str = "month",
+        building_id: Optional[int] = None
+    ) -> list[dict]:
+        """
+        Occupied room-days, vacancy rate and vacancy durations per period, in one query.
+
+        Periods come from generate_series (the first and last are clipped to the window);
+        occupied days are the intersection of each period with the union of the room's
+        lease periods. A vacancy spell is a gap between leases inside the window and is
+        counted in the period it starts in; avg_vacancy_days is its full length within
+        the window. Rooms are the currently rentable ones.
+
+        Args:
+            date_from, date_to: Inclusive window
+            granularity: One of OCCUPANCY_GRANULARITIES
+            building_id: Only rooms of this building
+
+        Returns:
+            One dict per period, oldest first
+        """
+        if granularity not in OCCUPANCY_GRANULARITIES:
+            raise ValueError(
+                f"Invalid granularity: {granularity}. Allowed: {', '.join(OCCUPANCY_GRANULARITIES)}"
+            )
+        if date_to < date_from:
+            raise ValueError(f"to ({date_to}) must not be before from ({date_from})")
+
+        params = {"date_from": date_from, "date_to": date_to}
+        building_filter = ""
+        if building_id:
+            building_filter = "AND r.building_id = :building_id"
+            params["building_id"] = building_id
+
+        # granularity / step are whitelisted above, everything else is a bind parameter
+        query = _OCCUPANCY_SQL.format(
+            granularity=granularity,
+            step=OCCUPANCY_GRANULARITIES[granularity],
+            building_filter=building_filter,
+            occupying=_OCCUPYING_LEASE,
+        )
+        result = await db.execute(text(query), params)
+        return [dict(row) for row in result.mappings()]
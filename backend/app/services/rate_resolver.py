@@ -0,0 +1,160 @@
+# app/services/rate_resolver.py
+"""In-process index of electricity rates for fast per-room lookups"""
+
+import asyncio
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.electricity import ElectricityRate
+from app.models.room import Room
+
+
+@dataclass(frozen=True)
+class ResolvedRate:
+    """Electricity rate returned by the resolver (detached from any session)"""
+    id: int
+    room_id: Optional[int]
+    start_date: date
+    end_date: date
+    rate_per_kwh: Decimal
+
+
+class _RateIntervals:
+    """
+    Rates of one scope (a room, or the default rates) sorted by start_date.
+    
+    max_end[i] is the latest end_date among rates[0..i], which lets a lookup stop
+    walking back through overlapping intervals as soon as none can cover the date.
+    """
+    __slots__ = ("starts", "rates", "max_end")
+
+    def __init__(self, rates: List[ResolvedRate]):
+        self.rates = sorted(rates, key=lambda r: (r.start_date, r.id))
+        self.starts = [r.start_date for r in self.rates]
+        self.max_end = []
+        latest = date.min
+        for r in self.rates:
+            latest = max(latest, r.end_date)
+            self.max_end.append(latest)
+
+    def find(self, target_date: date) -> Optional[ResolvedRate]:
+        """Return the rate with the latest start_date that covers target_date"""
+        i = bisect_right(self.starts, target_date) - 1
+        while i >= 0 and self.max_end[i] >= target_date:
+            if self.rates[i].end_date >= target_date:
+                return self.rates[i]
+            i -= 1
+        return None
+
+
+class RateResolver:
+    """
+    Resolves the electricity rate of a room on a date from an in-memory index.
+    
+    The whole electricity_rate table is loaded once and indexed per room (room-specific
+    rates) plus one default scope (rates with room_id NULL). The index is rebuilt after
+    invalidate() is called by rate writes in this process, and after ttl_seconds so that
+    writes made by other workers are picked up.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._room_rates: Dict[int, _RateIntervals] = {}
+        self._default_rates: Optional[_RateIntervals] = None
+        self._room_ids: Set[int] = set()
+        self._loaded_at: Optional[float] = None
+        # Bumped by invalidate(); a load that overlaps an invalidation is discarded
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup reloads it"""
+        self._loaded_at = None
+        self._generation += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def _load(self, db: AsyncSession) -> bool:
+        """Load the index; returns False (nothing published) if invalidate() ran meanwhile"""
+        generation = self._generation
+        loaded_at = time.monotonic()
+        rate_rows = (await db.execute(
+            select(
+                ElectricityRate.id,
+                ElectricityRate.room_id,
+                ElectricityRate.start_date,
+                ElectricityRate.end_date,
+                ElectricityRate.rate_per_kwh,
+            )
+        )).all()
+        room_ids = (await db.execute(select(Room.id))).scalars().all()
+
+        by_room: Dict[Optional[int], List[ResolvedRate]] = {}
+        for row in rate_rows:
+            rate = ResolvedRate(*row)
+            by_room.setdefault(rate.room_id, []).append(rate)
+
+        if self._generation != generation:
+            return False
+
+        defaults = by_room.pop(None, [])
+        self._room_rates = {room_id: _RateIntervals(rates) for room_id, rates in by_room.items()}
+        self._default_rates = _RateIntervals(defaults)
+        self._room_ids = set(room_ids)
+        self._loaded_at = loaded_at
+        return True
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            while not self._is_fresh():
+                if await self._load(db):
+                    break
+
+    async def room_exists(self, db: AsyncSession, room_id: int) -> bool:
+        """Check a room id against the index, querying only for rooms created since the last load"""
+        await self._ensure_loaded(db)
+        if room_id in self._room_ids:
+            return True
+        exists = (await db.execute(select(Room.id).where(Room.id == room_id))).scalar_one_or_none()
+        if exists is not None:
+            self._room_ids.add(room_id)
+            return True
+        return False
+
+    async def resolve(
+        self,
+        db: AsyncSession,
+        room_id: int,
+        target_date: date
+    ) -> Optional[ResolvedRate]:
+        """
+        Get the rate for a room on a date.
+        
+        Priority:
+        1. Room-specific rate that covers the date
+        2. Default rate (room_id NULL) that covers the date
+        """
+        await self._ensure_loaded(db)
+        room_rates = self._room_rates.get(room_id)
+        if room_rates is not None:
+            rate = room_rates.find(target_date)
+            if rate is not None:
+                return rate
+        return self._default_rates.find(target_date)
+
+
+rate_resolver = RateResolver(ttl_seconds=settings.ELECTRICITY_RATE_CACHE_TTL_SECONDS)
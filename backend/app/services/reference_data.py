@@ -0,0 +1,100 @@
+# app/services/reference_data.py
+"""In-process cache of static reference data (cash flow categories, cash accounts)"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.cash_flow import CashAccount, CashFlowCategory
+
+
+@dataclass(frozen=True)
+class CachedCategory:
+    """Cash flow category returned by the cache (detached from any session)"""
+    id: int
+    code: str
+    chinese_name: str
+    direction: str
+    category_group: Optional[str]
+
+
+class ReferenceData:
+    """
+    Cash flow categories by code and the default cash account, loaded in one pass.
+
+    Both tables only change through migrations / seed scripts, so the rows are kept
+    for ttl_seconds (other workers and direct SQL edits are picked up on reload);
+    invalidate() forces a reload in this process. The default cash account is the
+    first account by id (the seeded bank account).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._categories: Dict[str, CachedCategory] = {}
+        self._default_cash_account_id: Optional[int] = None
+        self._loaded_at: Optional[float] = None
+        # Bumped by invalidate(); a load that overlaps an invalidation is discarded
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the cached rows; the next lookup reloads them"""
+        self._loaded_at = None
+        self._generation += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def _load(self, db: AsyncSession) -> bool:
+        """Load the rows; returns False (nothing published) if invalidate() ran meanwhile"""
+        generation = self._generation
+        loaded_at = time.monotonic()
+        category_rows = (await db.execute(
+            select(
+                CashFlowCategory.id,
+                CashFlowCategory.code,
+                CashFlowCategory.chinese_name,
+                CashFlowCategory.direction,
+                CashFlowCategory.category_group,
+            )
+        )).all()
+        account_id = (await db.execute(
+            select(CashAccount.id).order_by(CashAccount.id).limit(1)
+        )).scalar_one_or_none()
+
+        if self._generation != generation:
+            return False
+
+        self._categories = {row.code: CachedCategory(*row) for row in category_rows}
+        self._default_cash_account_id = account_id
+        self._loaded_at = loaded_at
+        return True
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            while not self._is_fresh():
+                if await self._load(db):
+                    break
+
+    async def category_by_code(self, db: AsyncSession, code: str) -> Optional[CachedCategory]:
+        """Cash flow category with this code, or None"""
+        await self._ensure_loaded(db)
+        return self._categories.get(code)
+
+    async def default_cash_account_id(self, db: AsyncSession) -> Optional[int]:
+        """Id of the default cash account, or None if there is no cash account"""
+        await self._ensure_loaded(db)
+        return self._default_cash_account_id
+
+
+reference_data = ReferenceData(ttl_seconds=settings.REFERENCE_DATA_CACHE_TTL_SECONDS)
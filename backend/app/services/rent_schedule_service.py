@@ -0,0 +1,362 @@
+# app/services/rent_schedule_service.py
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lease import Lease, LeaseAmendment, RentSchedule
+from app.services.invoice_service import InvoiceService
+
+
+PAYMENT_TERM_MONTHS = {"monthly": 1, "seasonal": 3, "semi-annual": 6, "annual": 12}
+
+# Rows per INSERT when rebuilding the whole schedule
+_REBUILD_BATCH_SIZE = 5000
+
+# Discounts granted on rent invoices, keyed by the invoice period
+_RENT_DISCOUNTS_SQL = """
+SELECT i.lease_id, i.period_start, SUM(d.amount) AS amount
+FROM invoice i
+JOIN invoice_discount d ON d.invoice_id = i.id AND d.deleted_at IS NULL
+WHERE i.category = 'rent'
+  AND i.deleted_at IS NULL
+  {lease_filter}
+GROUP BY i.lease_id, i.period_start
+"""
+
+
+# Last period ending before the rent reset of each renewed lease (kept by rebuild_all)
+_KEPT_PERIODS_SQL = """
+SELECT DISTINCT ON (rs.lease_id) rs.lease_id, rs.period_no, rs.period_start, rs.period_end, rs.monthly_rent
+FROM rent_schedule rs
+JOIN lease l ON l.id = rs.lease_id
+WHERE rs.period_end < l.rent_reset_date
+  AND l.submitted_at IS NOT NULL
+  AND l.deleted_at IS NULL
+ORDER BY rs.lease_id, rs.period_start DESC
+"""
+
+# Everything except the periods before the rent reset of live renewed leases
+_DELETE_REBUILT_PERIODS_SQL = """
+DELETE FROM rent_schedule rs
+WHERE NOT EXISTS (
+    SELECT 1 FROM lease l
+    WHERE l.id = rs.lease_id
+      AND l.submitted_at IS NOT NULL
+      AND l.deleted_at IS NULL
+      AND rs.period_end < l.rent_reset_date
+)
+"""
+
+
+def _pay_day(year: int, month: int, pay_rent_on: int) -> date:
+    """pay_rent_on in the given month, moved to the last day of shorter months"""
+    return date(year, month, min(pay_rent_on, calendar.monthrange(year, month)[1]))
+
+
+def rent_due_date(period_start: date, pay_rent_on: int) -> date:
+    """First pay_rent_on day on or after period_start"""
+    due = _pay_day(period_start.year, period_start.month, pay_rent_on)
+    if due < period_start:
+        year, month = (period_start.year + 1, 1) if period_start.month == 12 else (period_start.year, period_start.month + 1)
+        due = _pay_day(year, month, pay_rent_on)
+    return due
+
+
+def period_base_amount(period_start: date, period_end: date, monthly_rent: Decimal) -> Decimal:
+    """
+    Rent for [period_start, period_end]: whole months at monthly_rent, plus the
+    remaining days prorated over the length of that (partial) month, rounded to
+    the nearest integer like LeaseService.calculate_proration.
+    """
+    months = 0
+    while InvoiceService.calculate_period_end(period_start, months + 1) <= period_end:
+        months += 1
+    amount = InvoiceService.calculate_rent_amount(monthly_rent, months) if months else Decimal("0")
+
+    partial_start = (
+        InvoiceService.calculate_period_end(period_start, months) + timedelta(days=1) if months else period_start
+    )
+    if partial_start <= period_end:
+        month_days = (InvoiceService.calculate_period_end(partial_start, 1) - partial_start).days + 1
+        partial_days = (period_end - partial_start).days + 1
+        amount += Decimal(str(round(Decimal(partial_days) / Decimal(month_days) * monthly_rent)))
+    return amount
+
+
+class RentScheduleService:
+    """Service for the materialized rent schedule (rent_schedule) of submitted leases"""
+
+    @staticmethod
+    def build_periods(
+        start_date: date,
+        end_date: date,
+        payment_term: str,
+        pay_rent_on: int,
+        monthly_rent: Decimal,
+        rent_changes: Sequence[Tuple[date, Decimal]] = (),
+        discounts: Optional[Dict[date, Decimal]] = None,
+        first_period_no: int = 1
+    ) -> List[dict]:
+        """
+        Billing periods from start_date to end_date (inclusive).
+
+        Periods are payment_term long (InvoiceService.calculate_period_end), the last
+        one is cut short at end_date. The monthly rent of a period is the one in effect
+        on its first day: monthly_rent, replaced by each rent change from its effective
+        date (the last one wins on the same date).
+
+        Args:
+            start_date: First day of the first period
+            end_date: Last billable day (end_date, or terminated_at)
+            monthly_rent: Rent in effect on start_date before rent_changes
+            rent_changes: (effective_date, new_monthly_rent), ascending (see _lease_periods)
+            discounts: Discount per period_start (from invoice_discount)
+            first_period_no: period_no of the first period
+
+        Returns:
+            One dict per period with the rent_schedule columns (without lease_id)
+        """
+        if payment_term not in PAYMENT_TERM_MONTHS:
+            raise ValueError(f"Invalid payment_term: {payment_term}")
+        term_months = PAYMENT_TERM_MONTHS[payment_term]
+        discounts = discounts or {}
+
+        periods = []
+        period_no = first_period_no
+        period_start = start_date
+        while period_start <= end_date:
+            period_end = min(InvoiceService.calculate_period_end(period_start, term_months), end_date)
+            rent = monthly_rent
+            for effective_date, new_rent in rent_changes:
+                if effective_date <= period_start:
+                    rent = new_rent
+            base_amount = period_base_amount(period_start, period_end, rent)
+            discount = discounts.get(period_start, Decimal("0"))
+            periods.append({
+                "period_no": period_no,
+                "period_start": period_start,
+                "period_end": period_end,
+                "due_date": rent_due_date(period_start, pay_rent_on),
+                "monthly_rent": rent,
+                "base_amount": base_amount,
+                "discount_amount": discount,
+                "amount": max(base_amount - discount, Decimal("0")),
+            })
+            period_no += 1
+            period_start = period_end + timedelta(days=1)
+        return periods
+
+    @staticmethod
+    async def _rent_changes(
+        db: AsyncSession,
+        lease_id: Optional[int] = None
+    ) -> Dict[int, List[Tuple[date, Decimal]]]:
+        """rent_change amendments per lease, ascending by effective date"""
+        query = (
+            select(LeaseAmendment.lease_id, LeaseAmendment.effective_date, LeaseAmendment.new_monthly_rent)
+            .where(
+                LeaseAmendment.amendment_type == "rent_change",
+                LeaseAmendment.deleted_at.is_(None),
+            )
+            .order_by(LeaseAmendment.lease_id, LeaseAmendment.effective_date)
+        )
+        if lease_id is not None:
+            query = query.where(LeaseAmendment.lease_id == lease_id)
+
+        changes: Dict[int, List[Tuple[date, Decimal]]] = defaultdict(list)
+        for row in await db.execute(query):
+            changes[row.lease_id].append((row.effective_date, row.new_monthly_rent))
+        return changes
+
+    @staticmethod
+    async def _discounts(
+        db: AsyncSession,
+        lease_id: Optional[int] = None
+    ) -> Dict[int, Dict[date, Decimal]]:
+        """Rent invoice discounts per lease and period start"""
+        params = {}
+        lease_filter = ""
+        if lease_id is not None:
+            lease_filter = "AND i.lease_id = :lease_id"
+            params["lease_id"] = lease_id
+
+        discounts: Dict[int, Dict[date, Decimal]] = defaultdict(dict)
+        result = await db.execute(text(_RENT_DISCOUNTS_SQL.format(lease_filter=lease_filter)), params)
+        for row in result:
+            discounts[row.lease_id][row.period_start] = row.amount
+        return discounts
+
+    @staticmethod
+    def _lease_periods(
+        lease,
+        kept: Optional[RentSchedule],
+        rent_changes: Sequence[Tuple[date, Decimal]],
+        discounts: Optional[Dict[date, Decimal]]
+    ) -> List[dict]:
+        """
+        Periods of a lease after its last kept period (all periods without one).
+
+        The rent carries on from the kept period's monthly_rent, so amendments it
+        already reflects are not applied again. A renewal with a new rent
+        (lease.rent_reset_date) is a rent change to lease.monthly_rent on that day:
+        amendments before it stop applying, later ones still do. Without a kept period
+        the schedule starts from lease.monthly_rent.
+        """
+        if kept is not None:
+            start_date = kept.period_end + timedelta(days=1)
+            first_period_no = kept.period_no + 1
+            monthly_rent = kept.monthly_rent
+            changes = [change for change in rent_changes if change[0] > kept.period_start]
+        else:
+            start_date, first_period_no, monthly_rent = lease.start_date, 1, lease.monthly_rent
+            changes = list(rent_changes)
+
+        reset = lease.rent_reset_date
+        if reset is not None and (kept is None or reset > kept.period_start):
+            # Stable sort: the renewal wins over an amendment effective the same day
+            changes = sorted(changes + [(reset, lease.monthly_rent)], key=lambda change: change[0])
+
+        return RentScheduleService.build_periods(
+            start_date=start_date,
+            end_date=lease.terminated_at or lease.end_date,
+            payment_term=lease.payment_term,
+            pay_rent_on=lease.pay_rent_on,
+            monthly_rent=monthly_rent,
+            rent_changes=changes,
+            discounts=discounts,
+            first_period_no=first_period_no,
+        )
+
+    @staticmethod
+    async def regenerate(
+        db: AsyncSession,
+        lease: Lease,
+        from_date: Optional[date] = None
+    ) -> int:
+        """
+        Regenerate the rent schedule of one lease, from the period containing from_date on.
+
+        Periods ending before from_date are kept as they are, the rest is deleted and
+        generated again starting the day after the last kept period, so a renewal or
+        amendment does not rewrite periods that may already be invoiced. Without
+        from_date the whole schedule is regenerated, except the periods before the
+        last rent reset of a renewed lease: their rent is no longer stored anywhere
+        else (see rebuild_all, which keeps them too). Draft and deleted leases have no
+        schedule.
+
+        Runs in the caller's transaction and without autoflush: pending lease changes
+        are flushed by the caller's commit, where commit_lease_period maps overlap
+        violations to a 400 response.
+
+        Returns:
+            Number of periods written
+        """
+        with db.no_autoflush:
+            if lease.submitted_at is None or lease.deleted_at is not None:
+                await db.execute(delete(RentSchedule).where(RentSchedule.lease_id == lease.id))
+                return 0
+
+            if from_date is None:
+                from_date = lease.rent_reset_date
+            kept = None
+            stale = delete(RentSchedule).where(RentSchedule.lease_id == lease.id)
+            if from_date is not None:
+                kept = (await db.execute(
+                    select(RentSchedule)
+                    .where(RentSchedule.lease_id == lease.id, RentSchedule.period_end < from_date)
+                    .order_by(RentSchedule.period_start.desc())
+                    .limit(1)
+                )).scalar_one_or_none()
+                stale = stale.where(RentSchedule.period_end >= from_date)
+            await db.execute(stale)
+
+            periods = RentScheduleService._lease_periods(
+                lease,
+                kept,
+                rent_changes=(await RentScheduleService._rent_changes(db, lease.id)).get(lease.id, []),
+                discounts=(await RentScheduleService._discounts(db, lease.id)).get(lease.id),
+            )
+            if periods:
+                await db.execute(insert(RentSchedule), [{"lease_id": lease.id, **period} for period in periods])
+        return len(periods)
+
+    @staticmethod
+    async def rebuild_all(db: AsyncSession, only_missing: bool = False) -> int:
+        """
+        Regenerate the schedule of every submitted lease (after the migration, bulk
+        imports or direct SQL edits) in a handful of statements.
+
+        Produces the same schedule as regenerate: periods ending before the last rent
+        reset of a renewed lease are kept, and the rest continues from them.
+
+        Args:
+            only_missing: Only build the schedule of submitted leases that have none
+                          (and keep every existing row)
+
+        Returns:
+            Number of periods written
+        """
+        query = select(
+            Lease.id,
+            Lease.start_date,
+            Lease.end_date,
+            Lease.terminated_at,
+            Lease.payment_term,
+            Lease.pay_rent_on,
+            Lease.monthly_rent,
+            Lease.rent_reset_date,
+        ).where(Lease.submitted_at.isnot(None), Lease.deleted_at.is_(None))
+        if only_missing:
+            query = query.where(~select(RentSchedule.id).where(RentSchedule.lease_id == Lease.id).exists())
+        leases = (await db.execute(query)).all()
+        if not leases:
+            return 0
+        rent_changes = await RentScheduleService._rent_changes(db)
+        discounts = await RentScheduleService._discounts(db)
+
+        kept: Dict[int, RentSchedule] = {}
+        if not only_missing:
+            kept = {
+                row.lease_id: row
+                for row in (await db.execute(text(_KEPT_PERIODS_SQL))).all()
+            }
+            await db.execute(text(_DELETE_REBUILT_PERIODS_SQL))
+
+        rows = []
+        written = 0
+        for lease in leases:
+            for period in RentScheduleService._lease_periods(
+                lease,
+                kept.get(lease.id),
+                rent_changes=rent_changes.get(lease.id, []),
+                discounts=discounts.get(lease.id),
+            ):
+                rows.append({"lease_id": lease.id, **period})
+            if len(rows) >= _REBUILD_BATCH_SIZE:
+                await db.execute(insert(RentSchedule), rows)
+                written += len(rows)
+                rows = []
+        if rows:
+            await db.execute(insert(RentSchedule), rows)
+            written += len(rows)
+
+        await db.commit()
+        return written
+
+    @staticmethod
+    async def get_schedule(
+        db: AsyncSession,
+        lease_id: int
+    ) -> List[RentSchedule]:
+        """Rent schedule of a lease, in period order"""
+        result = await db.execute(
+            select(RentSchedule)
+            .where(RentSchedule.lease_id == lease_id)
+            .order_by(RentSchedule.period_start)
+        )
+        return list(result.scalars().all())
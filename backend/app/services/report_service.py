@@ -0,0 +1,197 @@
+# app/services/report_service.py
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import and_, delete, extract, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.cash_flow import CashFlow, CashFlowCategory, CashFlowMonthlyRollup
+
+
+# Categories excluded from net operating income: security deposits are liabilities,
+# and new equipment is capital expenditure. Transfers are excluded by direction.
+NON_OPERATING_CATEGORY_CODES = ("deposit_received", "deposit_returned", "new_equipment")
+
+_REBUILD_ROLLUP_SQL = """
+INSERT INTO cash_flow_monthly_rollup (building_id, category_id, month, total_amount, entry_count)
+SELECT
+    cf.building_id,
+    cf.category_id,
+    date_trunc('month', cf.flow_date)::date,
+    SUM(cf.amount),
+    COUNT(*)
+FROM cash_flow cf
+WHERE cf.deleted_at IS NULL
+GROUP BY cf.building_id, cf.category_id, date_trunc('month', cf.flow_date)::date
+"""
+
+
+class ReportService:
+    """Service for P&L / NAOI reports backed by cash_flow_monthly_rollup"""
+
+    @staticmethod
+    async def apply_cash_flow(
+        db: AsyncSession,
+        building_id: Optional[int],
+        category_id: int,
+        flow_date: date,
+        amount: Decimal,
+        sign: int = 1
+    ) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) one cash flow entry from the monthly rollup.
+        
+        Runs in the caller's transaction, so the rollup commits or rolls back
+        together with the cash flow write.
+        """
+        insert_stmt = pg_insert(CashFlowMonthlyRollup).values(
+            building_id=building_id,
+            category_id=category_id,
+            month=flow_date.replace(day=1),
+            total_amount=sign * amount,
+            entry_count=sign,
+        )
+        await db.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[
+                    func.coalesce(CashFlowMonthlyRollup.building_id, literal_column("0")),
+                    CashFlowMonthlyRollup.category_id,
+                    CashFlowMonthlyRollup.month,
+                ],
+                set_={
+                    "total_amount": CashFlowMonthlyRollup.total_amount + insert_stmt.excluded.total_amount,
+                    "entry_count": CashFlowMonthlyRollup.entry_count + insert_stmt.excluded.entry_count,
+                },
+            )
+        )
+
+    @staticmethod
+    async def add_cash_flow(db: AsyncSession, cash_flow: CashFlow) -> None:
+        """Add a new (or updated) cash flow entry to the rollup"""
+        await ReportService.apply_cash_flow(
+            db, cash_flow.building_id, cash_flow.category_id, cash_flow.flow_date, cash_flow.amount, 1
+        )
+
+    @staticmethod
+    async def remove_cash_flow(db: AsyncSession, cash_flow: CashFlow) -> None:
+        """Remove a deleted (or about to be updated) cash flow entry from the rollup"""
+        await ReportService.apply_cash_flow(
+            db, cash_flow.building_id, cash_flow.category_id, cash_flow.flow_date, cash_flow.amount, -1
+        )
+
+    @staticmethod
+    async def rebuild_rollup(db: AsyncSession) -> int:
+        """
+        Recompute the whole rollup from the ledger (after bulk imports or direct SQL edits).
+        
+        Returns:
+            Number of rollup rows written
+        """
+        await db.execute(delete(CashFlowMonthlyRollup))
+        result = await db.execute(text(_REBUILD_ROLLUP_SQL))
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def get_naoi(
+        db: AsyncSession,
+        from_year: int,
+        to_year: int,
+        building_id: Optional[int] = None,
+        portfolio: bool = False
+    ) -> list[dict]:
+        """
+        Net Annual Operating Income per year, per building (or portfolio-wide).
+        
+        NAOI = operating income ('in' categories) - operating expenses ('out' categories),
+        excluding NON_OPERATING_CATEGORY_CODES and transfers.
+        
+        Args:
+            from_year, to_year: Inclusive year range
+            building_id: Only this building
+            portfolio: Sum all buildings (including entries not tied to a building)
+                       into one row per year instead of one row per building
+        
+        Returns:
+            One dict per (year[, building]) with operating_income, operating_expenses,
+            naoi, and 'months' / 'categories' breakdowns
+        """
+        year = extract("year", CashFlowMonthlyRollup.month)
+        query = (
+            select(
+                CashFlowMonthlyRollup.building_id,
+                CashFlowMonthlyRollup.month,
+                CashFlowCategory.id.label("category_id"),
+                CashFlowCategory.code.label("category_code"),
+                CashFlowCategory.chinese_name.label("category_name"),
+                CashFlowCategory.direction,
+                CashFlowMonthlyRollup.total_amount,
+            )
+            .join(CashFlowCategory, CashFlowMonthlyRollup.category_id == CashFlowCategory.id)
+            .where(
+                and_(
+                    CashFlowMonthlyRollup.month >= date(from_year, 1, 1),
+                    CashFlowMonthlyRollup.month <= date(to_year, 12, 1),
+                    CashFlowCategory.direction.in_(("in", "out")),
+                    CashFlowCategory.code.not_in(NON_OPERATING_CATEGORY_CODES),
+                    CashFlowMonthlyRollup.total_amount != 0,
+                )
+            )
+            .order_by(year, CashFlowMonthlyRollup.building_id, CashFlowMonthlyRollup.month)
+        )
+        if building_id:
+            query = query.where(CashFlowMonthlyRollup.building_id == building_id)
+        
+        rows = (await db.execute(query)).all()
+        
+        reports: dict[tuple, dict] = {}
+        for row in rows:
+            report_building_id = None if portfolio else row.building_id
+            key = (row.month.year, report_building_id)
+            report = reports.get(key)
+            if report is None:
+                report = reports[key] = {
+                    "year": row.month.year,
+                    "building_id": report_building_id,
+                    "operating_income": Decimal("0"),
+                    "operating_expenses": Decimal("0"),
+                    "naoi": Decimal("0"),
+                    "months": {},
+                    "categories": {},
+                }
+            
+            month = report["months"].setdefault(
+                row.month, {"month": row.month, "income": Decimal("0"), "expenses": Decimal("0")}
+            )
+            category = report["categories"].setdefault(
+                row.category_id,
+                {
+                    "category_id": row.category_id,
+                    "category_code": row.category_code,
+                    "category_name": row.category_name,
+                    "direction": row.direction,
+                    "amount": Decimal("0"),
+                },
+            )
+            category["amount"] += row.total_amount
+            if row.direction == "in":
+                report["operating_income"] += row.total_amount
+                month["income"] += row.total_amount
+            else:
+                report["operating_expenses"] += row.total_amount
+                month["expenses"] += row.total_amount
+        
+        results = []
+        for report in reports.values():
+            report["naoi"] = report["operating_income"] - report["operating_expenses"]
+            report["months"] = [
+                {**m, "net": m["income"] - m["expenses"]}
+                for m in sorted(report["months"].values(), key=lambda m: m["month"])
+            ]
+            report["categories"] = sorted(
+                report["categories"].values(), key=lambda c: (c["direction"], c["category_id"])
+            )
+            results.append(report)
+        return results
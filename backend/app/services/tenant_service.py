@@ -1,14 +1,190 @@
 # app/services/tenant_service.py
+import re
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, and_
+from sqlalchemy import select, delete, and_, text
 from sqlalchemy.orm import selectinload
-from typing import Optional
+from typing import Optional, Sequence
 
 from app.models.tenant import Tenant, TenantEmergencyContact
 from app.schemas.tenant import TenantCreate
 from fastapi import HTTPException, status as http_status
 
 
+# Characters dropped by tenant_search_normalize() (alembic/sql/0010_tenant_search.sql)
+_SEARCH_STRIPPED = re.compile(r"[\s().+_/-]")
+
+# Shorter queries have no trigrams of their own, so they only match word prefixes
+TRIGRAM_MIN_LENGTH = 3
+
+# Room of the tenant's current lease, or of the latest one (served by idx_lease_tenant_tenant)
+_TENANT_ROOM_LATERAL = """
+LEFT JOIN LATERAL (
+    SELECT r.id AS room_id, CONCAT(b.building_no, '.', r.floor_no, r.room_no) AS room
+    FROM lease_tenant lt
+    JOIN lease l ON l.id = lt.lease_id AND l.deleted_at IS NULL
+    JOIN room r ON r.id = l.room_id
+    JOIN building b ON b.id = r.building_id
+    WHERE lt.tenant_id = t.id
+    ORDER BY (l.submitted_at IS NOT NULL AND l.terminated_at IS NULL
+              AND CURRENT_DATE BETWEEN l.start_date AND l.end_date) DESC,
+             l.start_date DESC
+    LIMIT 1
+) tr ON true
+"""
+
+# Tenants whose search key or vehicle plate matches, best match first. A word prefix
+# (start of a name, phone number, ID or plate) ranks above a substring, ties are broken
+# by trigram word similarity.
+_SEARCH_TENANTS_SQL = """
+WITH matches AS (
+    SELECT t.id, t.search_key AS key
+    FROM tenant t
+    WHERE t.deleted_at IS NULL
+      AND ({tenant_match})
+    UNION ALL
+    SELECT lt.tenant_id, ' ' || tenant_search_normalize(l.vehicle_plate)
+    FROM lease l
+    JOIN lease_tenant lt ON lt.lease_id = l.id
+    WHERE l.vehicle_plate IS NOT NULL
+      AND l.deleted_at IS NULL
+      AND (' ' || tenant_search_normalize(l.vehicle_plate)) LIKE {plate_pattern}
+),
+ranked AS (
+    SELECT
+        id,
+        MAX(
+            CASE WHEN key LIKE :word_prefix THEN 2 WHEN key LIKE :contains THEN 1 ELSE 0 END
+            + word_similarity(:term, key)
+        ) AS score
+    FROM matches
+    GROUP BY id
+    ORDER BY score DESC, id
+    LIMIT :limit
+)
+SELECT
+    t.id,
+    CONCAT(t.last_name, t.first_name) AS name,
+    t.first_name,
+    t.last_name,
+    t.phone,
+    tr.room_id,
+    tr.room,
+    ROUND(ranked.score::numeric, 3) AS score
+FROM ranked
+JOIN tenant t ON t.id = ranked.id AND t.deleted_at IS NULL
+{room_lateral}
+ORDER BY ranked.score DESC, t.last_name, t.first_name, t.id
+"""
+
+# Tenants with a name, phone or ID starting with the prefix; name matches first, then shorter names
+_AUTOCOMPLETE_TENANTS_SQL = """
+WITH top AS (
+    SELECT t.id, (t.search_key LIKE :name_prefix) AS name_match
+    FROM tenant t
+    WHERE t.deleted_at IS NULL
+      AND t.search_key LIKE :word_prefix
+    ORDER BY name_match DESC, length(t.last_name || t.first_name), t.last_name, t.first_name, t.id
+    LIMIT :limit
+)
+SELECT t.id, CONCAT(t.last_name, t.first_name) AS name, tr.room_id, tr.room
+FROM top
+JOIN tenant t ON t.id = top.id
+{room_lateral}
+ORDER BY top.name_match DESC, length(t.last_name || t.first_name), t.last_name, t.first_name, t.id
+"""
+
+
+def normalize_search_term(term: str) -> str:
+    """Normalize a query like tenant_search_normalize() normalizes tenant.search_key"""
+    return _SEARCH_STRIPPED.sub("", term).lower()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def tenant_search_patterns(term: str) -> dict:
+    """
+    LIKE patterns for a normalized query against tenant.search_key.
+
+    Returns:
+        dict with word_prefix (' term%': start of any word), name_prefix (start of the
+        last+first name, the first word) and contains ('%term%')
+    """
+    escaped = _escape_like(term)
+    return {
+        "word_prefix": f"% {escaped}%",
+        "name_prefix": f" {escaped}%",
+        "contains": f"%{escaped}%",
+    }
+
+
+# Tenant list fields (GET /tenants/?view=summary) -> v_tenant_summary column
+TENANT_SUMMARY_FIELDS = {
+    "id": "tenant_id",
+    "name": "tenant_name",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "gender": "gender",
+    "phone": "phone",
+    "personal_id": "personal_id",
+    "email": "email",
+    "line_id": "line_id",
+    "lease_id": "lease_id",
+    "lease_status": "lease_status",
+    "lease_start_date": "lease_start_date",
+    "lease_end_date": "lease_end_date",
+    "monthly_rent": "monthly_rent",
+    "payment_term": "payment_term",
+    "room_id": "room_id",
+    "room": "CASE WHEN room_id IS NOT NULL THEN CONCAT(building_no, '.', room_number) END",
+    "building_id": "building_id",
+    "building_no": "building_no",
+}
+
+_ROOM_SEARCH = re.compile(r'^(\d+)\.(\d+)([a-zA-Z]+)$')
+
+
+def tenant_list_filter(search: Optional[str]) -> tuple[str, dict]:
+    """
+    WHERE clause and parameters of the tenant list search, for v_tenant_complete
+    and v_tenant_summary.
+
+    A room in building.floor+room format (e.g. '6.1A') matches the tenants of that
+    room; anything else is a name (either order), phone or personal ID substring on
+    the normalized tenant.search_key (trigram index). Terms shorter than
+    TRIGRAM_MIN_LENGTH have no trigrams, so they match the start of a word instead,
+    as in TenantService.search_tenants.
+    """
+    if not search:
+        return "", {}
+
+    room_match = _ROOM_SEARCH.match(search)
+    if room_match:
+        return (
+            "WHERE building_no = :building_no AND floor_no = :floor_no AND room_no = :room_no",
+            {
+                "building_no": int(room_match.group(1)),
+                "floor_no": int(room_match.group(2)),
+                "room_no": room_match.group(3),
+            },
+        )
+
+    where_clause = """
+        WHERE tenant_id IN (
+            SELECT id FROM tenant
+            WHERE deleted_at IS NULL
+              AND search_key LIKE :search_pattern
+        )
+    """
+    term = normalize_search_term(search.strip().lower())
+    patterns = tenant_search_patterns(term)
+    return where_clause, {
+        "search_pattern": patterns["contains"] if len(term) >= TRIGRAM_MIN_LENGTH else patterns["word_prefix"]
+    }
+
+
 class TenantService:
     """Service for managing tenant operations"""
 
@@ -135,3 +311,110 @@ class TenantService:
         await db.flush()
         return tenant
 
+
+    @staticmethod
+    async def search_tenants(
+        db: AsyncSession,
+        query: str,
+        limit: int = 20
+    ) -> list[dict]:
+        """
+        Ranked tenant search by name, phone, personal ID or vehicle plate.
+
+        Backed by the trigram indexes on tenant.search_key and lease vehicle plates.
+        Queries of TRIGRAM_MIN_LENGTH characters or more match anywhere (and fuzzily,
+        through word similarity); shorter ones match the start of a word, which
+        covers surnames and given names of CJK names stored without spaces.
+
+        Returns:
+            One dict per tenant with id, name, first_name, last_name, phone, room_id, room
+            ('6.1A') and score, best match first
+        """
+        term = normalize_search_term(query)
+        if not term:
+            return []
+
+        patterns = tenant_search_patterns(term)
+        if len(term) >= TRIGRAM_MIN_LENGTH:
+            tenant_match = "t.search_key LIKE :contains OR :term <% t.search_key"
+            plate_pattern = ":contains"
+        else:
+            tenant_match = "t.search_key LIKE :word_prefix"
+            plate_pattern = ":word_prefix"
+
+        result = await db.execute(
+            text(_SEARCH_TENANTS_SQL.format(
+                tenant_match=tenant_match,
+                plate_pattern=plate_pattern,
+                room_lateral=_TENANT_ROOM_LATERAL,
+            )),
+            {"term": term, "word_prefix": patterns["word_prefix"], "contains": patterns["contains"], "limit": limit}
+        )
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def autocomplete_tenants(
+        db: AsyncSession,
+        prefix: str,
+        limit: int = 10
+    ) -> list[dict]:
+        """
+        Tenants whose name, phone or personal ID starts with prefix, for type-ahead inputs.
+
+        Returns:
+            One dict per tenant with id, name, room_id and room ('6.1A')
+        """
+        term = normalize_search_term(prefix)
+        if not term:
+            return []
+
+        patterns = tenant_search_patterns(term)
+        result = await db.execute(
+            text(_AUTOCOMPLETE_TENANTS_SQL.format(room_lateral=_TENANT_ROOM_LATERAL)),
+            {"word_prefix": patterns["word_prefix"], "name_prefix": patterns["name_prefix"], "limit": limit}
+        )
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def list_tenant_summaries(
+        db: AsyncSession,
+        fields: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> list[dict]:
+        """
+        Tenant list rows from v_tenant_summary, selecting only the requested fields.
+
+        Args:
+            fields: Keys of TENANT_SUMMARY_FIELDS to return (default: all); id is always included
+            search: Room ('6.1A') or name / phone / personal ID, see tenant_list_filter
+            skip, limit: Offset pagination, ordered by last and first name
+
+        Returns:
+            One flat dict per row with the requested fields
+
+        Raises:
+            ValueError: If a field is unknown
+        """
+        selected = list(TENANT_SUMMARY_FIELDS) if not fields else ["id"] + [f for f in fields if f != "id"]
+        unknown = [f for f in selected if f not in TENANT_SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(TENANT_SUMMARY_FIELDS)}"
+            )
+
+        # Field names are whitelisted above, everything else is a bind parameter
+        columns = ", ".join(f"{TENANT_SUMMARY_FIELDS[f]} AS {f}" for f in dict.fromkeys(selected))
+        where_clause, params = tenant_list_filter(search)
+        result = await db.execute(
+            text(f"""
+                SELECT {columns}
+                FROM v_tenant_summary
+                {where_clause}
+                ORDER BY last_name, first_name
+                LIMIT :limit OFFSET :offset
+            """),
+            {**params, "limit": limit, "offset": skip}
+        )
+        return [dict(row) for row in result.mappings()]
@@ -0,0 +1,7 @@
+"""
+Benchmarks for the API hot paths.
+
+portfolio      deterministic synthetic data generator (python -m benchmarks.portfolio)
+harness        latency harness writing p50/p95/p99 results (python -m benchmarks.harness)
+serialization  response serialization timings of the list endpoints (python -m benchmarks.serialization)
+"""
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Latency benchmarks for the API hot paths.
+
+Drives app.main:app in-process through httpx.AsyncClient (no network, no uvicorn)
+against the configured database, usually one loaded with benchmarks.portfolio.
+Each scenario is requested a fixed number of times with bounded concurrency, and
+p50 / p95 / p99 latencies are written to a JSON file. Pass --baseline to compare
+with an earlier result and flag regressions.
+
+Usage (from the backend directory):
+    uv run python -m benchmarks.harness
+    uv run python -m benchmarks.harness --iterations 200 --concurrency 8 --only invoices cash_flow
+    uv run python -m benchmarks.harness --baseline benchmarks/results/before.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class Scenario:
+    """One benchmarked request; build() returns (method, url, kwargs) for an iteration"""
+    name: str
+    build: Callable[[int], tuple]
+
+
+@dataclass
+class Samples:
+    """Ids picked from the database that scenarios rotate through"""
+    room_ids: List[int]
+    lease_ids: List[int]
+    building_ids: List[int]
+
+    @staticmethod
+    async def load(seed: int, size: int = 200) -> "Samples":
+        async with AsyncSessionLocal() as db:
+            async def ids(sql: str) -> List[int]:
+                return list((await db.execute(text(sql))).scalars())
+
+            room_ids = await ids("SELECT id FROM room WHERE deleted_at IS NULL ORDER BY id")
+            lease_ids = await ids(
+                "SELECT id FROM lease WHERE deleted_at IS NULL AND submitted_at IS NOT NULL ORDER BY id"
+            )
+            building_ids = await ids("SELECT id FROM building WHERE deleted_at IS NULL ORDER BY id")
+
+        if not room_ids or not lease_ids:
+            raise SystemExit("No rooms or leases found - load data with `python -m benchmarks.portfolio` first")
+
+        rng = random.Random(seed)
+
+        def pick(values: List[int]) -> List[int]:
+            return rng.sample(values, min(size, len(values)))
+
+        return Samples(pick(room_ids), pick(lease_ids), pick(building_ids))
+
+
+def build_scenarios(samples: Samples) -> List[Scenario]:
+    """The canonical hot paths: list endpoints, the room dashboard and billing calculations"""
+    today = date.today()
+
+    def rotate(values: List[int]) -> Callable[[int], int]:
+        return lambda i: values[i % len(values)]
+
+    room = rotate(samples.room_ids)
+    lease = rotate(samples.lease_ids)
+    building = rotate(samples.building_ids)
+
+    return [
+        Scenario("leases", lambda i: ("GET", "/leases/", {"params": {"limit": 100}})),
+        Scenario("leases_by_room", lambda i: ("GET", "/leases/", {"params": {"room_id": room(i)}})),
+        Scenario("leases_active", lambda i: ("GET", "/leases/", {"params": {"status": "active", "limit": 100}})),
+        Scenario("tenants", lambda i: ("GET", "/tenants/", {"params": {"limit": 100}})),
+        Scenario("tenants_summary", lambda i: ("GET", "/tenants/", {"params": {"view": "summary", "limit": 100}})),
+        Scenario("tenants_search", lambda i: ("GET", "/tenants/", {"params": {"search": "陳", "limit": 50}})),
+        Scenario("tenants_search_ranked", lambda i: ("GET", "/tenants/search", {"params": {"q": "陳志明"}})),
+        Scenario("tenants_autocomplete", lambda i: ("GET", "/tenants/autocomplete", {"params": {"q": "陳"}})),
+        Scenario("room_dashboard", lambda i: ("GET", f"/rooms/{room(i)}/dashboard", {})),
+        Scenario("room_dashboard_view", lambda i: ("GET", f"/rooms/{room(i)}/dashboard", {"params": {"use_stats": "false"}})),
+        Scenario("invoices", lambda i: ("GET", "/invoices/", {"params": {"limit": 100}})),
+        Scenario("invoices_by_building", lambda i: (
+            "GET", "/invoices/", {"params": {"building_id": building(i), "status": "overdue", "limit": 100}}
+        )),
+        Scenario("cash_flow", lambda i: ("GET", "/cash-flow/", {"params": {"limit": 100}})),
+        Scenario("cash_flow_by_building", lambda i: (
+            "GET", "/cash-flow/", {"params": {"building_id": building(i), "limit": 100}}
+        )),
+        Scenario("cash_flow_aggregate", lambda i: (
+            "GET", "/cash-flow/aggregate", {"params": {"group_by": "month", "from": f"{today.year - 1}-01-01"}}
+        )),
+        Scenario("billing_electricity_cost", lambda i: (
+            "POST", f"/rooms/{room(i)}/calculate-electricity-cost",
+            {"json": {"final_reading": 999999, "reading_date": today.isoformat()}},
+        )),
+        Scenario("billing_proration", lambda i: (
+            "POST", f"/leases/{lease(i)}/calculate-proration", {"json": {"termination_date": today.isoformat()}}
+        )),
+        Scenario("billing_rent", lambda i: (
+            "POST", "/invoices/calculate-rent", {"json": {"monthly_rent": "12000", "payment_term_months": 6}}
+        )),
+    ]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def summarize(durations: List[float], statuses: Dict[int, int], errors: int) -> Dict[str, Any]:
+    ordered = sorted(durations)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        "min_ms": ms(ordered[0]) if ordered else 0.0,
+        "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "max_ms": ms(ordered[-1]) if ordered else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    iterations: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = 0
+
+    async def one(i: int, record: bool) -> None:
+        nonlocal errors
+        method, url, kwargs = scenario.build(i)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                await response.aread()
+            except Exception as e:
+                if record:
+                    errors += 1
+                logger.debug("%s failed: %s", scenario.name, e)
+                return
+            elapsed = time.perf_counter() - started
+        if record:
+            durations.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    for i in range(warmup):
+        await one(i, record=False)
+    await asyncio.gather(*(one(i, record=True) for i in range(iterations)))
+    return summarize(durations, statuses, errors)
+
+
+async def dataset_summary() -> Dict[str, int]:
+    """Row counts stored with the results so runs on different datasets are not compared blindly"""
+    tables = ("building", "room", "tenant", "lease", "invoice", "meter_reading", "cash_flow")
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(text(
+            "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {t}) AS {t}" for t in tables)
+        ))).one()
+    return dict(row._mapping)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(
+    iterations: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    from app.main import app
+
+    samples = await Samples.load(seed)
+    scenarios = [s for s in build_scenarios(samples) if not only or s.name in only]
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(client, scenario, iterations, concurrency, warmup)
+            stats = results[scenario.name]
+            logger.info(
+                "%-26s p50 %8.2fms  p95 %8.2fms  p99 %8.2fms  errors %d",
+                scenario.name, stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["errors"],
+            )
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "settings": {"iterations": iterations, "concurrency": concurrency, "warmup": warmup, "seed": seed},
+        "dataset": await dataset_summary(),
+        "results": results,
+    }
+    await engine.dispose()
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare p50/p95 with a baseline report.
+
+    Returns:
+        Names of scenarios whose p95 grew by more than threshold (0.2 = 20%)
+    """
+    regressions = []
+    if baseline.get("dataset") != report.get("dataset"):
+        logger.warning("Baseline was recorded on a different dataset: %s", baseline.get("dataset"))
+
+    for name, stats in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = stats["p95_ms"] / before["p95_ms"] - 1
+        flag = "REGRESSION" if change > threshold else ""
+        logger.info(
+            "%-26s p50 %8.2f -> %8.2fms  p95 %8.2f -> %8.2fms  (%+.0f%%) %s",
+            name, before["p50_ms"], stats["p50_ms"], before["p95_ms"], stats["p95_ms"], change * 100, flag,
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FormosaStay API hot paths")
+    parser.add_argument("--iterations", type=int, default=100, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per scenario")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for picking room/lease/building ids")
+    parser.add_argument("--only", nargs="+", help="Scenario names to run (default: all)")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier result file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 growth counted as a regression")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    report = asyncio.run(run_benchmarks(args.iterations, args.concurrency, args.warmup, args.seed, args.only))
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    logger.info("Results written to %s", output)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            logger.error("p95 regressions over %.0f%%: %s", args.threshold * 100, ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Synthetic portfolio generator for benchmarks.
+
+Fills the database with buildings, rooms, a history of back-to-back leases with
+their tenants, rent / deposit / electricity invoices, monthly meter readings,
+default electricity rates and the matching cash flows. The same spec and seed
+always produce the same rows (invoice statuses are relative to the day of the
+run), so results of different runs are comparable.
+
+Rows are loaded with COPY, one building at a time, in a single transaction.
+Run the migrations first (cash flow categories and accounts come from the seed).
+
+Usage (from the backend directory):
+    uv run python -m benchmarks.portfolio --buildings 50 --rooms 60 --years 10 --reset
+    uv run python -m benchmarks.portfolio --buildings 5 --rooms 20 --years 3 --seed 7
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional
+
+import psycopg
+
+from app.config import settings
+from app.services.invoice_service import InvoiceService
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_TERM_MONTHS = {"monthly": 1, "seasonal": 3, "semi-annual": 6, "annual": 12}
+
+# Tables written by the generator, in foreign key order
+TABLE_COLUMNS = {
+    "building": ("id", "building_no", "address", "landlord_name"),
+    "room": ("id", "building_id", "floor_no", "room_no", "size_ping", "is_rentable"),
+    "meter_reading": ("id", "room_id", "read_date", "read_amount"),
+    "tenant": ("id", "first_name", "last_name", "gender", "birthday", "personal_id", "phone", "email", "home_address"),
+    "lease": (
+        "id", "room_id", "start_date", "end_date", "terminated_at", "termination_reason", "submitted_at",
+        "monthly_rent", "deposit", "pay_rent_on", "payment_term",
+    ),
+    "lease_tenant": ("lease_id", "tenant_id", "tenant_role", "joined_at"),
+    "invoice": ("id", "lease_id", "category", "period_start", "period_end", "due_amount", "paid_amount", "payment_status"),
+    "cash_flow": (
+        "id", "category_id", "cash_account_id", "lease_id", "building_id", "room_id", "invoice_id",
+        "flow_date", "amount", "payment_method",
+    ),
+}
+RATE_COLUMNS = ("id", "room_id", "start_date", "end_date", "rate_per_kwh")
+
+# Tables with an identity id column
+ID_TABLES = ("electricity_rate", *(table for table in TABLE_COLUMNS if table != "lease_tenant"))
+
+# Monthly building expenses: category code -> (min, max) amount
+BUILDING_EXPENSES = {
+    "building_electricity": (8000, 20000),
+    "water": (1500, 4000),
+    "manager_salary": (25000, 25000),
+    "maintenance": (0, 12000),
+    "internet": (1200, 1200),
+}
+
+_LAST_NAMES = "陳林黃張李王吳劉蔡楊許鄭謝郭洪曾邱廖賴徐"
+_FIRST_NAMES = ("家豪", "志明", "俊傑", "建宏", "怡君", "淑芬", "雅婷", "美玲", "冠宇", "宗翰", "佳穎", "詩涵", "承恩", "柏翰", "欣怡")
+_CITIES = ("台南市", "高雄市", "台中市", "台北市", "嘉義市", "新北市")
+
+
+@dataclass
+class PortfolioSpec:
+    """Size and shape of the generated portfolio"""
+    buildings: int = 50
+    rooms_per_building: int = 60
+    years: int = 10
+    end_year: int = field(default_factory=lambda: date.today().year)  # Last generated year (leases may extend past it)
+    rooms_per_floor: int = 8
+    seed: int = 42
+    vacancy_rate: float = 0.1  # Probability that a room sits empty for a few months between leases
+    early_termination_rate: float = 0.05
+    overdue_rate: float = 0.03  # Share of past invoices left unpaid
+
+    @property
+    def start_date(self) -> date:
+        return date(self.end_year - self.years + 1, 1, 1)
+
+    @property
+    def end_date(self) -> date:
+        return date(self.end_year, 12, 31)
+
+
+def _month_starts(start: date, end: date) -> Iterator[date]:
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        yield current
+        current = InvoiceService.calculate_period_end(current, 1) + timedelta(days=1)
+
+
+class _IdSequence:
+    """Hands out ids after the current maximum of a table"""
+
+    def __init__(self, start: int):
+        self.value = start
+
+    def next(self) -> int:
+        self.value += 1
+        return self.value
+
+
+class PortfolioGenerator:
+    """
+    Deterministic row generator.
+
+    Ids are assigned in Python (continuing after the existing maximum of each table)
+    so child rows can reference their parents without a round trip.
+    """
+
+    def __init__(
+        self,
+        spec: PortfolioSpec,
+        id_start: Dict[str, int],
+        building_no_start: int,
+        category_ids: Dict[str, int],
+        account_ids: Dict[str, int],
+        today: Optional[date] = None,
+    ):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.ids = {table: _IdSequence(id_start.get(table, 0)) for table in ID_TABLES}
+        self.building_no_start = building_no_start
+        self.category_ids = category_ids
+        self.account_ids = account_ids
+        self.today = today or date.today()
+
+    def building_batches(self) -> Iterator[Dict[str, List[tuple]]]:
+        """Yield the rows of one building at a time, keyed by table"""
+        for b in range(self.spec.buildings):
+            yield self._building(b)
+
+    def _building(self, index: int) -> Dict[str, List[tuple]]:
+        rng = self.rng
+        rows: Dict[str, List[tuple]] = {table: [] for table in TABLE_COLUMNS}
+        building_id = self.ids["building"].next()
+        rows["building"].append((
+            building_id,
+            self.building_no_start + index + 1,
+            f"{rng.choice(_CITIES)}東區大學路{index + 1}號",
+            f"{rng.choice(_LAST_NAMES)}{rng.choice(_FIRST_NAMES)}",
+        ))
+
+        room_ids = []
+        for r in range(self.spec.rooms_per_building):
+            room_id = self.ids["room"].next()
+            room_ids.append(room_id)
+            floor_no = r // self.spec.rooms_per_floor + 1
+            room_no = chr(ord("A") + r % self.spec.rooms_per_floor)
+            size = Decimal(rng.randint(500, 1200)) / 100
+            rows["room"].append((room_id, building_id, floor_no, room_no, size, True))
+            self._room_history(rows, building_id, room_id)
+
+        for month in _month_starts(self.spec.start_date, min(self.spec.end_date, self.today)):
+            for code, (low, high) in BUILDING_EXPENSES.items():
+                amount = rng.randint(low, high)
+                if amount == 0:
+                    continue
+                # chk_cf_room_requires_building: building-level entries are booked on the first room
+                rows["cash_flow"].append((
+                    self.ids["cash_flow"].next(), self.category_ids[code], self.account_ids["bank"],
+                    None, building_id, room_ids[0], None,
+                    month + timedelta(days=rng.randint(4, 20)), Decimal(amount), "bank",
+                ))
+        return rows
+
+    def _room_history(self, rows: Dict[str, List[tuple]], building_id: int, room_id: int) -> None:
+        spec, rng = self.spec, self.rng
+        horizon_end = min(spec.end_date, self.today)
+
+        # Cumulative meter, read on the first of every month
+        reading = Decimal(rng.randint(0, 5000))
+        usage_by_month: Dict[date, Decimal] = {}
+        for month in _month_starts(spec.start_date, horizon_end):
+            usage = Decimal(rng.randint(40, 450))
+            usage_by_month[month] = usage
+            reading += usage
+            rows["meter_reading"].append((self.ids["meter_reading"].next(), room_id, month, reading))
+
+        cursor = spec.start_date
+        while cursor <= spec.end_date:
+            if rng.random() < spec.vacancy_rate:
+                cursor = InvoiceService.calculate_period_end(cursor, rng.randint(1, 3)) + timedelta(days=1)
+                continue
+
+            payment_term = rng.choices(list(PAYMENT_TERM_MONTHS), weights=(2, 2, 2, 4))[0]
+            term_months = PAYMENT_TERM_MONTHS[payment_term]
+            lease_months = rng.choice((12, 12, 24))
+            start_date = cursor
+            end_date = InvoiceService.calculate_period_end(start_date, lease_months)
+            terminated_at = None
+            if rng.random() < spec.early_termination_rate:
+                terminated_at = start_date + timedelta(days=rng.randint(60, (end_date - start_date).days))
+            monthly_rent = Decimal(rng.randrange(6000, 16000, 500))
+
+            lease_id = self.ids["lease"].next()
+            tenant_id = self.ids["tenant"].next()
+            gender = rng.choice(("M", "F"))
+            rows["tenant"].append((
+                tenant_id, rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES), gender,
+                date(rng.randint(1960, 2004), rng.randint(1, 12), rng.randint(1, 28)),
+                f"{'AB'[gender == 'F']}{spec.seed % 100:02d}{tenant_id:07d}",
+                f"09{rng.randint(10000000, 99999999)}",
+                f"tenant{tenant_id}@example.com",
+                f"{rng.choice(_CITIES)}中正路{rng.randint(1, 400)}號",
+            ))
+            rows["lease"].append((
+                lease_id, room_id, start_date, end_date, terminated_at,
+                "early move-out" if terminated_at else None,
+                datetime.combine(start_date - timedelta(days=14), datetime.min.time(), tzinfo=timezone.utc),
+                monthly_rent, monthly_rent * 2, 1, payment_term,
+            ))
+            rows["lease_tenant"].append((lease_id, tenant_id, "primary", start_date))
+
+            occupied_until = min(terminated_at or end_date, end_date)
+            self._invoice(rows, lease_id, building_id, room_id, "deposit", start_date, start_date, monthly_rent * 2)
+            period_start = start_date
+            while period_start <= occupied_until:
+                period_end = InvoiceService.calculate_period_end(period_start, term_months)
+                self._invoice(rows, lease_id, building_id, room_id, "rent", period_start, period_end, monthly_rent * term_months)
+                period_start = period_end + timedelta(days=1)
+
+            for month in _month_starts(start_date, min(occupied_until, horizon_end)):
+                month_end = InvoiceService.calculate_period_end(month, 1)
+                if month_end > horizon_end:
+                    break
+                usage = usage_by_month.get(month, Decimal(0))
+                self._invoice(rows, lease_id, building_id, room_id, "electricity", month, month_end, (usage * self._default_rate(month.year)).quantize(Decimal("1")))
+
+            cursor = occupied_until + timedelta(days=1)
+            if terminated_at:
+                cursor = date(cursor.year, cursor.month, 1)
+                cursor = InvoiceService.calculate_period_end(cursor, 1) + timedelta(days=1)
+
+    def _invoice(
+        self,
+        rows: Dict[str, List[tuple]],
+        lease_id: int,
+        building_id: int,
+        room_id: int,
+        category: str,
+        period_start: date,
+        period_end: date,
+        amount: Decimal,
+    ) -> None:
+        invoice_id = self.ids["invoice"].next()
+        if period_start > self.today:
+            status, paid = "unmatured", Decimal(0)
+        elif period_end >= self.today or self.rng.random() < self.spec.overdue_rate:
+            status, paid = ("unmatured" if period_end >= self.today else "overdue"), Decimal(0)
+        else:
+            status, paid = "paid", amount
+        rows["invoice"].append((invoice_id, lease_id, category, period_start, period_end, amount, paid, status))
+
+        if paid and category in ("rent", "deposit"):
+            code = "rent" if category == "rent" else "deposit_received"
+            account = "bank" if category == "rent" else "deposit"
+            rows["cash_flow"].append((
+                self.ids["cash_flow"].next(), self.category_ids[code], self.account_ids[account],
+                lease_id, building_id, room_id, invoice_id,
+                period_start + timedelta(days=self.rng.randint(0, 5)), amount,
+                self.rng.choice(("bank", "bank", "cash", "LINE_Pay")),
+            ))
+
+    def _default_rate(self, year: int) -> Decimal:
+        return Decimal("4.5") + Decimal("0.1") * (year - self.spec.start_date.year)
+
+    def default_rates(self) -> List[tuple]:
+        """One default (room_id NULL) electricity rate per generated year"""
+        return [
+            (self.ids["electricity_rate"].next(), None, date(year, 1, 1), date(year, 12, 31), self._default_rate(year))
+            for year in range(self.spec.start_date.year, self.spec.end_year + 1)
+        ]
+
+
+def _conninfo() -> str:
+    url = settings.sync_database_url
+    return url.replace("postgresql+psycopg://", "postgresql://", 1)
+
+
+def _copy(cur: psycopg.Cursor, table: str, columns: tuple, rows: List[tuple]) -> None:
+    if not rows:
+        return
+    with cur.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def _reset(cur: psycopg.Cursor) -> None:
+    """Remove existing portfolio data (keeps users, categories and accounts)"""
+    cur.execute("""
+        TRUNCATE cash_flow_attachment, cash_flow, cash_flow_monthly_rollup,
+                 invoice_adjustment, invoice_discount, invoice,
+                 lease_amendment, lease_tenant, lease,
+                 tenant_emergency_contact, tenant,
+                 meter_reading, electricity_rate, room, building
+        RESTART IDENTITY CASCADE
+    """)
+
+
+def load_portfolio(spec: PortfolioSpec, reset: bool = False) -> Dict[str, int]:
+    """
+    Generate the portfolio and load it into the configured database.
+
+    Returns:
+        Number of rows written per table
+    """
+    counts = {table: 0 for table in ("electricity_rate", *TABLE_COLUMNS)}
+    started = time.perf_counter()
+
+    with psycopg.connect(_conninfo()) as conn, conn.cursor() as cur:
+        if reset:
+            _reset(cur)
+
+        id_start = {}
+        for table in ID_TABLES:
+            cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            id_start[table] = cur.fetchone()[0]
+        cur.execute("SELECT COALESCE(MAX(building_no), 0) FROM building")
+        building_no_start = cur.fetchone()[0]
+        cur.execute("SELECT code, id FROM cash_flow_category")
+        category_ids = dict(cur.fetchall())
+        cur.execute("SELECT DISTINCT ON (account_type) account_type, id FROM cash_account ORDER BY account_type, id")
+        account_ids = dict(cur.fetchall())
+
+        generator = PortfolioGenerator(spec, id_start, building_no_start, category_ids, account_ids)
+        rates = generator.default_rates()
+        _copy(cur, "electricity_rate", RATE_COLUMNS, rates)
+        counts["electricity_rate"] = len(rates)
+
+        for i, batch in enumerate(generator.building_batches(), start=1):
+            for table, columns in TABLE_COLUMNS.items():
+                _copy(cur, table, columns, batch[table])
+                counts[table] += len(batch[table])
+            logger.info("Building %d/%d loaded (%d invoices so far)", i, spec.buildings, counts["invoice"])
+
+        # Ids were supplied explicitly, move the identity sequences past them
+        for table in ID_TABLES:
+            cur.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            )
+        conn.commit()
+
+        cur.execute(f"ANALYZE {', '.join(counts)}")
+        conn.commit()
+
+    # The NAOI rollup and the rent schedule are maintained by the API, rebuild them
+    # for the bulk-loaded ledger and leases
+    asyncio.run(_rebuild_derived_tables())
+
+    logger.info("Portfolio loaded in %.1fs: %s", time.perf_counter() - started, counts)
+    return counts
+
+
+async def _rebuild_derived_tables() -> None:
+    from app.db.session import AsyncSessionLocal, engine
+    from app.services.rent_schedule_service import RentScheduleService
+    from app.services.report_service import ReportService
+
+    async with AsyncSessionLocal() as db:
+        await ReportService.rebuild_rollup(db)
+        rows = await RentScheduleService.rebuild_all(db)
+        logger.info("Rent schedule rebuilt (%d periods)", rows)
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a synthetic FormosaStay portfolio for benchmarking")
+    defaults = PortfolioSpec()
+    parser.add_argument("--buildings", type=int, default=defaults.buildings)
+    parser.add_argument("--rooms", type=int, default=defaults.rooms_per_building, help="Rooms per building")
+    parser.add_argument("--years", type=int, default=defaults.years, help="Years of lease history")
+    parser.add_argument("--end-year", type=int, default=defaults.end_year)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--reset", action="store_true", help="Truncate existing buildings, leases, invoices, ... first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    spec = PortfolioSpec(
+        buildings=args.buildings,
+        rooms_per_building=args.rooms,
+        years=args.years,
+        end_year=args.end_year,
+        seed=args.seed,
+    )
+    if spec.rooms_per_floor > 26:
+        parser.error("rooms_per_floor must fit room_no A-Z")
+    logger.info("Generating portfolio %s", asdict(spec))
+    load_portfolio(spec, reset=args.reset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark for the list endpoints.
+
+Times only the step from the rows a handler has in hand to the response body, on
+synthetic pages shaped like the /tenants/, /cash-flow/ and /invoices/ rows (Decimal
+amounts, dates, nested objects), so no database is needed:
+
+- legacy:       per-field float() / isoformat() conversions, then FastAPI's
+                response_model=List[dict] path rendered by the stock JSONResponse
+- orjson:       the native rows rendered by app.responses.ORJSONResponse
+- pydantic:     FastAPI's path for typed response models with the stock JSONResponse:
+                validation, serialization to JSON-compatible Python objects
+                (mode="json"), then json.dumps
+- pydantic+orjson: the same model path rendered by ORJSONResponse, the app's
+                default_response_class
+
+The model path mirrors fastapi.routing.serialize_response of the locked FastAPI
+(0.125), which returns Python objects for the response class to render.
+
+Usage (from the backend directory):
+    uv run python -m benchmarks.serialization
+    uv run python -m benchmarks.serialization --rows 1000 --iterations 200 --output benchmarks/results/serialization.json
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.responses import ORJSONResponse
+from app.schemas.invoice import InvoiceTransactionResponse
+
+logger = logging.getLogger(__name__)
+
+_DICT_ROWS = TypeAdapter(List[dict])
+_INVOICE_ROWS = TypeAdapter(List[InvoiceTransactionResponse])
+
+
+def _legacy_convert(value: Any) -> Any:
+    """What the handlers did by hand before returning rows"""
+    if isinstance(value, dict):
+        return {key: _legacy_convert(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_legacy_convert(item) for item in value]
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _tenant_rows(rng: random.Random, count: int) -> List[dict]:
+    """/tenants/ (view=full) rows"""
+    rows = []
+    for i in range(count):
+        start = date(2024, 1, 1) + timedelta(days=rng.randrange(700))
+        room = {"id": i, "floor_no": rng.randrange(1, 12), "room_no": "A", "roomNumber": "3A"}
+        rows.append({
+            "id": i,
+            "first_name": "志明",
+            "last_name": "陳",
+            "name": "陳志明",
+            "gender": "M",
+            "birthday": date(1990, 1, 1) + timedelta(days=rng.randrange(9000)),
+            "personal_id": f"A{rng.randrange(10**9):09d}",
+            "idNumber": f"A{rng.randrange(10**9):09d}",
+            "phone": f"09{rng.randrange(10**8):08d}",
+            "phoneNumber": f"09{rng.randrange(10**8):08d}",
+            "email": None,
+            "line_id": None,
+            "address": "台南市東區大學路1號",
+            "emergency_contacts": [
+                {"id": i, "first_name": "美玲", "last_name": "陳", "relationship": "母", "phone": "0912345678"}
+            ],
+            "active_lease": {
+                "id": i,
+                "start_date": start,
+                "end_date": start + timedelta(days=365),
+                "monthly_rent": Decimal(rng.randrange(6000, 20000, 500)).quantize(Decimal("0.01")),
+                "deposit": Decimal("24000.00"),
+                "status": "active",
+                "payment_term": "monthly",
+                "vehicle_plate": None,
+                "assets": [{"type": "key", "quantity": 2}],
+                "asset_keys_quantity": 2,
+                "asset_fob_quantity": 0,
+                "asset_remote_quantity": 0,
+                "room": room,
+                "building": {"id": 1, "building_no": 6},
+            },
+            "room": room,
+            "building": {"id": 1, "building_no": 6, "address": "台南市東區大學路1號"},
+        })
+    return rows
+
+
+def _cash_flow_rows(rng: random.Random, count: int) -> List[dict]:
+    """/cash-flow/ rows"""
+    return [
+        {
+            "id": i,
+            "category_id": 1,
+            "cash_account_id": 1,
+            "lease_id": i,
+            "building_id": 1,
+            "room_id": i,
+            "flow_date": date(2024, 1, 1) + timedelta(days=rng.randrange(700)),
+            "amount": Decimal(rng.randrange(100, 50000)).quantize(Decimal("0.01")),
+            "payment_method": "bank",
+            "note": None,
+            "category_name": "租金",
+            "category_code": "rent",
+            "category_direction": "in",
+            "direction": "in",
+        }
+        for i in range(count)
+    ]
+
+
+def _invoice_rows(rng: random.Random, count: int) -> List[dict]:
+    """/invoices/ rows (InvoiceService.list_invoice_transactions_query)"""
+    rows = []
+    for i in range(count):
+        start = date(2024, 1, 1) + timedelta(days=rng.randrange(700))
+        rows.append({
+            "id": i,
+            "invoice_id": i,
+            "room_id": i,
+            "lease_id": i,
+            "tenant_name": "陳志明",
+            "category": "rent",
+            "amount": Decimal(rng.randrange(6000, 20000, 500)).quantize(Decimal("0.01")),
+            "due_date": start + timedelta(days=30),
+            "period_start": start,
+            "period_end": start + timedelta(days=30),
+            "status": "paid",
+            "paid_date": start + timedelta(days=30),
+            "payment_method": None,
+            "note": None,
+        })
+    return rows
+
+
+def _legacy(rows: List[dict]) -> bytes:
+    return JSONResponse(_DICT_ROWS.dump_python(_DICT_ROWS.validate_python(_legacy_convert(rows)), mode="json")).body
+
+
+def _orjson(rows: List[dict]) -> bytes:
+    return ORJSONResponse(rows).body
+
+
+def _pydantic(rows: List[dict]) -> bytes:
+    return JSONResponse(_INVOICE_ROWS.dump_python(_INVOICE_ROWS.validate_python(rows), mode="json")).body
+
+
+def _pydantic_orjson(rows: List[dict]) -> bytes:
+    return ORJSONResponse(_INVOICE_ROWS.dump_python(_INVOICE_ROWS.validate_python(rows), mode="json")).body
+
+
+# endpoint -> (row factory, {pipeline: serializer})
+ENDPOINTS: Dict[str, tuple] = {
+    "/tenants/": (_tenant_rows, {"legacy": _legacy, "orjson": _orjson}),
+    "/cash-flow/": (_cash_flow_rows, {"legacy": _legacy, "orjson": _orjson}),
+    "/invoices/": (_invoice_rows, {"pydantic": _pydantic, "pydantic+orjson": _pydantic_orjson}),
+}
+
+
+def measure(serialize: Callable[[List[dict]], bytes], rows: List[dict], iterations: int) -> Dict[str, Any]:
+    serialize(rows)  # warm up (schema / encoder caches)
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = serialize(rows)
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    return {
+        "mean_ms": round(sum(durations) / len(durations) * 1000, 3),
+        "p50_ms": round(durations[len(durations) // 2] * 1000, 3),
+        "bytes": len(body),
+    }
+
+
+def run(rows: int, iterations: int, seed: int) -> Dict[str, Any]:
+    results = {}
+    for endpoint, (make_rows, pipelines) in ENDPOINTS.items():
+        page = make_rows(random.Random(seed), rows)
+        results[endpoint] = {name: measure(serialize, page, iterations) for name, serialize in pipelines.items()}
+        baseline_ms = next(iter(results[endpoint].values()))["mean_ms"]
+        for name, stats in results[endpoint].items():
+            logger.info(
+                "%-12s %-16s mean %8.3fms  p50 %8.3fms  %7d bytes  (%+.0f%%)",
+                endpoint, name, stats["mean_ms"], stats["p50_ms"], stats["bytes"],
+                (stats["mean_ms"] / baseline_ms - 1) * 100 if baseline_ms else 0,
+            )
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "settings": {"rows": rows, "iterations": iterations, "seed": seed},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization of the list endpoints")
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument("--iterations", type=int, default=500, help="Timed serializations per pipeline")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    report = run(args.rows, args.iterations, args.seed)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        logger.info("Results written to %s", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Index advisor for the canonical endpoint queries.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the queries behind the hot endpoints
+against the configured database (ideally one seeded with benchmarks.portfolio)
+and reports every sequential scan on a table larger than --min-rows, with the
+filter it evaluated, so missing indexes show up before they hurt in production.
+
+Queries built by the services are compiled from the same builders the endpoints
+use, so the report follows code changes.
+
+Usage (from the backend directory):
+    uv run python -m db_tools.explain_queries
+    uv run python -m db_tools.explain_queries --only invoices_overdue lease_overlap --verbose
+    uv run python -m db_tools.explain_queries --json report.json --fail-on-seq-scan
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add parent directory to path to import app modules
+SCRIPT_DIR = Path(__file__).parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import psycopg
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.models.invoice import Invoice
+from app.models.lease import Lease, LeaseTenant
+from app.services.cash_flow_service import CashFlowService
+from app.services.invoice_service import InvoiceService
+from app.services.lease_service import lease_status_expr
+from app.services.tenant_service import (
+    _AUTOCOMPLETE_TENANTS_SQL,
+    _SEARCH_TENANTS_SQL,
+    _TENANT_ROOM_LATERAL,
+    tenant_list_filter,
+    tenant_search_patterns,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def compile_query(stmt) -> str:
+    """Render a SQLAlchemy statement as PostgreSQL with inlined parameters"""
+    # "named" keeps % unescaped: the SQL is executed without parameters
+    return str(stmt.compile(dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"literal_binds": True}))
+
+
+def _tenant_search_sql(term: str, limit: int) -> str:
+    patterns = tenant_search_patterns(term)
+    sql = _SEARCH_TENANTS_SQL.format(
+        tenant_match="t.search_key LIKE :contains OR :term <% t.search_key",
+        plate_pattern=":contains",
+        room_lateral=_TENANT_ROOM_LATERAL,
+    )
+    return compile_query(text(sql).bindparams(
+        term=term, word_prefix=patterns["word_prefix"], contains=patterns["contains"], limit=limit
+    ))
+
+
+def _tenant_list_sql(search: str, limit: int) -> str:
+    where_clause, params = tenant_list_filter(search)
+    sql = f"SELECT * FROM v_tenant_complete {where_clause} ORDER BY last_name, first_name LIMIT :limit"
+    return compile_query(text(sql).bindparams(**params, limit=limit))
+
+
+def _active_lease_conditions(today: date):
+    return [
+        Lease.submitted_at.isnot(None),
+        Lease.terminated_at.is_(None),
+        Lease.start_date <= today,
+        Lease.end_date >= today,
+        Lease.deleted_at.is_(None),
+    ]
+
+
+# name -> builder(sample) returning SQL; sample holds ids picked from the database
+CANONICAL_QUERIES: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    # GET /rooms/, GET /dashboard/stats
+    "rooms_active_leases": lambda s: compile_query(
+        select(Lease.id, Lease.room_id).where(and_(*_active_lease_conditions(s["today"])))
+    ),
+    # GET /rooms/{id}, availability checks
+    "room_active_lease": lambda s: compile_query(
+        select(Lease.id).where(and_(Lease.room_id == s["room_id"], *_active_lease_conditions(s["today"])))
+    ),
+    # find_overlapping_submitted_lease (lease create / submit / renew)
+    "lease_overlap": lambda s: compile_query(
+        select(Lease.id).where(
+            Lease.room_id == s["room_id"],
+            Lease.submitted_at.isnot(None),
+            Lease.terminated_at.is_(None),
+            Lease.deleted_at.is_(None),
+            Lease.end_date >= s["today"],
+            Lease.start_date <= date(s["today"].year + 1, s["today"].month, 1),
+        )
+    ),
+    # GET /leases/?status=active
+    "leases_active": lambda s: compile_query(
+        select(Lease).where(lease_status_expr(s["today"]) == "active")
+        .order_by(Lease.created_at.desc(), Lease.id.desc()).limit(100)
+    ),
+    # GET /leases/?tenant_id=
+    "leases_by_tenant": lambda s: compile_query(
+        select(Lease).join(LeaseTenant).where(LeaseTenant.tenant_id == s["tenant_id"])
+        .order_by(Lease.created_at.desc(), Lease.id.desc()).limit(100)
+    ),
+    # GET /dashboard/stats overdue totals
+    "invoices_overdue_totals": lambda s: compile_query(
+        select(func.count(Invoice.id), func.sum(Invoice.due_amount - Invoice.paid_amount))
+        .where(Invoice.payment_status.in_(["overdue", "partial"]), Invoice.deleted_at.is_(None))
+    ),
+    # GET /invoices/
+    "invoices": lambda s: compile_query(InvoiceService.list_invoice_transactions_query(limit=100)),
+    "invoices_overdue": lambda s: compile_query(
+        InvoiceService.list_invoice_transactions_query(status="overdue", limit=100)
+    ),
+    "invoices_by_building": lambda s: compile_query(
+        InvoiceService.list_invoice_transactions_query(building_id=s["building_id"], limit=100)
+    ),
+    # Electricity rate lookup by room and date (rate index reload and SQL fallbacks)
+    "electricity_rate_for_room": lambda s: f"""
+        SELECT rate_per_kwh FROM electricity_rate
+        WHERE (room_id = {s['room_id']} OR room_id IS NULL)
+          AND start_date <= DATE '{s['today']}' AND end_date >= DATE '{s['today']}'
+        ORDER BY room_id IS NULL, start_date DESC
+        LIMIT 1
+    """,
+    # GET /cash-flow/
+    "cash_flow_by_room": lambda s: compile_query(CashFlowService.list_query(room_id=s["room_id"], limit=100)),
+    "cash_flow_by_building": lambda s: compile_query(
+        CashFlowService.list_query(building_id=s["building_id"], date_from=date(s["today"].year, 1, 1), limit=100)
+    ),
+    # GET /cash-flow/aggregate
+    "cash_flow_aggregate_month": lambda s: compile_query(
+        CashFlowService.aggregate_query(["month"], date_from=date(s["today"].year - 1, 1, 1))
+    ),
+    # GET /rooms/{id}/dashboard
+    "room_dashboard_stats": lambda s: f"SELECT * FROM v_room_dashboard_stats WHERE room_id = {s['room_id']}",
+    # GET /tenants/?search= (short term: word prefix, long term: substring)
+    "tenants_search": lambda s: _tenant_list_sql("陳", limit=100),
+    "tenants_search_long": lambda s: _tenant_list_sql("陳志明", limit=100),
+    # GET /tenants/?view=summary
+    "tenants_summary": lambda s: """
+        SELECT * FROM v_tenant_summary
+        ORDER BY last_name, first_name
+        LIMIT 100
+    """,
+    # GET /tenants/search?q=
+    "tenants_search_ranked": lambda s: _tenant_search_sql("陳志明", limit=20),
+    # GET /tenants/autocomplete?q=
+    "tenants_autocomplete": lambda s: compile_query(
+        text(_AUTOCOMPLETE_TENANTS_SQL.format(room_lateral=_TENANT_ROOM_LATERAL)).bindparams(
+            word_prefix="% 陳%", name_prefix=" 陳%", limit=10
+        )
+    ),
+}
+
+
+@dataclass
+class SeqScan:
+    relation: str
+    table_rows: int
+    actual_rows: int
+    removed_by_filter: int
+    filter: Optional[str]
+
+
+@dataclass
+class QueryReport:
+    name: str
+    execution_ms: float
+    planning_ms: float
+    shared_hit: int
+    shared_read: int
+    seq_scans: List[SeqScan] = field(default_factory=list)
+    plan: Optional[dict] = None
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _table_sizes(cur: psycopg.Cursor) -> Dict[str, int]:
+    cur.execute("""
+        SELECT c.relname, GREATEST(c.reltuples, 0)::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relkind = 'r'
+    """)
+    return dict(cur.fetchall())
+
+
+def _sample(cur: psycopg.Cursor) -> Dict[str, Any]:
+    """Pick representative ids (middle of each table) for parameterised queries"""
+    def middle_id(table: str, column: str = "id") -> int:
+        cur.execute(f"SELECT {column} FROM {table} ORDER BY {column} OFFSET (SELECT COUNT(*) / 2 FROM {table}) LIMIT 1")
+        row = cur.fetchone()
+        return row[0] if row else 0
+
+    return {
+        "today": date.today(),
+        "room_id": middle_id("room"),
+        "building_id": middle_id("building"),
+        "tenant_id": middle_id("tenant"),
+    }
+
+
+def explain(cur: psycopg.Cursor, name: str, sql: str, table_sizes: Dict[str, int], min_rows: int) -> QueryReport:
+    """Run EXPLAIN (ANALYZE, BUFFERS) for one query and collect its sequential scans"""
+    cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+    result = cur.fetchone()[0]
+    document = (json.loads(result) if isinstance(result, str) else result)[0]
+    root = document["Plan"]
+
+    report = QueryReport(
+        name=name,
+        execution_ms=document.get("Execution Time", 0.0),
+        planning_ms=document.get("Planning Time", 0.0),
+        shared_hit=root.get("Shared Hit Blocks", 0),
+        shared_read=root.get("Shared Read Blocks", 0),
+        plan=document,
+    )
+    for node in _walk(root):
+        if node.get("Node Type") != "Seq Scan":
+            continue
+        relation = node.get("Relation Name")
+        size = table_sizes.get(relation, 0)
+        if size < min_rows:
+            continue
+        report.seq_scans.append(SeqScan(
+            relation=relation,
+            table_rows=size,
+            actual_rows=node.get("Actual Rows", 0) * node.get("Actual Loops", 1),
+            removed_by_filter=node.get("Rows Removed by Filter", 0) * node.get("Actual Loops", 1),
+            filter=node.get("Filter"),
+        ))
+    return report
+
+
+def run(only: Optional[List[str]] = None, min_rows: int = 1000) -> List[QueryReport]:
+    url = settings.sync_database_url.replace("postgresql+psycopg://", "postgresql://", 1)
+    reports = []
+    with psycopg.connect(url) as conn, conn.cursor() as cur:
+        table_sizes = _table_sizes(cur)
+        sample = _sample(cur)
+        logger.info("Sample parameters: %s", sample)
+
+        for name, build in CANONICAL_QUERIES.items():
+            if only and name not in only:
+                continue
+            try:
+                reports.append(explain(cur, name, build(sample), table_sizes, min_rows))
+            except psycopg.Error as e:
+                logger.error("%s: EXPLAIN failed: %s", name, e)
+            # Nothing here writes, but never keep effects of an analysed statement
+            conn.rollback()
+    return reports
+
+
+def print_report(reports: List[QueryReport], verbose: bool = False) -> None:
+    for report in reports:
+        status = "SEQ SCAN" if report.seq_scans else "ok"
+        print(
+            f"{report.name:<28} {report.execution_ms:>9.2f} ms  "
+            f"(plan {report.planning_ms:.2f} ms, buffers hit {report.shared_hit} read {report.shared_read})  {status}"
+        )
+        for scan in report.seq_scans:
+            print(
+                f"    Seq Scan on {scan.relation} (~{scan.table_rows} rows): "
+                f"returned {scan.actual_rows}, removed by filter {scan.removed_by_filter}"
+            )
+            if scan.filter:
+                print(f"        Filter: {scan.filter}")
+        if verbose and report.plan:
+            print(json.dumps(report.plan["Plan"], indent=2, default=str))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the canonical endpoint queries and report sequential scans")
+    parser.add_argument("--only", nargs="+", choices=sorted(CANONICAL_QUERIES), help="Queries to explain (default: all)")
+    parser.add_argument("--min-rows", type=int, default=1000, help="Ignore sequential scans on smaller tables")
+    parser.add_argument("--json", type=Path, help="Also write the report (with plans) to this file")
+    parser.add_argument("--verbose", action="store_true", help="Print the full plans")
+    parser.add_argument("--fail-on-seq-scan", action="store_true", help="Exit with status 1 if any sequential scan is reported")
+    args = parser.parse_args()
+
+    reports = run(args.only, args.min_rows)
+    print_report(reports, args.verbose)
+
+    if args.json:
+        args.json.write_text(json.dumps(
+            [report.__dict__ | {"seq_scans": [scan.__dict__ for scan in report.seq_scans]} for report in reports],
+            indent=2, default=str, ensure_ascii=False,
+        ))
+        logger.info("Report written to %s", args.json)
+
+    flagged = [report.name for report in reports if report.seq_scans]
+    if flagged:
+        logger.warning("Sequential scans in: %s", ", ".join(flagged))
+        if args.fail_on_seq_scan:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Batch rent invoice generation (InvoiceGenerationJob).
+
+Creates the missing rent invoices of every submitted lease for billing periods
+starting on or before the target date, from the rent schedule (built first for
+submitted leases that have none). Idempotent, so it can run from cron every day;
+re-runs only pick up new periods.
+
+Usage (from the backend directory):
+    uv run python -m db_tools.generate_invoices
+    uv run python -m db_tools.generate_invoices --date 2026-11-01 --since 2026-01-01
+    uv run python -m db_tools.generate_invoices --building-id 3 --dry-run
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+SCRIPT_DIR = Path(__file__).parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.invoice_jobs import InvoiceGenerationJob
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def run(target_date: date, since: date | None, building_id: int | None, dry_run: bool) -> dict:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await InvoiceGenerationJob.run(
+                db, target_date=target_date, since=since, building_id=building_id, dry_run=dry_run
+            )
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the missing rent invoices from the rent schedule")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="Target date (default: today)")
+    parser.add_argument("--since", type=date.fromisoformat, help="Ignore periods starting before this date")
+    parser.add_argument("--building-id", type=int, help="Only leases in this building")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the invoices that would be created")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        result = asyncio.run(run(args.date, args.since, args.building_id, args.dry_run))
+    except ValueError as e:
+        parser.error(str(e))
+
+    logger.info(
+        "%s %d rent invoices (NT$%s) for periods starting on or before %s in %.0f ms",
+        "Would create" if args.dry_run else "Created",
+        result["created"], f"{result['total_amount']:,.0f}", args.date, (time.perf_counter() - started) * 1000,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Nightly invoice status maintenance (InvoiceStatusSweeper).
+
+Moves unpaid 'unmatured' invoices whose due date has passed to 'overdue' with a
+single UPDATE. Rent invoices are due on their rent schedule due date, other
+invoices on period_end.
+
+Usage (from the backend directory):
+    uv run python -m db_tools.sweep_invoice_status
+    uv run python -m db_tools.sweep_invoice_status --as-of 2026-11-01 --grace-days 5
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to import app modules
+SCRIPT_DIR = Path(__file__).parent
+BACKEND_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.invoice_jobs import InvoiceStatusSweeper
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def run(as_of: date, grace_days: int) -> List[int]:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await InvoiceStatusSweeper.mark_overdue(db, as_of=as_of, grace_days=grace_days)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mark unpaid invoices past their due date as overdue")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(), help="Day the sweep runs for (default: today)")
+    parser.add_argument("--grace-days", type=int, default=0, help="Days after the due date before an invoice counts as overdue")
+    args = parser.parse_args()
+    if args.grace_days < 0:
+        parser.error("--grace-days cannot be negative")
+
+    started = time.perf_counter()
+    invoice_ids = asyncio.run(run(args.as_of, args.grace_days))
+    logger.info(
+        "Marked %d invoices overdue as of %s in %.0f ms",
+        len(invoice_ids), args.as_of, (time.perf_counter() - started) * 1000,
+    )
+
+
+if __name__ == "__main__":
+    main()